@@ -453,12 +453,12 @@ async function extractKeyframes(
     // Python 脚本会将关键帧保存到 .keyframes.json 文件
     const keyframesOutputPath = outputPath.replace('.json', '.keyframes.json');
 
-    // 使用 Python 脚本提取关键帧
+    // 使用 Python 脚本提取关键帧（仅提取关键帧，不重新运行姿态分析）
     const pythonProcess = spawn('python3', [
       PYTHON_SCRIPT_PATH,
       '-i', videoPath,
       '-o', outputPath,
-      '-t', '0.5',
+      '--keyframes-only',
       '-k', timestamps.join(','),
       '-ko', tmpdir(),
     ], {
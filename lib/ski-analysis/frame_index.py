@@ -0,0 +1,289 @@
+"""
+Ski Analysis Frame Index
+
+Per-video index of presentation timestamps and keyframe (I-frame) positions
+for frame-accurate random access.
+
+OpenCV maps frame numbers to timestamps with the average frame rate, so
+CAP_PROP_POS_FRAMES seeks land on the wrong frame for variable frame rate
+phone videos and decode from an unknown GOP start. The index is built once
+from the container's packets (no decoding), stored in a subdirectory of
+the pose cache directory (apart from the cached results, which the result
+cache evicts and clears on its own), and lets readers seek to the keyframe preceding a target and
+decode forward to exactly the wanted frame, checking each landing against
+the recorded timestamps.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Bump when the index format changes
+INDEX_VERSION = 1
+
+# Two timestamps closer than this (in ms) refer to the same frame
+PTS_TOLERANCE_MS = 1.0
+
+# Keyframes tried, going backwards, before falling back to decoding from the start
+MAX_SEEK_ATTEMPTS = 3
+
+# Subdirectory of the pose cache directory that holds the indexes
+INDEX_DIR = 'frame-index'
+
+# Indexes kept; the least recently used beyond this are removed after a write
+MAX_INDEXES = 256
+
+_INDEX_SUFFIX = '.frameindex.json'
+
+
+class FrameIndex:
+    """Frame-number-to-pts mapping plus keyframe positions of one video."""
+
+    def __init__(self, pts_ms: List[float], keyframes: List[int]):
+        self.pts_ms = pts_ms
+        self.keyframes = keyframes if keyframes else [0]
+
+    @classmethod
+    def build(cls, video_path: str) -> Optional['FrameIndex']:
+        """
+        Build the index from the container's packets without decoding them.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            FrameIndex, or None if the backend cannot expose raw packets
+        """
+        video_capture = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        if not video_capture.isOpened():
+            return None
+
+        try:
+            # Raw mode: read() returns encoded packets instead of decoded frames
+            if not video_capture.set(cv2.CAP_PROP_FORMAT, -1):
+                return None
+
+            packets: List[Tuple[float, bool]] = []
+            while True:
+                success, _ = video_capture.read()
+                if not success:
+                    break
+                pts = video_capture.get(cv2.CAP_PROP_POS_MSEC)
+                if pts < 0 or pts != pts:
+                    continue
+                is_keyframe = bool(video_capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME))
+                packets.append((pts, is_keyframe))
+        finally:
+            video_capture.release()
+
+        if not packets:
+            return None
+
+        # Packets come in decode order; frame numbers follow presentation order
+        packets.sort(key=lambda packet: packet[0])
+        pts_ms = [round(pts, 3) for pts, _ in packets]
+        keyframes = [i for i, (_, is_keyframe) in enumerate(packets) if is_keyframe]
+        return cls(pts_ms, keyframes)
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.pts_ms)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds: last pts plus one average frame, to the millisecond."""
+        if len(self.pts_ms) < 2:
+            return 0.0
+        average_gap = (self.pts_ms[-1] - self.pts_ms[0]) / (len(self.pts_ms) - 1)
+        # Rounded so float noise in the average gap never moves the end of
+        # the range past frame_count / fps, which unindexed callers check against
+        return round(self.pts_ms[-1] + average_gap) / 1000
+
+    def frame_for_timestamp(self, timestamp_seconds: float) -> Optional[int]:
+        """Frame shown at the given time (last frame with pts <= timestamp)."""
+        target_ms = timestamp_seconds * 1000 + PTS_TOLERANCE_MS
+        frame_number = bisect.bisect_right(self.pts_ms, target_ms) - 1
+        return frame_number if frame_number >= 0 else None
+
+    def frame_at_pts(self, pts_ms: float) -> Optional[int]:
+        """Frame whose pts matches pts_ms, or None."""
+        i = bisect.bisect_left(self.pts_ms, pts_ms - PTS_TOLERANCE_MS)
+        if i < len(self.pts_ms) and abs(self.pts_ms[i] - pts_ms) <= PTS_TOLERANCE_MS:
+            return i
+        return None
+
+    def keyframe_before(self, frame_number: int) -> int:
+        """Nearest keyframe at or before frame_number."""
+        i = bisect.bisect_right(self.keyframes, frame_number) - 1
+        return self.keyframes[max(0, i)]
+
+    def reader(self, video_capture: cv2.VideoCapture) -> 'IndexedFrameReader':
+        """Wrap an open capture of the same video for indexed random access."""
+        return IndexedFrameReader(video_capture, self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': INDEX_VERSION,
+            'ptsMs': self.pts_ms,
+            'keyframes': self.keyframes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional['FrameIndex']:
+        if data.get('version') != INDEX_VERSION:
+            return None
+        return cls(list(data['ptsMs']), list(data['keyframes']))
+
+
+class IndexedFrameReader:
+    """
+    Frame-accurate random access to a video through its FrameIndex.
+
+    Moving forward within a GOP only grabs the frames in between; anything
+    else seeks to the preceding keyframe and decodes forward. Every landing
+    is checked against the index so the returned image is exactly the
+    requested frame.
+    """
+
+    def __init__(self, video_capture: cv2.VideoCapture, index: FrameIndex):
+        self.video_capture = video_capture
+        self.index = index
+        # Last frame grabbed from the capture (-1 = none yet, None = unknown)
+        self._current: Optional[int] = -1
+
+    def read(self, frame_number: int) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode exactly the given frame.
+
+        Args:
+            frame_number: Zero-based frame number in presentation order
+
+        Returns:
+            Tuple of (success, BGR image)
+        """
+        if not 0 <= frame_number < self.index.frame_count:
+            return False, None
+
+        for _ in range(2):
+            if (self._current is None
+                    or frame_number < self._current
+                    or self.index.keyframe_before(frame_number) > self._current):
+                self._current = self._seek(frame_number)
+                if self._current is None:
+                    return False, None
+
+            while self._current < frame_number:
+                if not self.video_capture.grab():
+                    self._current = None
+                    return False, None
+                self._current += 1
+
+            if self._landed_on(frame_number):
+                success, image = self.video_capture.retrieve()
+                return success, image if success else None
+
+            # The decoder disagrees with the index; re-seek once
+            self._current = None
+
+        return False, None
+
+    def _seek(self, frame_number: int) -> Optional[int]:
+        """Seek to a keyframe at or before frame_number; return the frame grabbed."""
+        keyframe = self.index.keyframe_before(frame_number)
+        for _ in range(MAX_SEEK_ATTEMPTS):
+            self.video_capture.set(cv2.CAP_PROP_POS_MSEC, self.index.pts_ms[keyframe])
+            if self.video_capture.grab():
+                landed = self.index.frame_at_pts(self.video_capture.get(cv2.CAP_PROP_POS_MSEC))
+                if landed is not None and landed <= frame_number:
+                    return landed
+            if keyframe == 0:
+                break
+            keyframe = self.index.keyframe_before(keyframe - 1)
+
+        # Last resort: rewind and decode from the first frame
+        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if not self.video_capture.grab():
+            return None
+        return 0
+
+    def _landed_on(self, frame_number: int) -> bool:
+        pts = self.video_capture.get(cv2.CAP_PROP_POS_MSEC)
+        return abs(pts - self.index.pts_ms[frame_number]) <= PTS_TOLERANCE_MS
+
+
+def index_path_for(video_path: str, cache_dir: Path) -> Path:
+    """Location of a video's index under cache_dir, keyed by path, size and mtime."""
+    stat = os.stat(video_path)
+    identity = f"{os.path.abspath(video_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    key = hashlib.sha256(identity.encode('utf-8')).hexdigest()
+    return cache_dir / INDEX_DIR / f'{key}{_INDEX_SUFFIX}'
+
+
+def _prune_indexes(index_dir: Path) -> None:
+    """Remove the least recently used indexes beyond MAX_INDEXES."""
+    entries = []
+    for path in index_dir.glob(f'*{_INDEX_SUFFIX}'):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+    for _, path in entries[MAX_INDEXES:]:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def load_or_build_frame_index(video_path: str, cache_dir: Optional[str] = None) -> Optional[FrameIndex]:
+    """
+    Load a video's frame index from the cache directory, building it if needed.
+
+    Args:
+        video_path: Path to video file
+        cache_dir: Pose cache directory; indexes are kept in its INDEX_DIR
+            subdirectory (default: the pose result cache dir)
+
+    Returns:
+        FrameIndex, or None if it cannot be built for this video
+    """
+    if cache_dir is None:
+        from pose_cache import DEFAULT_CACHE_DIR
+        cache_dir = DEFAULT_CACHE_DIR
+    index_path = index_path_for(video_path, Path(cache_dir))
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = FrameIndex.from_dict(json.load(f))
+        if index is not None:
+            os.utime(index_path)
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = FrameIndex.build(video_path)
+    if index is None:
+        return None
+
+    # Atomic write so concurrent readers never see a partial index
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=index_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f)
+        os.replace(temp_path, index_path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        return index
+    _prune_indexes(index_path.parent)
+    return index
@@ -0,0 +1,105 @@
+"""
+Ski Analysis Motion Gate
+
+Cheap change detector in front of pose inference. Lift-line waits and the
+stops and starts of a clip are often nearly static, yet every frame would
+still go through the landmarker. The gate shrinks each frame to a small
+grayscale thumbnail and compares it with the thumbnail of the last frame
+that was actually inferred; while the mean absolute difference stays below
+a threshold, the caller reuses that frame's pose instead of running
+inference again.
+
+Comparing against the last inferred frame (rather than the previous frame)
+means slow drift still adds up and eventually triggers an inference, and a
+cap on consecutive reuses keeps the tracker fed on long static stretches.
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Longer side of the grayscale thumbnail frames are compared on, in pixels
+MOTION_THUMBNAIL_SIZE = 64
+
+# Run inference after this many consecutive reuses even if nothing moved
+DEFAULT_MAX_REUSED_FRAMES = 30
+
+
+class MotionGate:
+    """
+    Decides per frame whether the previous pose can be reused.
+
+    Args:
+        threshold: Mean absolute grey-level difference (0-255) between two
+            thumbnails below which a frame counts as static
+        max_reused: Consecutive reuses after which inference is forced
+    """
+
+    def __init__(self, threshold: float, max_reused: int = DEFAULT_MAX_REUSED_FRAMES):
+        self.threshold = threshold
+        self.max_reused = max_reused
+        # Frames checked, and those whose pose was reused
+        self.checked_frames = 0
+        self.reused_frames = 0
+        self._reference: Optional[np.ndarray] = None
+        self._streak = 0
+
+    def is_static(self, image: np.ndarray, is_rgb: bool = True) -> bool:
+        """
+        Check one frame, in order.
+
+        Returns True if the frame barely differs from the last frame that
+        returned False, in which case the caller reuses that frame's pose.
+        Otherwise the frame becomes the new reference and must be inferred.
+
+        Args:
+            image: Frame at any resolution (RGB, or BGR as from OpenCV)
+            is_rgb: Channel order of image
+        """
+        self.checked_frames += 1
+        thumbnail = _thumbnail(image, is_rgb)
+        if (self._reference is not None
+                and self._reference.shape == thumbnail.shape
+                and self._streak < self.max_reused
+                and motion_score(self._reference, thumbnail) < self.threshold):
+            self._streak += 1
+            self.reused_frames += 1
+            return True
+        self._reference = thumbnail
+        self._streak = 0
+        return False
+
+    def merge(self, other: 'MotionGate') -> None:
+        """Add the counts of another gate, e.g. from a worker process."""
+        self.checked_frames += other.checked_frames
+        self.reused_frames += other.reused_frames
+
+    def report(self, inference_count: int) -> dict:
+        """Result metadata: threshold, skipped inferences and skip rate."""
+        attempted = inference_count + self.reused_frames
+        return {
+            'threshold': self.threshold,
+            'skippedInferences': self.reused_frames,
+            'skipRate': round(self.reused_frames / attempted, 4) if attempted else 0.0,
+        }
+
+
+def _thumbnail(image: np.ndarray, is_rgb: bool) -> np.ndarray:
+    height, width = image.shape[:2]
+    scale = MOTION_THUMBNAIL_SIZE / max(height, width)
+    if scale < 1:
+        # Strided view first so the area filter only touches a few pixels
+        # per output pixel; it still averages out sensor noise
+        step = max(1, int(1 / (4 * scale)))
+        image = image[::step, ::step]
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY if is_rgb else cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def motion_score(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean absolute grey-level difference of two thumbnails (0-255)."""
+    return float(cv2.absdiff(a, b).mean())
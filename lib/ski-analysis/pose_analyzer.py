@@ -8,15 +8,45 @@ and compute biomechanical metrics for AI analysis.
 import base64
 import json
 import math
+import os
+import queue
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Callable, TextIO, Union, TYPE_CHECKING
 
 import cv2
 import numpy as np
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-from mediapipe.tasks.python.vision.core import image as mp_image
+
+from motion_gate import MotionGate
+from pose_checkpoint import (
+    DEFAULT_CHECKPOINT_INTERVAL,
+    Checkpoint,
+    CheckpointWriter,
+    checkpoint_fingerprint,
+    load_checkpoint,
+    resolve_checkpoint_path,
+)
+from pose_interpolation import (
+    DEFAULT_BETA,
+    DEFAULT_MAX_GAP,
+    DEFAULT_MIN_CUTOFF,
+    interpolate_poses,
+    one_euro_filter,
+)
+from pose_profiler import StageProfiler, format_profile, profiled_stage
+from pose_sampling import AdaptiveRefiner, DEFAULT_BUDGET_FACTOR, DEFAULT_MIN_CHANGE
+from pose_segments import segment_turns
+from video_decoders import DECODER_NAMES, DecodedFrame, FFmpegDecoder, FrameBufferRing
+
+# MediaPipe (and multiprocessing, for parallel runs) is imported where it is
+# used, so keyframe-only runs and short-lived CLI calls never load it
+if TYPE_CHECKING:
+    from mediapipe.tasks.python import vision
+    from frame_index import FrameIndex
+    from pose_cache import PoseResultCache
 
 
 # MediaPipe landmark indices
@@ -47,6 +77,15 @@ class Landmarks:
     RIGHT_FOOT_INDEX = 32
 
 
+# PoseLandmarker confidence thresholds
+MIN_POSE_DETECTION_CONFIDENCE = 0.5
+MIN_POSE_PRESENCE_CONFIDENCE = 0.5
+MIN_TRACKING_CONFIDENCE = 0.5
+
+# Hip/knee/ankle landmarks below this visibility make a frame unusable
+MIN_LANDMARK_VISIBILITY = 0.5
+
+
 def calculate_angle(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> float:
     """
     Calculate the angle formed by three points a-b-c.
@@ -201,7 +240,7 @@ def analyze_frame(landmarks: dict, timestamp: float) -> Optional[dict]:
         Frame analysis result or None if detection failed
     """
     # Check visibility thresholds
-    min_visibility = 0.5
+    min_visibility = MIN_LANDMARK_VISIBILITY
     key_vis = [
         landmarks['leftHip_vis'], landmarks['rightHip_vis'],
         landmarks['leftKnee_vis'], landmarks['rightKnee_vis'],
@@ -251,6 +290,550 @@ def analyze_frame(landmarks: dict, timestamp: float) -> Optional[dict]:
     }
 
 
+# Key landmarks stored per sampled frame, in output order
+KEY_LANDMARKS = (
+    ('leftShoulder', Landmarks.LEFT_SHOULDER),
+    ('rightShoulder', Landmarks.RIGHT_SHOULDER),
+    ('leftHip', Landmarks.LEFT_HIP),
+    ('rightHip', Landmarks.RIGHT_HIP),
+    ('leftKnee', Landmarks.LEFT_KNEE),
+    ('rightKnee', Landmarks.RIGHT_KNEE),
+    ('leftAnkle', Landmarks.LEFT_ANKLE),
+    ('rightAnkle', Landmarks.RIGHT_ANKLE),
+)
+
+# Values stored per landmark (last axis of the landmark array)
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility')
+
+# Positions in KEY_LANDMARKS of the hips, knees and ankles (visibility-gated)
+_GATED_LANDMARKS = [2, 3, 4, 5, 6, 7]
+
+# Where a stored pose came from (PoseSeries.sources): inferred on its own
+# frame, reused from an earlier frame by the motion gate, or interpolated
+# between poses of other frames
+POSE_INFERRED = 0
+POSE_REUSED = 1
+POSE_INTERPOLATED = 2
+
+# Output flag of each non-inferred source in the per-frame dicts
+_SOURCE_FLAGS = {POSE_REUSED: 'reusedPose', POSE_INTERPOLATED: 'interpolated'}
+
+# Decimal places of each per-frame metric in the output
+METRIC_DECIMALS = {
+    'centerOfGravityHeight': 3,
+    'bodyTiltAngle': 1,
+    'leftKneeFlexion': 1,
+    'rightKneeFlexion': 1,
+}
+
+
+def calculate_angles(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Vectorised calculate_angle() over many frames.
+
+    Args:
+        a: (N, 3) first point coordinates
+        b: (N, 3) middle point (vertex) coordinates
+        c: (N, 3) third point coordinates
+
+    Returns:
+        (N,) angles in degrees
+    """
+    ba = a - b
+    bc = c - b
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cos_angle = (ba * bc).sum(axis=1) / (np.linalg.norm(ba, axis=1) * np.linalg.norm(bc, axis=1))
+    # Zero-length segments give NaN, which calculate_angle() clamps to 1.0
+    cos_angle = np.clip(np.nan_to_num(cos_angle, nan=1.0), -1.0, 1.0)
+    return np.degrees(np.arccos(cos_angle))
+
+
+def calculate_center_of_gravity_heights(
+    left_hip: np.ndarray,
+    right_hip: np.ndarray,
+    left_ankle: np.ndarray,
+    right_ankle: np.ndarray
+) -> np.ndarray:
+    """Vectorised calculate_center_of_gravity_height() over (N, 3) arrays."""
+    hip_center_y = (left_hip[:, 1] + right_hip[:, 1]) / 2
+    ankle_center_y = (left_ankle[:, 1] + right_ankle[:, 1]) / 2
+    return np.maximum(0.0, ankle_center_y - hip_center_y)
+
+
+def calculate_body_tilt_angles(
+    left_shoulder: np.ndarray,
+    right_shoulder: np.ndarray,
+    left_hip: np.ndarray,
+    right_hip: np.ndarray
+) -> np.ndarray:
+    """Vectorised calculate_body_tilt_angle() over (N, 3) arrays."""
+    shoulder_center = (left_shoulder + right_shoulder) / 2
+    hip_center = (left_hip + right_hip) / 2
+
+    dx = shoulder_center[:, 0] - hip_center[:, 0]
+    dy = shoulder_center[:, 1] - hip_center[:, 1]
+    return np.degrees(np.arctan2(np.abs(dx), np.abs(dy)))
+
+
+def calculate_lean_angles(
+    left_shoulder: np.ndarray,
+    right_shoulder: np.ndarray,
+    left_hip: np.ndarray,
+    right_hip: np.ndarray
+) -> np.ndarray:
+    """
+    Signed calculate_body_tilt_angles(): positive when the shoulders are
+    right of the hips in the image, negative when left of them.
+    """
+    shoulder_center = (left_shoulder + right_shoulder) / 2
+    hip_center = (left_hip + right_hip) / 2
+
+    dx = shoulder_center[:, 0] - hip_center[:, 0]
+    dy = shoulder_center[:, 1] - hip_center[:, 1]
+    return np.degrees(np.arctan2(dx, np.abs(dy)))
+
+
+def compute_pose_metrics(landmarks: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute all per-frame metrics for a whole landmark array at once.
+
+    Args:
+        landmarks: (N, len(KEY_LANDMARKS), 4) array as stored by PoseSeries
+
+    Returns:
+        Dictionary of metric name to (N,) float64 array, rounded like the
+        per-frame output
+    """
+    points = landmarks[:, :, :3].astype(np.float64)
+    (left_shoulder, right_shoulder, left_hip, right_hip,
+     left_knee, right_knee, left_ankle, right_ankle) = (
+        points[:, i] for i in range(len(KEY_LANDMARKS))
+    )
+
+    metrics = {
+        'centerOfGravityHeight': calculate_center_of_gravity_heights(
+            left_hip, right_hip, left_ankle, right_ankle
+        ),
+        'bodyTiltAngle': calculate_body_tilt_angles(
+            left_shoulder, right_shoulder, left_hip, right_hip
+        ),
+        'leftKneeFlexion': calculate_angles(left_hip, left_knee, left_ankle),
+        'rightKneeFlexion': calculate_angles(right_hip, right_knee, right_ankle),
+    }
+    return {name: np.round(values, METRIC_DECIMALS[name]) for name, values in metrics.items()}
+
+
+# Percentiles reported per metric when requested
+SUMMARY_PERCENTILES = (10, 50, 90)
+
+
+class SummaryAggregator:
+    """
+    Running summary statistics over per-frame metrics with bounded memory.
+
+    Metrics are rounded to METRIC_DECIMALS before they get here, so they are
+    accumulated as scaled integers: sums are exact whatever the order and
+    batching of updates, and merged chunk aggregators give the same summary
+    as one pass. Percentiles come from a histogram of the distinct rounded
+    values, whose size is bounded by each metric's range and resolution
+    rather than by the number of frames.
+    """
+
+    def __init__(self, percentiles: bool = False):
+        self.percentiles = percentiles
+        self.frame_count = 0
+        self._sums = {name: 0 for name in METRIC_DECIMALS}
+        self._mins: Dict[str, int] = {}
+        self._maxs: Dict[str, int] = {}
+        self._asymmetry_sum = 0
+        self._histograms: Optional[Dict[str, Counter]] = (
+            {name: Counter() for name in METRIC_DECIMALS} if percentiles else None
+        )
+
+    def update(self, metrics: Dict[str, np.ndarray]) -> None:
+        """
+        Add a batch of frames.
+
+        Args:
+            metrics: Output of compute_pose_metrics() for the batch
+        """
+        count = len(metrics['centerOfGravityHeight'])
+        if count == 0:
+            return
+
+        scaled = {
+            name: np.rint(values * 10 ** METRIC_DECIMALS[name]).astype(np.int64)
+            for name, values in metrics.items()
+        }
+        for name, values in scaled.items():
+            self._sums[name] += int(values.sum())
+            low, high = int(values.min()), int(values.max())
+            self._mins[name] = min(self._mins.get(name, low), low)
+            self._maxs[name] = max(self._maxs.get(name, high), high)
+            if self._histograms is not None:
+                keys, counts = np.unique(values, return_counts=True)
+                self._histograms[name].update(dict(zip(keys.tolist(), counts.tolist())))
+
+        # Asymmetry = mean difference between left and right knee flexion
+        self._asymmetry_sum += int(np.abs(scaled['leftKneeFlexion'] - scaled['rightKneeFlexion']).sum())
+        self.frame_count += count
+
+    def merge(self, other: 'SummaryAggregator') -> None:
+        """Fold in the statistics of another aggregator (e.g. a parallel chunk)."""
+        if other.frame_count == 0:
+            return
+        for name in METRIC_DECIMALS:
+            self._sums[name] += other._sums[name]
+            self._mins[name] = min(self._mins.get(name, other._mins[name]), other._mins[name])
+            self._maxs[name] = max(self._maxs.get(name, other._maxs[name]), other._maxs[name])
+            if self._histograms is not None and other._histograms is not None:
+                self._histograms[name].update(other._histograms[name])
+        self._asymmetry_sum += other._asymmetry_sum
+        self.frame_count += other.frame_count
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serialisable state, e.g. for a checkpoint (see from_state())."""
+        return {
+            'percentiles': self.percentiles,
+            'frameCount': self.frame_count,
+            'sums': self._sums,
+            'mins': self._mins,
+            'maxs': self._maxs,
+            'asymmetrySum': self._asymmetry_sum,
+            # JSON object keys are strings, so histograms are stored as [value, count] pairs
+            'histograms': None if self._histograms is None else {
+                name: sorted(histogram.items()) for name, histogram in self._histograms.items()
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'SummaryAggregator':
+        """Rebuild an aggregator from to_state() output."""
+        aggregator = cls(state['percentiles'])
+        aggregator.frame_count = state['frameCount']
+        aggregator._sums = dict(state['sums'])
+        aggregator._mins = dict(state['mins'])
+        aggregator._maxs = dict(state['maxs'])
+        aggregator._asymmetry_sum = state['asymmetrySum']
+        if state['histograms'] is not None:
+            aggregator._histograms = {
+                name: Counter(dict(pairs))
+                for name, pairs in state['histograms'].items()
+            }
+        return aggregator
+
+    def summary(self, video_duration: float) -> dict:
+        """
+        Summary statistics of everything added so far.
+
+        Args:
+            video_duration: Video duration in seconds
+
+        Returns:
+            Summary dictionary, with a 'percentiles' block if enabled
+        """
+        frame_count = self.frame_count
+        if frame_count == 0:
+            return {
+                'avgCenterOfGravityHeight': 0,
+                'minCenterOfGravityHeight': 0,
+                'maxBodyTilt': 0,
+                'avgKneeFlexion': 0,
+                'leftRightAsymmetry': 0,
+                'framesAnalyzed': 0,
+                'videoDuration': round(video_duration, 2),
+            }
+
+        cog_scale = 10 ** METRIC_DECIMALS['centerOfGravityHeight']
+        tilt_scale = 10 ** METRIC_DECIMALS['bodyTiltAngle']
+        knee_scale = 10 ** METRIC_DECIMALS['leftKneeFlexion']
+        max_tilt = max(abs(self._mins['bodyTiltAngle']), abs(self._maxs['bodyTiltAngle']))
+
+        # Averages often land exactly on a rounding tie, so each value keeps the
+        # rounding it always had: NumPy's for heights, Python's for angles
+        summary = {
+            'avgCenterOfGravityHeight': float(np.round(
+                self._sums['centerOfGravityHeight'] / (frame_count * cog_scale), 3
+            )),
+            'minCenterOfGravityHeight': float(np.round(self._mins['centerOfGravityHeight'] / cog_scale, 3)),
+            'maxBodyTilt': round(max_tilt / tilt_scale, 1),
+            'avgKneeFlexion': round(
+                (self._sums['leftKneeFlexion'] + self._sums['rightKneeFlexion']) / (2 * frame_count * knee_scale), 1
+            ),
+            'leftRightAsymmetry': round(self._asymmetry_sum / (frame_count * knee_scale), 1),
+            'framesAnalyzed': frame_count,
+            'videoDuration': round(video_duration, 2),
+        }
+
+        if self._histograms is not None:
+            summary['percentiles'] = {
+                name: {f'p{p}': self._percentile(name, p) for p in SUMMARY_PERCENTILES}
+                for name in METRIC_DECIMALS
+            }
+        return summary
+
+    def _percentile(self, name: str, percentile: float) -> float:
+        # Nearest-rank percentile over the histogram of scaled values
+        rank = max(1, math.ceil(percentile / 100 * self.frame_count))
+        seen = 0
+        for value in sorted(self._histograms[name]):
+            seen += self._histograms[name][value]
+            if seen >= rank:
+                return round(value / 10 ** METRIC_DECIMALS[name], METRIC_DECIMALS[name])
+        return 0.0
+
+
+def summarize_pose_metrics(
+    metrics: Dict[str, np.ndarray],
+    video_duration: float,
+    percentiles: bool = False
+) -> dict:
+    """
+    Compute summary statistics from per-frame metric arrays.
+
+    Args:
+        metrics: Output of compute_pose_metrics()
+        video_duration: Video duration in seconds
+        percentiles: Also report SUMMARY_PERCENTILES of every metric
+
+    Returns:
+        Summary dictionary
+    """
+    aggregator = SummaryAggregator(percentiles)
+    aggregator.update(metrics)
+    return aggregator.summary(video_duration)
+
+
+class PoseSeries:
+    """
+    Columnar store of the key landmarks of every sampled frame.
+
+    Landmarks live in one contiguous (frames x KEY_LANDMARKS x 4) float32
+    array of x, y, z and visibility, next to a float64 timestamp vector.
+    Both grow geometrically as poses are appended. Metrics and the summary
+    are computed over the whole array at once; the per-frame dicts of the
+    JSON output are only built when to_frames() is called. A small-int vector
+    records where each pose came from (POSE_INFERRED, POSE_REUSED or
+    POSE_INTERPOLATED).
+    """
+
+    def __init__(self, capacity: int = 256):
+        capacity = max(1, capacity)
+        self._landmarks = np.empty((capacity, len(KEY_LANDMARKS), len(LANDMARK_FIELDS)), dtype=np.float32)
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._sources = np.zeros(capacity, dtype=np.uint8)
+        self._size = 0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: np.ndarray,
+        landmarks: np.ndarray,
+        sources: Optional[np.ndarray] = None
+    ) -> 'PoseSeries':
+        """Wrap existing timestamp, landmark and source arrays (copied; sources default to inferred)."""
+        series = cls(len(timestamps))
+        series._timestamps[:len(timestamps)] = timestamps
+        series._landmarks[:len(timestamps)] = landmarks
+        if sources is not None:
+            series._sources[:len(timestamps)] = sources
+        series._size = len(timestamps)
+        return series
+
+    @classmethod
+    def concatenate(cls, series_list: Iterable['PoseSeries']) -> 'PoseSeries':
+        """Join several series in the given order."""
+        series_list = list(series_list)
+        if not series_list:
+            return cls()
+        return cls.from_arrays(
+            np.concatenate([s.timestamps for s in series_list]),
+            np.concatenate([s.landmarks for s in series_list]),
+            np.concatenate([s.sources for s in series_list]),
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the filled part is pickled (e.g. when returned from a worker process)
+        return {
+            '_landmarks': self.landmarks.copy(),
+            '_timestamps': self.timestamps.copy(),
+            '_sources': self.sources.copy(),
+            '_size': self._size,
+        }
+
+    @property
+    def landmarks(self) -> np.ndarray:
+        """(frames, len(KEY_LANDMARKS), 4) float32 view of x, y, z, visibility."""
+        return self._landmarks[:self._size]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """(frames,) timestamps in seconds."""
+        return self._timestamps[:self._size]
+
+    @property
+    def sources(self) -> np.ndarray:
+        """(frames,) uint8 POSE_* source of each pose."""
+        return self._sources[:self._size]
+
+    def append(
+        self,
+        timestamp: float,
+        landmarks: list,
+        crop: Optional[Tuple[float, float, float, float]] = None,
+        source: int = POSE_INFERRED
+    ) -> None:
+        """
+        Store the key landmarks of one detected pose.
+
+        Args:
+            timestamp: Frame timestamp in seconds
+            landmarks: List of NormalizedLandmark objects
+            crop: Normalised (x, y, width, height) region the pose was
+                detected in; landmarks are mapped back to the full frame
+            source: POSE_REUSED if the pose was detected on an earlier,
+                near-identical frame (see motion_gate)
+        """
+        if self._size == len(self._timestamps):
+            self._grow()
+
+        row = self._landmarks[self._size]
+        for i, (_, idx) in enumerate(KEY_LANDMARKS):
+            lm = landmarks[idx]
+            row[i] = (lm.x, lm.y, lm.z, getattr(lm, 'visibility', getattr(lm, 'presence', 1.0)))
+        if crop is not None:
+            crop_x, crop_y, crop_width, crop_height = crop
+            row[:, 0] = crop_x + row[:, 0] * crop_width
+            row[:, 1] = crop_y + row[:, 1] * crop_height
+            # z uses roughly the same scale as x
+            row[:, 2] *= crop_width
+        self._timestamps[self._size] = timestamp
+        self._sources[self._size] = source
+        self._size += 1
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._timestamps)
+        landmarks = np.empty((capacity,) + self._landmarks.shape[1:], dtype=np.float32)
+        timestamps = np.empty(capacity, dtype=np.float64)
+        sources = np.zeros(capacity, dtype=np.uint8)
+        landmarks[:self._size] = self.landmarks
+        timestamps[:self._size] = self.timestamps
+        sources[:self._size] = self.sources
+        self._landmarks, self._timestamps, self._sources = landmarks, timestamps, sources
+
+    def clear(self) -> None:
+        """Drop all stored poses, keeping the allocated buffers."""
+        self._size = 0
+
+    def visible_mask(self) -> np.ndarray:
+        """Frames whose hips, knees and ankles all reach MIN_LANDMARK_VISIBILITY."""
+        visibility = self.landmarks[:, _GATED_LANDMARKS, 3].astype(np.float64)
+        return (visibility >= MIN_LANDMARK_VISIBILITY).all(axis=1)
+
+    def frame_dict(self, index: int) -> Optional[dict]:
+        """Output dict of one stored pose, or None if it fails the visibility gate."""
+        single = PoseSeries.from_arrays(
+            self.timestamps[index:index + 1], self.landmarks[index:index + 1], self.sources[index:index + 1]
+        )
+        if not single.visible_mask()[0]:
+            return None
+        return single.to_frames()[0]
+
+    def select(self, mask: np.ndarray) -> 'PoseSeries':
+        """New series with the frames where mask is True."""
+        return PoseSeries.from_arrays(self.timestamps[mask], self.landmarks[mask], self.sources[mask])
+
+    def smoothed(self) -> 'PoseSeries':
+        """New series with One-Euro-filtered x, y, z (see pose_interpolation)."""
+        landmarks = self.landmarks.copy()
+        landmarks[..., :3] = one_euro_filter(self.timestamps, landmarks[..., :3])
+        return PoseSeries.from_arrays(self.timestamps, landmarks, self.sources)
+
+    def interpolated(
+        self,
+        timestamps: np.ndarray,
+        max_gap: float = DEFAULT_MAX_GAP,
+        max_hold: float = 0.0
+    ) -> 'PoseSeries':
+        """
+        New series at other timestamps, interpolated from this one.
+
+        Timestamps that fall on a stored pose keep it (and its source); the
+        others are POSE_INTERPOLATED. Timestamps that cannot be filled (see
+        pose_interpolation.interpolate_poses()) are left out.
+        """
+        if len(self) == 0:
+            return PoseSeries()
+        landmarks, filled, exact = interpolate_poses(self.timestamps, self.landmarks, timestamps, max_gap, max_hold)
+        sources = np.where(exact >= 0, self.sources[exact], POSE_INTERPOLATED)
+        return PoseSeries.from_arrays(np.asarray(timestamps)[filled], landmarks[filled], sources[filled])
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """Per-frame metric arrays, see compute_pose_metrics()."""
+        return compute_pose_metrics(self.landmarks)
+
+    def segments(self, metrics: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
+        """
+        Turn and phase segments of the stored frames, see pose_segments.
+
+        Args:
+            metrics: Precomputed metric arrays (computed if omitted)
+        """
+        if metrics is None:
+            metrics = self.metrics()
+        points = self.landmarks[:, :, :3].astype(np.float64)
+        lean = calculate_lean_angles(points[:, 0], points[:, 1], points[:, 2], points[:, 3])
+        knee_flexion = (metrics['leftKneeFlexion'] + metrics['rightKneeFlexion']) / 2
+        return segment_turns(self.timestamps, lean, knee_flexion)
+
+    def summary(
+        self,
+        video_duration: float,
+        metrics: Optional[Dict[str, np.ndarray]] = None,
+        percentiles: bool = False
+    ) -> dict:
+        """Summary statistics, see summarize_pose_metrics()."""
+        return summarize_pose_metrics(self.metrics() if metrics is None else metrics, video_duration, percentiles)
+
+    def to_frames(self, metrics: Optional[Dict[str, np.ndarray]] = None) -> List[dict]:
+        """
+        Build the per-frame dicts of the JSON output (same layout as analyze_frame()).
+
+        Frames whose pose was reused by the motion gate get 'reusedPose':
+        True, interpolated ones 'interpolated': True; inferred frames have
+        neither key.
+
+        Args:
+            metrics: Precomputed metric arrays (computed if omitted)
+
+        Returns:
+            List of frame result dictionaries
+        """
+        if metrics is None:
+            metrics = self.metrics()
+
+        names = [name for name, _ in KEY_LANDMARKS]
+        metric_columns = {name: values.tolist() for name, values in metrics.items()}
+        frames = []
+        for i, (timestamp, row) in enumerate(zip(self.timestamps.tolist(), self.landmarks.tolist())):
+            frames.append({
+                'timestamp': timestamp,
+                'landmarks': {
+                    name: dict(zip(LANDMARK_FIELDS, values))
+                    for name, values in zip(names, row)
+                },
+                'metrics': {name: column[i] for name, column in metric_columns.items()},
+            })
+        sources = self.sources
+        for i in np.flatnonzero(sources).tolist():
+            frames[i][_SOURCE_FLAGS[int(sources[i])]] = True
+        return frames
+
+
 def get_model_path() -> str:
     """Get the path to the pose landmarker model."""
     # Look for model in the same directory as this script
@@ -264,13 +847,16 @@ def get_model_path() -> str:
     return 'pose_landmarker.task'
 
 
-def create_pose_landmarker() -> vision.PoseLandmarker:
+def create_pose_landmarker() -> 'vision.PoseLandmarker':
     """
     Create and return a MediaPipe PoseLandmarker using the Tasks API.
 
     Returns:
         Configured PoseLandmarker instance
     """
+    from mediapipe.tasks import python
+    from mediapipe.tasks.python import vision
+
     model_asset_path = get_model_path()
 
     base_options = python.BaseOptions(model_asset_path=model_asset_path)
@@ -278,137 +864,1613 @@ def create_pose_landmarker() -> vision.PoseLandmarker:
         base_options=base_options,
         running_mode=vision.RunningMode.VIDEO,
         num_poses=1,
-        min_pose_detection_confidence=0.5,
-        min_tracking_confidence=0.5,
-        min_pose_presence_confidence=0.5,
+        min_pose_detection_confidence=MIN_POSE_DETECTION_CONFIDENCE,
+        min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
+        min_pose_presence_confidence=MIN_POSE_PRESENCE_CONFIDENCE,
     )
 
     return vision.PoseLandmarker.create_from_options(options)
 
 
-def analyze_video(
-    video_path: str,
-    sampling_interval: float = 0.5,
-    output_path: Optional[str] = None
-) -> dict:
+class ReusablePoseLandmarker:
     """
-    Analyze a ski video and extract pose data.
+    VIDEO-mode PoseLandmarker that can be shared by several videos.
+
+    MediaPipe requires the timestamps passed to detect_for_video() to increase
+    monotonically over the whole lifetime of a landmarker, so every new video
+    is shifted past the last timestamp used by the previous one. Tracking
+    state is not reset between videos; MediaPipe falls back to full-frame
+    detection as soon as the carried-over region loses the pose.
+    """
+
+    # Gap inserted between two videos so tracking never bridges them smoothly
+    VIDEO_GAP_MS = 1000
+
+    def __init__(self, landmarker: Optional[Any] = None):
+        self._landmarker = landmarker or create_pose_landmarker()
+        self._offset_ms = 0
+        self._last_timestamp_ms = -1
+        self.videos_processed = 0
+
+    def start_video(self) -> None:
+        """Begin a new video; its timestamps restart from zero."""
+        if self._last_timestamp_ms >= 0:
+            self._offset_ms = self._last_timestamp_ms + self.VIDEO_GAP_MS
+        self.videos_processed += 1
+
+    def detect_for_video(self, image: Any, timestamp_ms: int) -> Any:
+        """Run detection with the timestamp shifted into this video's window."""
+        shifted_ms = self._offset_ms + timestamp_ms
+        self._last_timestamp_ms = shifted_ms
+        return self._landmarker.detect_for_video(image, shifted_ms)
+
+    def close(self) -> None:
+        self._landmarker.close()
+
+
+# Frames fed to the tracker before each sample in sparse mode
+DEFAULT_WARMUP_FRAMES = 3
+
+
+def get_frame_interval(fps: float, sampling_interval: float) -> int:
+    """Number of frames between two samples (at least 1)."""
+    return max(1, int(fps * sampling_interval))
+
+
+def needs_inference(
+    frame_number: int,
+    frame_interval: int,
+    warmup_frames: int,
+    end_frame: Optional[int] = None
+) -> bool:
+    """
+    Whether a frame must go through the model in sparse mode.
+
+    A frame is needed if it is sampled itself or lies within the warm-up
+    window right before the next sample.
 
     Args:
-        video_path: Path to the video file
-        sampling_interval: Time interval between samples in seconds
-        output_path: Optional path to save JSON output
+        frame_number: Zero-based frame index
+        frame_interval: Frames between two samples
+        warmup_frames: Frames before each sample that keep the tracker warm
+        end_frame: Samples at or after this frame are not considered
 
     Returns:
-        Pose analysis result dictionary
+        True if the frame should be decoded and run through inference
+    """
+    frames_until_sample = -frame_number % frame_interval
+    if end_frame is not None and frame_number + frames_until_sample >= end_frame:
+        return False
+    return frames_until_sample <= warmup_frames
+
+
+# Frames buffered between two pipeline stages
+DEFAULT_PIPELINE_QUEUE_SIZE = 4
+
+# Sampled poses held before they are folded into the summary in summary-only mode
+AGGREGATE_BATCH_FRAMES = 256
+
+
+def _decode_buffer_count(pipelined: bool, queue_size: int) -> int:
+    """
+    Reusable decode buffers needed so no frame is overwritten while in use.
+
+    Sequentially only the current frame is alive. Pipelined, frames also sit
+    in both stage queues, in a put() blocked on a full queue and in each
+    thread, because RGB input that needs no resizing passes the decoder's
+    buffer straight through to inference.
+    """
+    return 2 * queue_size + 4 if pipelined else 1
+
+
+class _PipelineStage:
+    """
+    Runs an iterator on a background thread and hands its items over through
+    a bounded queue.
+
+    The producer blocks when the queue is full (backpressure), items keep
+    their order, and an exception raised by the producer is re-raised in the
+    consumer. OpenCV and MediaPipe release the GIL, so decode, colour
+    conversion and inference overlap when chained stages are used.
+    """
+
+    _DONE = object()
+
+    def __init__(self, items: Iterable, maxsize: int, name: str):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(items,), name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self, items: Iterable) -> None:
+        try:
+            for item in items:
+                if not self._put(item):
+                    return
+            self._put(self._DONE)
+        except BaseException as e:
+            self._put(_PipelineError(e))
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator:
+        while True:
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                # The producer was stopped without signalling the end
+                if not self._thread.is_alive() and self._queue.empty():
+                    return
+                continue
+            if item is self._DONE:
+                return
+            if isinstance(item, _PipelineError):
+                raise item.error
+            yield item
+
+    def close(self) -> None:
+        """Stop the producer and wait for its thread to exit."""
+        self._stop.set()
+        self._thread.join()
+
+
+class _PipelineError:
+    """Wraps an exception raised inside a pipeline stage."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def resize_for_inference(
+    image: np.ndarray,
+    max_size: Optional[int],
+    buffers: Optional[FrameBufferRing] = None
+) -> np.ndarray:
+    """
+    Downscale a frame so its longer side is at most max_size pixels.
+
+    Landmarks come back normalised to the image size, so they map onto the
+    original frame unchanged and the metrics are not affected.
+
+    Args:
+        image: Decoded frame
+        max_size: Longest side in pixels (None or 0 = keep full resolution)
+        buffers: Resize into these reusable buffers (None = a new array)
+
+    Returns:
+        The frame itself if it is small enough, otherwise a resized copy
+    """
+    if not max_size:
+        return image
+
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if longest <= max_size:
+        return image
+
+    scale = max_size / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    dst = buffers.next((size[1], size[0]) + image.shape[2:]) if buffers is not None else None
+    return cv2.resize(image, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+
+# Padding added around the previous pose's bounding box, as a fraction of its size
+ROI_PADDING = 0.25
+
+# Smallest ROI side, as a fraction of the frame side
+ROI_MIN_FRACTION = 0.2
+
+
+def pose_roi(
+    landmarks: list,
+    crop: Optional[Tuple[float, float, float, float]] = None
+) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Predict the region of the next frame to run inference on from a pose.
+
+    Args:
+        landmarks: List of NormalizedLandmark objects of the detected pose
+        crop: Normalised (x, y, width, height) region the pose was detected
+            in (None = full frame)
+
+    Returns:
+        Padded bounding box as normalised (x, y, width, height), or None if
+        it would cover the whole frame anyway
+    """
+    crop_x, crop_y, crop_width, crop_height = crop or (0.0, 0.0, 1.0, 1.0)
+    xs = [crop_x + lm.x * crop_width for lm in landmarks]
+    ys = [crop_y + lm.y * crop_height for lm in landmarks]
+
+    def padded(low: float, high: float) -> Tuple[float, float]:
+        size = max((high - low) * (1 + 2 * ROI_PADDING), ROI_MIN_FRACTION)
+        center = (low + high) / 2
+        return max(0.0, center - size / 2), min(1.0, center + size / 2)
+
+    x0, x1 = padded(min(xs), max(xs))
+    y0, y1 = padded(min(ys), max(ys))
+    if x1 <= x0 or y1 <= y0 or (x1 - x0 >= 1.0 and y1 - y0 >= 1.0):
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def crop_to_roi(
+    image: np.ndarray,
+    roi: Optional[Tuple[float, float, float, float]]
+) -> Tuple[np.ndarray, Optional[Tuple[float, float, float, float]]]:
+    """
+    Crop a frame to a normalised region, snapped outwards to whole pixels.
+
+    Args:
+        image: Decoded frame
+        roi: Normalised (x, y, width, height), or None for the full frame
+
+    Returns:
+        Tuple of (cropped view, region actually cropped in normalised
+        coordinates or None for the full frame)
+    """
+    if roi is None:
+        return image, None
+
+    height, width = image.shape[:2]
+    x, y, roi_width, roi_height = roi
+    x0 = max(0, math.floor(x * width))
+    y0 = max(0, math.floor(y * height))
+    x1 = min(width, math.ceil((x + roi_width) * width))
+    y1 = min(height, math.ceil((y + roi_height) * height))
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return image, None
+
+    return image[y0:y1, x0:x1], (x0 / width, y0 / height, (x1 - x0) / width, (y1 - y0) / height)
+
+
+def iter_video_frames(
+    video_capture: cv2.VideoCapture,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    should_decode: Optional[Callable[[int], bool]] = None,
+    total_frames: Optional[int] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+    buffers: Optional[FrameBufferRing] = None
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (frame_number, BGR image) for the frames of an open video.
+
+    Args:
+        video_capture: Open capture positioned at start_frame
+        start_frame: Global index of the next frame the capture returns
+        end_frame: Stop before this frame (None = until the end of the video)
+        should_decode: Predicate on the frame number; frames it rejects are
+            skipped with grab() and not yielded (None = decode every frame)
+        total_frames: Frame count for progress output (None = no progress output)
+        on_progress: Called with the number of frames read every 100 frames
+        buffers: Decode into these reusable buffers (None = a new array per
+            frame); a yielded image is overwritten len(buffers) frames later
+    """
+    frame_count = start_frame
+    # Shape of the last decoded frame; OpenCV allocates when the target does not fit
+    shape = None
+
+    while video_capture.isOpened() and (end_frame is None or frame_count < end_frame):
+        if should_decode is not None and not should_decode(frame_count):
+            # Advance without decoding into a Mat
+            if not video_capture.grab():
+                break
+        else:
+            target = buffers.next(shape) if buffers is not None and shape is not None else None
+            success, image = video_capture.read(image=target)
+            if not success:
+                break
+            shape = image.shape
+            yield frame_count, image
+
+        frame_count += 1
+
+        # Progress update every 100 frames
+        if frame_count % 100 == 0:
+            if total_frames is not None:
+                print(f"Processed {frame_count}/{total_frames} frames...")
+            if on_progress is not None:
+                on_progress(frame_count)
+
+
+def iter_frames_at(
+    video_capture: cv2.VideoCapture,
+    frame_numbers: List[int],
+    warmup_frames: int = 0,
+    buffers: Optional[FrameBufferRing] = None
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield (frame_number, BGR image) for the given frames and the frames before each.
+
+    Frames are visited in order: the capture grabs forward across short gaps
+    and seeks across gaps longer than MAX_GRAB_FORWARD_FRAMES or backwards,
+    so the capture may be positioned anywhere when this is called again.
+
+    Args:
+        video_capture: Open capture
+        frame_numbers: Frames to decode, in any order
+        warmup_frames: Also decode this many frames before each frame
+        buffers: Decode into these reusable buffers (None = a new array per frame)
     """
-    # Open video
+    wanted = sorted({
+        n for frame_number in frame_numbers
+        for n in range(max(0, frame_number - warmup_frames), frame_number + 1)
+    })
+    position = int(video_capture.get(cv2.CAP_PROP_POS_FRAMES))
+    shape = None
+    for frame_number in wanted:
+        gap = frame_number - position
+        if gap < 0 or gap > MAX_GRAB_FORWARD_FRAMES:
+            video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        else:
+            for _ in range(gap):
+                if not video_capture.grab():
+                    return
+        target = buffers.next(shape) if buffers is not None and shape is not None else None
+        success, image = video_capture.read(image=target)
+        if not success:
+            return
+        shape = image.shape
+        position = frame_number + 1
+        yield frame_number, image
+
+
+def analyze_frame_range(
+    video_capture: cv2.VideoCapture,
+    pose_landmarker: Any,
+    fps: float,
+    frame_interval: int,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    sample_from: int = 0,
+    sparse: bool = False,
+    warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    total_frames: Optional[int] = None,
+    pipelined: bool = False,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE,
+    on_frame: Optional[Callable[[dict], None]] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+    aggregator: Optional[SummaryAggregator] = None,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    reuse_buffers: bool = True,
+    profiler: Optional[StageProfiler] = None,
+    on_checkpoint: Optional[Callable[[int, PoseSeries, int], None]] = None,
+    motion_gate: Optional[MotionGate] = None
+) -> Tuple[PoseSeries, int]:
+    """
+    Run pose detection over a range of frames of an open video.
+
+    The capture must already be positioned at start_frame. Frames before
+    sample_from only feed the tracker; sampled frames are those whose global
+    index is a multiple of frame_interval, so the samples are the same no
+    matter where the range starts.
+
+    Args:
+        video_capture: Open capture positioned at start_frame
+        pose_landmarker: VIDEO-mode landmarker (or ReusablePoseLandmarker)
+        fps: Video frame rate
+        frame_interval: Frames between two samples
+        start_frame: Global index of the next frame the capture returns
+        end_frame: Stop before this frame (None = until the end of the video)
+        sample_from: First frame index that may be sampled
+        sparse: Skip frames outside the warm-up windows with grab()
+        warmup_frames: Frames before each sample fed to the tracker in sparse mode
+        total_frames: Frame count for progress output (None = no progress output)
+        pipelined: Decode and colour-convert on background threads while the
+            calling thread runs inference
+        queue_size: Frames buffered between two pipeline stages
+        on_frame: Called with the output dict of each usable sampled frame
+            as soon as it has been analysed
+        on_progress: Called with the number of frames read every 100 frames
+        aggregator: Summary-only mode: usable poses are folded into this
+            aggregator in batches and not kept, so the returned series is empty
+        max_inference_size: Downscale frames so their longer side is at most
+            this many pixels before colour conversion and inference
+        roi_tracking: Crop each frame to a padded box around the pose found on
+            the previous frame before inference, falling back to the full
+            frame when there was none
+        reuse_buffers: Decode, resize and colour-convert into preallocated
+            buffers instead of allocating new arrays for every frame
+        profiler: Record decode/convert/inference/landmarks stage timings
+            (None = no instrumentation at all)
+        on_checkpoint: Called after every sampled frame with the number of
+            the next frame, the poses kept so far (before the visibility
+            filter; in summary-only mode only those not yet folded into the
+            aggregator) and the inference count, e.g. to save progress
+        motion_gate: Reuse the pose of the last inferred frame instead of
+            running inference while the gate sees no motion; reused sampled
+            poses are flagged in the series. The gate counts the skipped
+            inferences.
+
+    Returns:
+        Tuple of (PoseSeries of the usable sampled poses, number of inferences run)
+    """
+    buffers = FrameBufferRing(_decode_buffer_count(pipelined, queue_size)) if reuse_buffers else None
+
+    should_decode = None
+    if sparse:
+        def should_decode(frame_number: int) -> bool:
+            return (frame_number < sample_from
+                    or needs_inference(frame_number, frame_interval, warmup_frames, end_frame))
+
+    frames = (
+        DecodedFrame(n, n / fps if fps > 0 else 0, int(n * 1000 / fps) if fps > 0 else 0, image)
+        for n, image in iter_video_frames(
+            video_capture, start_frame, end_frame, should_decode, total_frames, on_progress, buffers
+        )
+    )
+
+    def is_sampled(frame: DecodedFrame) -> bool:
+        return frame.frame_number >= sample_from and frame.frame_number % frame_interval == 0
+
+    return analyze_decoded_frames(
+        frames, pose_landmarker, is_sampled,
+        pipelined=pipelined,
+        queue_size=queue_size,
+        on_frame=on_frame,
+        aggregator=aggregator,
+        max_inference_size=max_inference_size,
+        roi_tracking=roi_tracking,
+        reuse_buffers=reuse_buffers,
+        profiler=profiler,
+        on_checkpoint=on_checkpoint,
+        motion_gate=motion_gate,
+    )
+
+
+class IntervalSampler:
+    """
+    Picks the first frame at or after every multiple of a time interval.
+
+    Used for decoders with real (possibly irregular) timestamps, where
+    sampling every n-th frame would drift from the requested interval.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_sample = 0.0
+
+    def __call__(self, frame: DecodedFrame) -> bool:
+        # Half a millisecond of slack for pts rounding
+        if frame.timestamp + 0.0005 < self._next_sample:
+            return False
+        self._next_sample = (math.floor(frame.timestamp / self.interval + 1e-6) + 1) * self.interval
+        return True
+
+
+def _to_inference_image(
+    image: np.ndarray,
+    max_size: Optional[int],
+    is_rgb: bool,
+    buffers: Optional[FrameBufferRing] = None,
+    scratch: Optional[FrameBufferRing] = None
+) -> np.ndarray:
+    """
+    Downscale (cheaper conversion and copy), then convert BGR to RGB if needed.
+
+    The result is written into buffers and a downscaled BGR frame into
+    scratch, which is only needed until it has been converted.
+    """
+    if is_rgb:
+        return resize_for_inference(image, max_size, buffers)
+    image = resize_for_inference(image, max_size, scratch)
+    dst = buffers.next(image.shape) if buffers is not None else None
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=dst)
+
+
+def analyze_decoded_frames(
+    frames: Iterable[DecodedFrame],
+    pose_landmarker: Any,
+    is_sampled: Callable[[DecodedFrame], bool],
+    rgb_input: bool = False,
+    pipelined: bool = False,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE,
+    on_frame: Optional[Callable[[dict], None]] = None,
+    aggregator: Optional[SummaryAggregator] = None,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    reuse_buffers: bool = True,
+    profiler: Optional[StageProfiler] = None,
+    on_checkpoint: Optional[Callable[[int, PoseSeries, int], None]] = None,
+    motion_gate: Optional[MotionGate] = None
+) -> Tuple[PoseSeries, int]:
+    """
+    Run pose detection over the frames of any decoder.
+
+    Args:
+        frames: DecodedFrame iterator in presentation order
+        pose_landmarker: VIDEO-mode landmarker (or ReusablePoseLandmarker)
+        is_sampled: Called once per frame, in order; True if the frame's pose
+            goes into the result
+        rgb_input: Images are already RGB (otherwise BGR, as from OpenCV)
+        pipelined, queue_size, on_frame, aggregator, max_inference_size,
+        roi_tracking, reuse_buffers, profiler, on_checkpoint, motion_gate: See
+            analyze_frame_range(); the decoder is responsible for reusing its
+            own buffers
+
+    Returns:
+        Tuple of (PoseSeries of the usable sampled poses, number of inferences run)
+    """
+    from mediapipe.tasks.python.vision.core import image as mp_image
+
+    # Converted images only wait in the conversion queue; mp.Image copies
+    # the pixels, so a buffer is free again once inference has started
+    converted_in_flight = pipelined and not roi_tracking
+    buffers = scratch = None
+    if reuse_buffers:
+        buffers = FrameBufferRing(queue_size + 3 if converted_in_flight else 1)
+        scratch = FrameBufferRing(1)
+
+    series = PoseSeries()
+
+    def infer(image_rgb: np.ndarray, timestamp_ms: int) -> Any:
+        mp_img = mp_image.Image(image_format=mp_image.ImageFormat.SRGB, data=image_rgb)
+        return pose_landmarker.detect_for_video(mp_img, timestamp_ms)
+
+    convert = _to_inference_image
+    append = series.append
+    aggregate = _aggregate_and_clear
+    is_static = motion_gate.is_static if motion_gate is not None else None
+    if profiler is not None:
+        # Only wrapped when profiling, so unprofiled runs pay nothing
+        frames = profiler.iterate('decode', frames)
+        convert = profiler.wrap('convert', convert)
+        if is_static is not None:
+            is_static = profiler.wrap('motionGate', is_static)
+        infer = profiler.wrap('inference', infer)
+        append = profiler.wrap('landmarks', append)
+        aggregate = profiler.wrap('metrics', aggregate)
+
+    stages: List[_PipelineStage] = []
+    if pipelined:
+        frames = _PipelineStage(frames, queue_size, 'pose-decode')
+        stages.append(frames)
+
+    if roi_tracking:
+        # The crop depends on the previous result, so cropping and colour
+        # conversion run in the inference loop
+        converted = frames
+    else:
+        converted = (
+            frame._replace(image=convert(frame.image, max_inference_size, rgb_input, buffers, scratch))
+            for frame in frames
+        )
+        if pipelined:
+            converted = _PipelineStage(converted, queue_size, 'pose-convert')
+            stages.append(converted)
+
+    inference_count = 0
+    # ROI predicted from the last inferred frame, and that frame's number
+    next_roi: Optional[Tuple[float, float, float, float]] = None
+    last_inferred = None
+    # Without ROI tracking the frames are converted to RGB before the loop
+    gate_is_rgb = rgb_input or not roi_tracking
+    pose = roi = None
+
+    try:
+        for frame in converted:
+            # The gate only reports a frame static once it has a reference
+            reused = is_static is not None and is_static(frame.image, gate_is_rgb)
+            if reused:
+                # Near-identical to the last inferred frame: keep its pose
+                # (and crop box, which stays valid for the next frame)
+                if roi_tracking:
+                    last_inferred = frame.frame_number
+            else:
+                image_rgb = frame.image
+                roi = None
+                if roi_tracking:
+                    # Only trust the box if the pose was found on the frame right before
+                    if last_inferred == frame.frame_number - 1:
+                        roi = next_roi
+                    cropped, roi = crop_to_roi(image_rgb, roi)
+                    image_rgb = convert(cropped, max_inference_size, rgb_input, buffers, scratch)
+
+                # Process with MediaPipe
+                results = infer(image_rgb, frame.timestamp_ms)
+                inference_count += 1
+
+                pose = results.pose_landmarks[0] if results.pose_landmarks else None
+                if roi_tracking:
+                    # Tracking lost: the next frame goes through at full size
+                    next_roi = pose_roi(pose, roi) if pose else None
+                    last_inferred = frame.frame_number
+
+            # Sample frame at interval
+            sampled = is_sampled(frame)
+            if sampled and pose:
+                append(frame.timestamp, pose, roi, POSE_REUSED if reused else POSE_INFERRED)
+
+                if on_frame is not None:
+                    frame_result = series.frame_dict(len(series) - 1)
+                    if frame_result:
+                        on_frame(frame_result)
+
+                if aggregator is not None and len(series) >= AGGREGATE_BATCH_FRAMES:
+                    aggregate(series, aggregator)
+
+            if sampled and on_checkpoint is not None:
+                on_checkpoint(frame.frame_number + 1, series, inference_count)
+    finally:
+        # Stop upstream first; downstream threads then see their source end
+        for stage in stages:
+            stage.close()
+
+    if aggregator is not None:
+        aggregate(series, aggregator)
+        return series, inference_count
+
+    # Drop poses whose lower body is not visible enough to measure
+    return series.select(series.visible_mask()), inference_count
+
+
+def _aggregate_and_clear(series: PoseSeries, aggregator: SummaryAggregator) -> None:
+    """Fold the usable poses of a series into an aggregator and empty the series."""
+    aggregator.update(series.select(series.visible_mask()).metrics())
+    series.clear()
+
+
+def split_frame_ranges(
+    total_frames: int,
+    frame_interval: int,
+    chunk_count: int
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split a video into contiguous frame ranges for parallel analysis.
+
+    Boundaries are aligned to sample positions so every chunk starts on a
+    sampled frame. The last range is open-ended because CAP_PROP_FRAME_COUNT
+    is only an estimate for some containers.
+
+    Args:
+        total_frames: Reported number of frames
+        frame_interval: Frames between two samples
+        chunk_count: Desired number of ranges
+
+    Returns:
+        List of (start_frame, end_frame) tuples; end_frame of the last is None
+    """
+    samples = max(1, math.ceil(total_frames / frame_interval))
+    chunk_count = max(1, min(chunk_count, samples))
+    boundaries = [
+        round(samples * i / chunk_count) * frame_interval
+        for i in range(chunk_count)
+    ]
+    return [
+        (start, boundaries[i + 1] if i + 1 < chunk_count else None)
+        for i, start in enumerate(boundaries)
+    ]
+
+
+def _analyze_chunk(
+    video_path: str,
+    fps: float,
+    frame_interval: int,
+    start_frame: int,
+    end_frame: Optional[int],
+    sparse: bool,
+    warmup_frames: int,
+    pipelined: bool,
+    queue_size: int,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    profile: bool = False,
+    aggregator: Optional[SummaryAggregator] = None,
+    motion_gate: Optional[MotionGate] = None
+) -> Tuple[PoseSeries, int, Optional[SummaryAggregator], Optional[StageProfiler], Optional[MotionGate]]:
+    """Worker-process entry point for one range of a parallel analysis."""
     video_capture = cv2.VideoCapture(video_path)
     if not video_capture.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
 
-    fps = video_capture.get(cv2.CAP_PROP_FPS)
-    frame_interval = int(fps * sampling_interval)
-    total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-    video_duration = total_frames / fps if fps > 0 else 0
+    # Start a few frames early so the fresh tracker is warm at the first sample
+    seek_frame = max(0, start_frame - warmup_frames)
+    if seek_frame > 0:
+        video_capture.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
+
+    profiler = StageProfiler() if profile else None
+    with profiled_stage(profiler, 'modelInit'):
+        pose_landmarker = create_pose_landmarker()
+    try:
+        series, inference_count = analyze_frame_range(
+            video_capture, pose_landmarker, fps, frame_interval,
+            start_frame=seek_frame,
+            end_frame=end_frame,
+            sample_from=start_frame,
+            sparse=sparse,
+            warmup_frames=warmup_frames,
+            pipelined=pipelined,
+            queue_size=queue_size,
+            aggregator=aggregator,
+            max_inference_size=max_inference_size,
+            roi_tracking=roi_tracking,
+            profiler=profiler,
+            motion_gate=motion_gate,
+        )
+        # The aggregator, profiler and gate were filled in this process; send them back
+        return series, inference_count, aggregator, profiler, motion_gate
+    finally:
+        pose_landmarker.close()
+        video_capture.release()
+
+
+def resolve_worker_count(workers: int) -> int:
+    """Map a --workers value to a process count (0 = all CPU cores)."""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def get_analysis_cache_params(
+    sampling_interval: float,
+    sparse: bool,
+    warmup_frames: int,
+    workers: int,
+    summary_only: bool = False,
+    percentiles: bool = False,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    decoder: str = 'opencv',
+    decode_fps: Optional[float] = None,
+    motion_threshold: Optional[float] = None,
+    infer_every: int = 1,
+    max_gap: Optional[float] = None,
+    smoothing: bool = False,
+    adaptive: bool = False,
+    max_frames: Optional[int] = None,
+    min_change: float = DEFAULT_MIN_CHANGE,
+    segment: bool = False
+) -> Dict[str, Any]:
+    """
+    Parameters that change the analysis result, for result cache keys.
+
+    Pipelining is left out on purpose: it never changes the output.
+    """
+    return {
+        'samplingInterval': sampling_interval,
+        'sparse': sparse,
+        'warmupFrames': warmup_frames if sparse or workers != 1 else None,
+        'workers': resolve_worker_count(workers),
+        'summaryOnly': summary_only,
+        'percentiles': percentiles,
+        'maxInferenceSize': max_inference_size or None,
+        'roiTracking': roi_tracking,
+        'decoder': decoder,
+        'decodeFps': decode_fps,
+        'motionThreshold': motion_threshold,
+        'inferEvery': infer_every,
+        'maxGap': max_gap,
+        'smoothing': smoothing,
+        'adaptive': {'maxFrames': max_frames, 'minChange': min_change} if adaptive else None,
+        'segment': segment,
+        'minPoseDetectionConfidence': MIN_POSE_DETECTION_CONFIDENCE,
+        'minPosePresenceConfidence': MIN_POSE_PRESENCE_CONFIDENCE,
+        'minTrackingConfidence': MIN_TRACKING_CONFIDENCE,
+        'minLandmarkVisibility': MIN_LANDMARK_VISIBILITY,
+    }
+
+
+def save_result(result: dict, output_path: Optional[str]) -> None:
+    """Save an analysis result as JSON if an output path is given."""
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"Results saved to: {output_path}")
+
+
+def ndjson_event_writer(stream: TextIO) -> Callable[[Dict[str, Any]], None]:
+    """
+    Create an analyze_video() on_event callback that streams NDJSON.
+
+    Each event is written as one JSON line and flushed immediately, so a
+    reader on the other end of a pipe sees frames as they are analysed:
+
+        {"event": "start", "videoFileName": "run.mp4", "fps": 30.0, "totalFrames": 900, ...}
+        {"event": "frame", "frame": {"timestamp": 0.5, "landmarks": {...}, "metrics": {...}}}
+        {"event": "progress", "processedFrames": 100, "totalFrames": 900}
+        {"event": "segments", "segments": {...}}
+        {"event": "summary", "summary": {...}, "metadata": {...}}
+
+    The 'segments' event is only sent when turn segmentation is enabled.
+
+    Args:
+        stream: Text stream to write to (e.g. sys.stdout)
+
+    Returns:
+        Event callback
+    """
+    lock = threading.Lock()
+
+    def write_event(event: Dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False)
+        with lock:
+            stream.write(line + '\n')
+            stream.flush()
+
+    return write_event
+
+
+# Below this many frames per chunk, process start-up and model load outweigh the gain
+MIN_FRAMES_PER_CHUNK = 300
+
+
+def analyze_video_series(
+    video_path: str,
+    sampling_interval: float = 0.5,
+    pose_landmarker: Optional[ReusablePoseLandmarker] = None,
+    sparse: bool = False,
+    warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    workers: int = 1,
+    pipelined: bool = False,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    aggregator: Optional[SummaryAggregator] = None,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    decoder: str = 'opencv',
+    decode_fps: Optional[float] = None,
+    profiler: Optional[StageProfiler] = None,
+    start_frame: int = 0,
+    on_checkpoint: Optional[Callable[[int, PoseSeries, int], None]] = None,
+    motion_gate: Optional[MotionGate] = None,
+    anchor_interval: Optional[int] = None
+) -> Tuple[PoseSeries, Dict[str, Any]]:
+    """
+    Run pose detection over a video and return the sampled poses as arrays.
+
+    This is analyze_video() without building the JSON result; see there for
+    the other arguments. When an aggregator is given, poses are folded into
+    it as they are analysed instead of being kept, and the returned series
+    is empty. Likewise a motion_gate counts the inferences it skipped (each
+    parallel chunk fills its own gate, merged back in).
+
+    start_frame resumes an interrupted analysis: only samples from that
+    frame on are analysed, after warmup_frames frames that re-warm the
+    tracker. on_checkpoint is passed to analyze_frame_range(). Both need
+    the sequential OpenCV path.
+
+    With anchor_interval, only every anchor_interval-th frame is decoded
+    and inferred (sparse, without warm-up) and the returned series holds
+    those anchor poses instead of the samples; run info then also has the
+    sampleTimestamps of the whole video to reconstruct (see
+    PoseSeries.interpolated()). OpenCV decoder only.
+
+    Returns:
+        Tuple of (PoseSeries of the usable sampled poses, run info with fps,
+        totalFrames, videoDuration, inferenceFrames and workers)
+    """
+    if (start_frame or on_checkpoint is not None) and (decoder != 'opencv' or resolve_worker_count(workers) != 1):
+        raise ValueError("Checkpoint and resume need the sequential OpenCV decoder (workers=1)")
+    if anchor_interval is not None and decoder != 'opencv':
+        raise ValueError("Interpolated sampling needs the OpenCV decoder; use decode_fps to decimate with ffmpeg")
+
+    video_capture = None
+    ffmpeg_decoder = None
+    if decoder == 'ffmpeg':
+        if sparse or resolve_worker_count(workers) != 1:
+            raise ValueError("The ffmpeg decoder does not support sparse mode or workers; use decode_fps to decimate")
+        ffmpeg_decoder = FFmpegDecoder(video_path, fps=decode_fps, max_size=max_inference_size)
+        fps = ffmpeg_decoder.fps
+        total_frames = ffmpeg_decoder.frame_count
+        video_duration = ffmpeg_decoder.duration
+        frame_interval = get_frame_interval(fps, sampling_interval)
+    elif decoder == 'opencv':
+        if decode_fps:
+            raise ValueError("decode_fps requires the ffmpeg decoder")
+
+        # Open video
+        video_capture = cv2.VideoCapture(video_path)
+        if not video_capture.isOpened():
+            raise ValueError(f"Could not open video file: {video_path}")
+
+        fps = video_capture.get(cv2.CAP_PROP_FPS)
+        frame_interval = get_frame_interval(fps, sampling_interval)
+        total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_duration = total_frames / fps if fps > 0 else 0
+    else:
+        raise ValueError(f"Unknown decoder: {decoder} (expected one of {', '.join(DECODER_NAMES)})")
 
     print(f"Video: {video_path}")
     print(f"FPS: {fps:.2f}, Total frames: {total_frames}, Duration: {video_duration:.2f}s")
     print(f"Sampling interval: {sampling_interval}s, Frame interval: {frame_interval}")
+    if ffmpeg_decoder is not None:
+        print(f"Decoding with ffmpeg at {fps:.2f} fps, sampling by pts")
+    if sparse:
+        print(f"Sparse decoding with {warmup_frames} warm-up frames per sample")
+    if max_inference_size:
+        print(f"Inference frames downscaled to at most {max_inference_size}px")
+    if roi_tracking:
+        print("Inference cropped to the region around the previous pose")
+    if motion_gate is not None:
+        print(f"Reusing the previous pose on frames with motion below {motion_gate.threshold}")
+    if anchor_interval is not None:
+        print(f"Inference every {anchor_interval} frames, samples interpolated")
+        sample_timestamps = np.arange(0, total_frames, frame_interval) / fps if fps > 0 else np.empty(0)
+        # From here on the anchors are the samples of a sparse run without warm-up
+        frame_interval = anchor_interval
+        sparse = anchor_interval > 1
+        warmup_frames = 0
+
+    on_frame = on_progress = None
+    if on_event is not None:
+        on_event({
+            'event': 'start',
+            'videoFileName': Path(video_path).name,
+            'fps': fps,
+            'totalFrames': total_frames,
+            'videoDuration': round(video_duration, 2),
+            'samplingInterval': sampling_interval,
+        })
 
-    # Initialize MediaPipe PoseLandmarker
-    pose_landmarker = create_pose_landmarker()
+        def on_frame(frame_result: dict) -> None:
+            on_event({'event': 'frame', 'frame': frame_result})
 
-    frames_data: List[dict] = []
-    frame_count = 0
-    analyzed_count = 0
+        def on_progress(processed_frames: int) -> None:
+            on_event({'event': 'progress', 'processedFrames': processed_frames, 'totalFrames': total_frames})
 
-    while video_capture.isOpened():
-        success, image = video_capture.read()
-        if not success:
-            break
+    chunk_count = min(
+        resolve_worker_count(workers),
+        max(1, total_frames // MIN_FRAMES_PER_CHUNK),
+    )
 
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    if chunk_count > 1:
+        video_capture.release()
+        frame_ranges = split_frame_ranges(total_frames, frame_interval, chunk_count)
+        chunk_count = len(frame_ranges)
+        print(f"Analyzing {chunk_count} chunks in parallel")
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = []
+        inference_count = 0
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=chunk_count, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    _analyze_chunk, video_path, fps, frame_interval,
+                    start, end, sparse, warmup_frames, pipelined, queue_size,
+                    max_inference_size, roi_tracking, profiler is not None,
+                    None if aggregator is None else SummaryAggregator(aggregator.percentiles),
+                    None if motion_gate is None else MotionGate(motion_gate.threshold, motion_gate.max_reused),
+                )
+                for start, end in frame_ranges
+            ]
+            # Chunks are merged (and streamed) in time order
+            for index, future in enumerate(futures):
+                chunk_series, chunk_inferences, chunk_aggregator, chunk_profiler, chunk_gate = future.result()
+                if profiler is not None:
+                    profiler.merge(chunk_profiler)
+                if motion_gate is not None:
+                    motion_gate.merge(chunk_gate)
+                chunks.append(chunk_series)
+                inference_count += chunk_inferences
+                if aggregator is not None:
+                    aggregator.merge(chunk_aggregator)
+                chunk_frames = len(chunk_series) if aggregator is None else chunk_aggregator.frame_count
+                print(f"Chunk {index + 1}/{chunk_count} done: {chunk_frames} frames")
+
+                if on_event is not None:
+                    for frame_result in chunk_series.to_frames():
+                        on_frame(frame_result)
+                    chunk_end = frame_ranges[index][1]
+                    on_progress(total_frames if chunk_end is None else chunk_end)
+        series = PoseSeries.concatenate(chunks)
+    else:
+        # Initialize MediaPipe PoseLandmarker, or reuse the caller's warm one
+        owns_landmarker = pose_landmarker is None
+        if owns_landmarker:
+            with profiled_stage(profiler, 'modelInit'):
+                pose_landmarker = create_pose_landmarker()
+        else:
+            pose_landmarker.start_video()
+
+        try:
+            if ffmpeg_decoder is not None:
+                def report_progress(processed_frames: int) -> None:
+                    print(f"Processed {processed_frames}/{total_frames} frames...")
+                    if on_progress is not None:
+                        on_progress(processed_frames)
+
+                series, inference_count = analyze_decoded_frames(
+                    ffmpeg_decoder.frames(
+                        report_progress,
+                        FrameBufferRing(_decode_buffer_count(pipelined, queue_size)),
+                    ),
+                    pose_landmarker,
+                    IntervalSampler(sampling_interval),
+                    rgb_input=True,
+                    pipelined=pipelined,
+                    queue_size=queue_size,
+                    on_frame=on_frame,
+                    aggregator=aggregator,
+                    max_inference_size=max_inference_size,
+                    roi_tracking=roi_tracking,
+                    profiler=profiler,
+                    motion_gate=motion_gate,
+                )
+                # Known exactly from the decoded pts now, rather than the container header
+                video_duration = ffmpeg_decoder.duration
+            else:
+                # Resuming: start a few frames early so the tracker is warm at the resume point
+                seek_frame = max(0, start_frame - warmup_frames)
+                if seek_frame > 0:
+                    video_capture.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
+
+                series, inference_count = analyze_frame_range(
+                    video_capture, pose_landmarker, fps, frame_interval,
+                    start_frame=seek_frame,
+                    sample_from=start_frame,
+                    sparse=sparse,
+                    warmup_frames=warmup_frames,
+                    total_frames=total_frames,
+                    pipelined=pipelined,
+                    queue_size=queue_size,
+                    on_frame=on_frame,
+                    on_progress=on_progress,
+                    aggregator=aggregator,
+                    max_inference_size=max_inference_size,
+                    roi_tracking=roi_tracking,
+                    profiler=profiler,
+                    on_checkpoint=on_checkpoint,
+                    motion_gate=motion_gate,
+                )
+        finally:
+            if video_capture is not None:
+                video_capture.release()
+            if owns_landmarker:
+                pose_landmarker.close()
+
+    run_info = {
+        'fps': fps,
+        'totalFrames': total_frames,
+        'videoDuration': video_duration,
+        'inferenceFrames': inference_count,
+        'workers': chunk_count,
+    }
+    if anchor_interval is not None:
+        run_info['sampleTimestamps'] = sample_timestamps
+    return series, run_info
 
-        # Calculate timestamp in milliseconds
-        timestamp_ms = int(frame_count * 1000 / fps) if fps > 0 else 0
 
-        # Process with MediaPipe
-        mp_img = mp_image.Image(image_format=mp_image.ImageFormat.SRGB, data=image_rgb)
-        results = pose_landmarker.detect_for_video(mp_img, timestamp_ms)
+def refine_adaptive_samples(
+    video_path: str,
+    series: PoseSeries,
+    fps: float,
+    pose_landmarker: Optional[ReusablePoseLandmarker] = None,
+    warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    max_frames: Optional[int] = None,
+    min_change: float = DEFAULT_MIN_CHANGE,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    profiler: Optional[StageProfiler] = None
+) -> Tuple[PoseSeries, np.ndarray, int]:
+    """
+    Add frames where the pose changes fastest to a coarse series.
 
-        # Sample frame at interval
-        if frame_count % frame_interval == 0:
-            timestamp = frame_count / fps if fps > 0 else 0
+    Each round of pose_sampling.AdaptiveRefiner picks the middle frames of
+    the most changing windows between neighbouring samples; those frames
+    are decoded (seeking across long gaps, with warmup_frames frames before
+    each to re-warm the tracker) and run through inference, and their poses
+    decide the windows of the next round.
 
-            if results.pose_landmarks and len(results.pose_landmarks) > 0:
-                landmarks = extract_key_landmarks(results.pose_landmarks[0])
+    Args:
+        video_path: Path to the video file
+        series: Usable poses of the regular samples, e.g. from a sparse
+            analyze_video_series() run
+        fps: Video frame rate
+        pose_landmarker: Optional warm landmarker to reuse; a new one is
+            created (and closed afterwards) when omitted
+        warmup_frames, max_frames, min_change, max_inference_size,
+        roi_tracking, profiler: See analyze_video()
 
-                frame_result = analyze_frame(landmarks, timestamp)
-                if frame_result:
-                    frames_data.append(frame_result)
-                    analyzed_count += 1
+    Returns:
+        Tuple of (time-ordered PoseSeries of the regular and refined poses,
+        their sampling tiers, number of inferences run)
+    """
+    frame_numbers = np.rint(series.timestamps * fps).astype(np.int64).tolist()
+    refiner = AdaptiveRefiner(frame_numbers, series.metrics(), max_frames, min_change)
+    targets = refiner.next_round()
+    if not targets:
+        return series, np.zeros(len(series), dtype=np.int64), 0
 
-        frame_count += 1
+    video_capture = cv2.VideoCapture(video_path)
+    if not video_capture.isOpened():
+        raise ValueError(f"Could not open video file: {video_path}")
 
-        # Progress update every 100 frames
-        if frame_count % 100 == 0:
-            print(f"Processed {frame_count}/{total_frames} frames...")
+    owns_landmarker = pose_landmarker is None
+    if owns_landmarker:
+        with profiled_stage(profiler, 'modelInit'):
+            pose_landmarker = ReusablePoseLandmarker()
 
-    video_capture.release()
+    rounds = [series]
+    inference_count = 0
+    buffers = FrameBufferRing(1)
+    try:
+        while targets:
+            print(f"Adaptive sampling: inferring {len(targets)} refined frames")
+            # Timestamps jump back to the start of the video every round
+            pose_landmarker.start_video()
+            wanted = set(targets)
+            frames = (
+                DecodedFrame(n, n / fps, int(n * 1000 / fps), image)
+                for n, image in iter_frames_at(video_capture, targets, warmup_frames, buffers)
+            )
+            round_series, round_inferences = analyze_decoded_frames(
+                frames, pose_landmarker, lambda frame: frame.frame_number in wanted,
+                max_inference_size=max_inference_size,
+                roi_tracking=roi_tracking,
+                profiler=profiler,
+            )
+            inference_count += round_inferences
+            rounds.append(round_series)
+            refiner.add(np.rint(round_series.timestamps * fps).astype(np.int64).tolist(), round_series.metrics())
+            targets = refiner.next_round()
+    finally:
+        video_capture.release()
+        if owns_landmarker:
+            pose_landmarker.close()
+
+    refined = PoseSeries.concatenate(rounds)
+    refined = refined.select(np.argsort(refined.timestamps, kind='stable'))
+    tiers = np.array(
+        [refiner.tiers[n] for n in np.rint(refined.timestamps * fps).astype(np.int64).tolist()],
+        dtype=np.int64,
+    )
+    return refined, tiers, inference_count
+
+
+def _cached_start_event(video_path: str, result: dict) -> Dict[str, Any]:
+    """'start' stream event of a cached result, as analyze_video_series() sends it."""
+    metadata = result['metadata']
+    fps = metadata.get('fps')
+    total_frames = metadata.get('totalFrames')
+    if fps is None or total_frames is None:
+        # Cached before the frame rate was recorded; the container header is enough
+        video_capture = cv2.VideoCapture(video_path)
+        fps = video_capture.get(cv2.CAP_PROP_FPS)
+        total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_capture.release()
+    return {
+        'event': 'start',
+        'videoFileName': Path(video_path).name,
+        'fps': fps,
+        'totalFrames': total_frames,
+        'videoDuration': result['summary']['videoDuration'],
+        'samplingInterval': metadata['samplingInterval'],
+    }
 
-    # Calculate summary statistics
-    if frames_data:
-        cog_heights = [f['metrics']['centerOfGravityHeight'] for f in frames_data]
-        tilt_angles = [abs(f['metrics']['bodyTiltAngle']) for f in frames_data]
-        left_knees = [f['metrics']['leftKneeFlexion'] for f in frames_data]
-        right_knees = [f['metrics']['rightKneeFlexion'] for f in frames_data]
-
-        # Calculate asymmetry (difference between left and right)
-        asymmetries = [
-            abs(f['metrics']['leftKneeFlexion'] - f['metrics']['rightKneeFlexion'])
-            for f in frames_data
-        ]
 
-        summary = {
-            'avgCenterOfGravityHeight': round(sum(cog_heights) / len(cog_heights), 3),
-            'minCenterOfGravityHeight': round(min(cog_heights), 3),
-            'maxBodyTilt': round(max(tilt_angles), 1) if tilt_angles else 0,
-            'avgKneeFlexion': round((sum(left_knees) + sum(right_knees)) / (2 * len(left_knees)), 1),
-            'leftRightAsymmetry': round(sum(asymmetries) / len(asymmetries), 1),
-            'framesAnalyzed': len(frames_data),
-            'videoDuration': round(video_duration, 2),
+def analyze_video(
+    video_path: str,
+    sampling_interval: float = 0.5,
+    output_path: Optional[str] = None,
+    pose_landmarker: Optional[ReusablePoseLandmarker] = None,
+    sparse: bool = False,
+    warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+    workers: int = 1,
+    pipelined: bool = False,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE,
+    cache: Optional['PoseResultCache'] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    summary_only: bool = False,
+    percentiles: bool = False,
+    max_inference_size: Optional[int] = None,
+    roi_tracking: bool = False,
+    decoder: str = 'opencv',
+    decode_fps: Optional[float] = None,
+    profile: Union[bool, StageProfiler] = False,
+    checkpoint: Optional[str] = None,
+    resume: bool = False,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    motion_threshold: Optional[float] = None,
+    infer_every: int = 1,
+    max_gap: Optional[float] = None,
+    smoothing: bool = False,
+    adaptive: bool = False,
+    max_frames: Optional[int] = None,
+    min_change: float = DEFAULT_MIN_CHANGE,
+    segment: bool = False
+) -> dict:
+    """
+    Analyze a ski video and extract pose data.
+
+    Args:
+        video_path: Path to the video file
+        sampling_interval: Time interval between samples in seconds
+        output_path: Optional path to save JSON output
+        pose_landmarker: Optional warm landmarker to reuse; a new one is
+            created (and closed afterwards) when omitted. Ignored when the
+            video is analysed in parallel.
+        sparse: Only decode, convert and run inference on the frames that are
+            sampled plus their warm-up window; all other frames are skipped
+            with grab()
+        warmup_frames: Number of frames before each sample (sparse mode) and
+            before each parallel chunk that are also fed to the tracker so
+            VIDEO-mode tracking has recent context
+        workers: Number of processes to split the video across (0 = all CPU
+            cores). Each process runs its own PoseLandmarker on one time range.
+        pipelined: Decode and colour-convert on background threads connected
+            by bounded queues while inference runs, without changing the output
+        queue_size: Frames buffered between two pipeline stages
+        cache: Optional result cache; a result for the same video bytes and
+            parameters is returned without running detection
+        on_event: Optional callback for streaming. It receives a 'start'
+            event, one 'frame' event per analysed frame and 'progress' events
+            while the video is processed, then a final 'summary' event (see
+            ndjson_event_writer())
+        summary_only: Fold each frame into running summary statistics
+            instead of keeping it, so memory stays flat however long the
+            video is; 'frames' is left empty
+        percentiles: Add SUMMARY_PERCENTILES of every metric to the summary
+        max_inference_size: Downscale frames so their longer side is at most
+            this many pixels before colour conversion and inference (None =
+            full resolution). Landmarks stay normalised to the full frame.
+        roi_tracking: Run inference on a padded crop around the pose found on
+            the previous frame, mapping landmarks back to full-frame
+            coordinates; frames after a lost pose use the full frame
+        decoder: 'opencv' (cv2.VideoCapture) or 'ffmpeg' (an ffmpeg
+            subprocess that decimates, scales and converts to RGB while
+            decoding; samples are taken by real pts, so variable frame rate
+            video is timed correctly). The ffmpeg decoder is sequential and
+            dense only.
+        decode_fps: With the ffmpeg decoder, decimate to this frame rate
+            while decoding so dropped frames never reach Python
+        profile: Add per-stage timings, latency histograms, throughput, model
+            init time and peak RSS to metadata['profile'] (see
+            pose_profiler). Pass a StageProfiler to also receive its
+            on_stage hook calls. Off by default, with no overhead.
+        checkpoint: Save progress (poses so far, summary-only state, next
+            frame) to this sidecar file every checkpoint_interval seconds, and
+            delete it when the analysis completes. An existing directory
+            holds one sidecar per video content and parameters (see
+            pose_checkpoint). Sequential OpenCV decoding only.
+        resume: Continue from the checkpoint of an earlier, interrupted run
+            with the same video contents and parameters if there is one,
+            re-warming tracking on the warmup_frames frames before the
+            resume point
+        checkpoint_interval: Seconds of wall time between checkpoint writes
+        motion_threshold: Skip inference on frames whose grayscale thumbnail
+            differs from the last inferred frame by less than this mean
+            grey level (0-255) and reuse that frame's pose and metrics; such
+            frames get 'reusedPose': True and metadata['motionGate'] reports
+            the skipped inferences (None = infer every frame, see motion_gate)
+        infer_every: Run inference on every infer_every-th frame only and
+            reconstruct the landmarks and metrics of the sampled frames in
+            between by linear interpolation ('interpolated': True). Use a
+            short sampling_interval for a dense series at a fraction of the
+            inference cost. OpenCV decoder; not with sparse or summary_only.
+        max_gap: Longest stretch in seconds without a usable pose that is
+            interpolated across, which also fills samples that fail the
+            visibility gate. Defaults to pose_interpolation.DEFAULT_MAX_GAP
+            with infer_every > 1; setting it with infer_every=1 fills
+            visibility gaps of an otherwise dense run.
+        smoothing: Remove landmark jitter with a One-Euro filter before
+            metrics are computed (and before interpolation). Not with
+            summary_only.
+        adaptive: Analyse the sampling_interval grid sparsely (tier 0),
+            then decode and infer extra frames in the middle of the windows
+            where tilt, knee flexion and centre-of-gravity height change
+            fastest, round by round (see refine_adaptive_samples()). Each
+            frame gets its 'samplingTier'; the summary covers all of them.
+            Implies sparse; OpenCV decoder, not with summary_only or
+            interpolated sampling.
+        max_frames: Adaptive budget of sampled frames including the regular
+            samples (None = pose_sampling.DEFAULT_BUDGET_FACTOR times their
+            number)
+        min_change: Adaptive windows changing less than this (in units of
+            pose_sampling.METRIC_CHANGE_SCALES) are not refined
+        segment: Split the result frames into turns (initiation, apex,
+            completion) and transitions from body lean and knee flexion, and
+            add them as result['segments'] with one suggested keyframe per
+            turn (see pose_segments and extract_suggested_keyframes()). Not
+            with summary_only.
+
+    Returns:
+        Pose analysis result dictionary
+    """
+    profiler = None
+    if profile:
+        profiler = profile if isinstance(profile, StageProfiler) else StageProfiler()
+        profiler.start()
+    if resume and checkpoint is None:
+        raise ValueError("resume requires a checkpoint path")
+    if infer_every < 1:
+        raise ValueError("infer_every must be at least 1")
+    interpolate = infer_every > 1 or max_gap is not None
+    if adaptive and (summary_only or interpolate):
+        raise ValueError("Adaptive sampling infers its extra frames and cannot be combined with summary-only mode or interpolated sampling")
+    if adaptive and decoder != 'opencv':
+        raise ValueError("Adaptive sampling seeks to the frames it refines and needs the OpenCV decoder")
+    # The coarse pass of adaptive sampling only decodes the regular samples
+    sparse = sparse or adaptive
+    if interpolate and (sparse or summary_only):
+        raise ValueError("Interpolated sampling cannot be combined with sparse or summary-only mode")
+    if smoothing and summary_only:
+        raise ValueError("Smoothing needs the per-frame poses and cannot be combined with summary-only mode")
+    if segment and summary_only:
+        raise ValueError("Turn segmentation needs the per-frame poses and cannot be combined with summary-only mode")
+    # Frames only take their final values after the run
+    post_processed = interpolate or smoothing or adaptive
+
+    cache_key = None
+    if cache is not None or checkpoint is not None:
+        params = get_analysis_cache_params(
+            sampling_interval, sparse, warmup_frames, workers, summary_only, percentiles,
+            max_inference_size, roi_tracking, decoder, decode_fps, motion_threshold,
+            infer_every, max_gap, smoothing, adaptive, max_frames, min_change, segment,
+        )
+    if cache is not None:
+        cache_key = cache.key_for(video_path, params, dependencies=[get_model_path()])
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"Using cached pose analysis for: {video_path}")
+            cached['metadata']['videoFileName'] = Path(video_path).name
+            cached['metadata']['cacheHit'] = True
+            if profiler is not None:
+                cached['metadata']['profile'] = profiler.report()
+            if on_event is not None:
+                on_event(_cached_start_event(video_path, cached))
+                for frame_result in cached['frames']:
+                    on_event({'event': 'frame', 'frame': frame_result})
+                if 'segments' in cached:
+                    on_event({'event': 'segments', 'segments': cached['segments']})
+                on_event({'event': 'summary', 'summary': cached['summary'], 'metadata': cached['metadata']})
+            save_result(cached, output_path)
+            return cached
+
+    aggregator = SummaryAggregator(percentiles) if summary_only else None
+    motion_gate = MotionGate(motion_threshold) if motion_threshold is not None else None
+    writer = restored = on_checkpoint = None
+    if checkpoint is not None:
+        # Same key as the result cache, so the video is only hashed once
+        fingerprint = cache_key or checkpoint_fingerprint(video_path, params, [get_model_path()])
+        writer = CheckpointWriter(resolve_checkpoint_path(checkpoint, fingerprint), checkpoint_interval)
+        if resume:
+            restored = load_checkpoint(writer.path, fingerprint)
+
+    # Poses of the run that was interrupted (already filtered), and its inferences
+    done_series = None
+    done_inferences = 0
+    if restored is not None:
+        done_series = PoseSeries.from_arrays(restored.timestamps, restored.landmarks, restored.sources)
+        done_inferences = restored.inference_count
+        if motion_gate is not None:
+            motion_gate.reused_frames = restored.reused_frames
+        if aggregator is not None:
+            aggregator = SummaryAggregator.from_state(restored.aggregator)
+            _aggregate_and_clear(done_series, aggregator)
+            done_series = None
+        else:
+            done_series = done_series.select(done_series.visible_mask())
+        print(f"Resuming from checkpoint at frame {restored.next_frame}")
+        if on_event is not None and done_series is not None and not post_processed:
+            stream_event = on_event
+
+            # Replay the frames of the interrupted run right after the 'start' event
+            def on_event(event: Dict[str, Any]) -> None:
+                stream_event(event)
+                if event['event'] == 'start':
+                    for frame_result in done_series.to_frames():
+                        stream_event({'event': 'frame', 'frame': frame_result})
+
+    if writer is not None:
+        def on_checkpoint(next_frame: int, series: PoseSeries, inference_count: int) -> None:
+            if not writer.due():
+                return
+            if done_series is not None:
+                series = PoseSeries.concatenate([done_series, series])
+            writer.save(Checkpoint(
+                fingerprint=fingerprint,
+                next_frame=next_frame,
+                inference_count=done_inferences + inference_count,
+                timestamps=series.timestamps,
+                landmarks=series.landmarks,
+                aggregator=aggregator.to_state() if aggregator is not None else None,
+                sources=series.sources,
+                reused_frames=motion_gate.reused_frames if motion_gate is not None else 0,
+            ))
+
+    run_event = on_event
+    if on_event is not None and post_processed:
+        # Stream the frames once they are final, after the run
+        def run_event(event: Dict[str, Any]) -> None:
+            if event['event'] != 'frame':
+                on_event(event)
+
+    series, run_info = analyze_video_series(
+        video_path,
+        sampling_interval,
+        pose_landmarker=pose_landmarker,
+        sparse=sparse,
+        warmup_frames=warmup_frames,
+        workers=workers,
+        pipelined=pipelined,
+        queue_size=queue_size,
+        on_event=run_event,
+        aggregator=aggregator,
+        max_inference_size=max_inference_size,
+        roi_tracking=roi_tracking,
+        decoder=decoder,
+        decode_fps=decode_fps,
+        profiler=profiler,
+        start_frame=restored.next_frame if restored is not None else 0,
+        on_checkpoint=on_checkpoint,
+        motion_gate=motion_gate,
+        anchor_interval=infer_every if interpolate else None,
+    )
+    if done_series is not None:
+        series = PoseSeries.concatenate([done_series, series])
+    run_info['inferenceFrames'] += done_inferences
+
+    tiers = adaptive_sampling = None
+    if adaptive:
+        if max_frames is None:
+            max_frames = DEFAULT_BUDGET_FACTOR * len(series)
+        # Refined on the raw poses, before any smoothing
+        series, tiers, refinement_inferences = refine_adaptive_samples(
+            video_path, series, run_info['fps'],
+            pose_landmarker=pose_landmarker,
+            warmup_frames=warmup_frames,
+            max_frames=max_frames,
+            min_change=min_change,
+            max_inference_size=max_inference_size,
+            roi_tracking=roi_tracking,
+            profiler=profiler,
+        )
+        run_info['inferenceFrames'] += refinement_inferences
+        adaptive_sampling = {
+            'maxFrames': max_frames,
+            'minChange': min_change,
+            'framesPerTier': np.bincount(tiers).tolist() if len(tiers) else [],
+            'refinementInferences': refinement_inferences,
         }
-    else:
-        summary = {
-            'avgCenterOfGravityHeight': 0,
-            'minCenterOfGravityHeight': 0,
-            'maxBodyTilt': 0,
-            'avgKneeFlexion': 0,
-            'leftRightAsymmetry': 0,
-            'framesAnalyzed': 0,
-            'videoDuration': round(video_duration, 2),
+
+    if smoothing:
+        with profiled_stage(profiler, 'smoothing'):
+            series = series.smoothed()
+    interpolation = None
+    if interpolate:
+        max_gap = DEFAULT_MAX_GAP if max_gap is None else max_gap
+        with profiled_stage(profiler, 'interpolation'):
+            # Up to infer_every - 1 frames past the first or last usable pose keep it
+            max_hold = (infer_every - 0.5) / run_info['fps'] if run_info['fps'] > 0 else 0.0
+            series = series.interpolated(run_info['sampleTimestamps'], max_gap, max_hold)
+        interpolation = {
+            'inferEvery': infer_every,
+            'maxGap': max_gap,
+            'interpolatedFrames': int(np.count_nonzero(series.sources == POSE_INTERPOLATED)),
         }
 
+    segments = None
+    if aggregator is not None:
+        frames_data = []
+        with profiled_stage(profiler, 'summary'):
+            summary = aggregator.summary(run_info['videoDuration'])
+    else:
+        # Metrics and summary are computed once over the whole landmark array
+        with profiled_stage(profiler, 'metrics'):
+            metrics = series.metrics()
+            frames_data = series.to_frames(metrics)
+            if tiers is not None:
+                for frame_result, tier in zip(frames_data, tiers.tolist()):
+                    frame_result['samplingTier'] = tier
+        with profiled_stage(profiler, 'summary'):
+            summary = series.summary(run_info['videoDuration'], metrics, percentiles)
+        if segment:
+            with profiled_stage(profiler, 'segmentation'):
+                segments = series.segments(metrics)
+
     result = {
         'frames': frames_data,
         'summary': summary,
         'metadata': {
             'videoFileName': Path(video_path).name,
             'samplingInterval': sampling_interval,
+            'fps': run_info['fps'],
+            'totalFrames': run_info['totalFrames'],
             'modelType': 'mediapipe_pose_tasks_api',
+            'samplingMode': 'sparse' if sparse else 'dense',
+            'inferenceFrames': run_info['inferenceFrames'],
+            'workers': run_info['workers'],
+            'summaryOnly': summary_only,
+            'maxInferenceSize': max_inference_size or None,
+            'roiTracking': roi_tracking,
+            'decoder': decoder,
+            'decodeFps': decode_fps,
+            'motionGate': motion_gate.report(run_info['inferenceFrames']) if motion_gate is not None else None,
+            'interpolation': interpolation,
+            'smoothing': {
+                'filter': 'oneEuro',
+                'minCutoff': DEFAULT_MIN_CUTOFF,
+                'beta': DEFAULT_BETA,
+            } if smoothing else None,
+            'adaptiveSampling': adaptive_sampling,
             'processedAt': __import__('datetime').datetime.now().isoformat(),
         }
     }
+    if segments is not None:
+        result['segments'] = segments
+
+    if cache is not None:
+        cache.put(cache_key, result)
+    if writer is not None:
+        writer.remove()
+    if restored is not None:
+        result['metadata']['resumedAtFrame'] = restored.next_frame
+
+    if profiler is not None:
+        # Encode once to time serialisation; the profile itself is added
+        # afterwards and never cached
+        with profiler.stage('serialize'):
+            json.dumps(result, indent=2, ensure_ascii=False)
+        result['metadata']['profile'] = profiler.report()
+        print(format_profile(result['metadata']['profile']))
+
+    save_result(result, output_path)
+
+    if on_event is not None:
+        if run_event is not on_event:
+            for frame_result in frames_data:
+                on_event({'event': 'frame', 'frame': frame_result})
+        if segments is not None:
+            on_event({'event': 'segments', 'segments': segments})
+        on_event({'event': 'summary', 'summary': result['summary'], 'metadata': result['metadata']})
+
+    print(f"Analysis complete: {summary['framesAnalyzed']} frames analyzed, {run_info['inferenceFrames']} inferences")
+    if motion_gate is not None:
+        print(f"Motion gate skipped {motion_gate.reused_frames} inferences")
+    return result
+
+
+def encode_keyframe(
+    image: np.ndarray,
+    timestamp_seconds: float,
+    output_path: Optional[str] = None,
+    width: int = 640
+) -> Dict[str, Any]:
+    """
+    Resize a decoded frame and encode it as a base64 JPEG keyframe.
+
+    Args:
+        image: BGR frame
+        timestamp_seconds: Timestamp the frame was taken at
+        output_path: Optional path to also save the frame
+        width: Output frame width (maintain aspect ratio)
+
+    Returns:
+        Keyframe dictionary
+    """
+    # Resize for consistent display
+    aspect_ratio = image.shape[0] / image.shape[1]
+    height = int(width * aspect_ratio)
+    image_resized = cv2.resize(image, (width, height))
+
+    # Encode as base64 for easy transport
+    _, buffer = cv2.imencode('.jpg', image_resized, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    base64_image = base64.b64encode(buffer).decode('utf-8')
+
+    result: Dict[str, Any] = {
+        "success": True,
+        "timestamp": timestamp_seconds,
+        "width": width,
+        "height": height,
+        "imageBase64": f"data:image/jpeg;base64,{base64_image}",
+        "imageSize": len(base64_image)
+    }
 
-    # Save to output file if specified
     if output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"Results saved to: {output_path}")
+        cv2.imwrite(output_path, image_resized)
+        result["savedPath"] = output_path
 
-    print(f"Analysis complete: {analyzed_count} frames analyzed")
     return result
 
 
@@ -465,35 +2527,136 @@ def extract_frame_at_timestamp(
             "error": "Failed to extract frame from video"
         }
 
-    # Resize for consistent display
-    aspect_ratio = image.shape[0] / image.shape[1]
-    height = int(width * aspect_ratio)
-    image_resized = cv2.resize(image, (width, height))
+    return encode_keyframe(image, timestamp_seconds, output_path, width)
 
-    # Encode as base64 for easy transport
-    _, buffer = cv2.imencode('.jpg', image_resized, [cv2.IMWRITE_JPEG_QUALITY, 85])
-    base64_image = base64.b64encode(buffer).decode('utf-8')
 
-    result: Dict[str, Any] = {
-        "success": True,
-        "timestamp": timestamp_seconds,
-        "width": width,
-        "height": height,
-        "imageBase64": f"data:image/jpeg;base64,{base64_image}",
-        "imageSize": len(base64_image)
-    }
+# Grabbing forward beyond this many frames (about the GOP length of typical
+# phone footage) is slower than seeking to the next keyframe and decoding
+MAX_GRAB_FORWARD_FRAMES = 90
 
-    if output_path:
-        cv2.imwrite(output_path, image_resized)
-        result["savedPath"] = output_path
+# Threads resizing and JPEG-encoding keyframes while the video is decoded
+DEFAULT_ENCODE_WORKERS = min(4, os.cpu_count() or 1)
 
-    return result
+
+def extract_frames_at_timestamps(
+    video_path: str,
+    timestamps: List[float],
+    output_paths: Optional[List[Optional[str]]] = None,
+    width: int = 640,
+    encode_workers: int = DEFAULT_ENCODE_WORKERS,
+    frame_index: Optional['FrameIndex'] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract frames at several timestamps in a single pass over the video.
+
+    Timestamps are visited in order with one capture: the decoder grabs
+    forward between nearby targets and only seeks across large gaps.
+    Resizing and JPEG encoding run on a thread pool while decoding
+    continues. Results are returned in the caller's order and match
+    extract_frame_at_timestamp() for each timestamp.
+
+    With a frame index, timestamps map to frames through the real pts and
+    every seek goes to the preceding keyframe and decodes forward, so the
+    frames are exact even for variable frame rate videos.
+
+    Args:
+        video_path: Path to video file
+        timestamps: Timestamps in seconds, in any order
+        output_paths: Optional per-timestamp paths to save the frames
+        width: Output frame width (maintain aspect ratio)
+        encode_workers: Threads used for resizing and encoding
+        frame_index: Optional FrameIndex of this video for exact random access
+
+    Returns:
+        List of keyframe dictionaries, one per timestamp
+    """
+    output_paths = output_paths or [None] * len(timestamps)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(timestamps)
+
+    video_capture = cv2.VideoCapture(video_path)
+    if not video_capture.isOpened():
+        return [
+            {
+                "success": False,
+                "timestamp": ts,
+                "error": f"Could not open video file: {video_path}"
+            }
+            for ts in timestamps
+        ]
+
+    fps = video_capture.get(cv2.CAP_PROP_FPS)
+    if frame_index is not None:
+        video_duration = frame_index.duration
+        frame_reader = frame_index.reader(video_capture)
+    else:
+        total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_duration = total_frames / fps if fps > 0 else 0
+
+    # (frame number, caller index) for every valid timestamp
+    targets: List[Tuple[int, int]] = []
+    for i, ts in enumerate(timestamps):
+        if ts < 0 or ts >= video_duration:
+            results[i] = {
+                "success": False,
+                "timestamp": ts,
+                "error": f"Timestamp {ts}s is out of video range (0-{video_duration:.2f}s)"
+            }
+        elif frame_index is not None:
+            targets.append((frame_index.frame_for_timestamp(ts) or 0, i))
+        else:
+            targets.append((int(ts * fps), i))
+    targets.sort()
+
+    position = 0  # next frame the capture returns
+    decoded_frame = -1  # frame number currently held in image
+    success = False
+    image = None
+    encoded: Dict[int, Any] = {}
+    with ThreadPoolExecutor(max_workers=max(1, encode_workers)) as executor:
+        for frame_number, i in targets:
+            # Duplicate timestamps reuse the frame already decoded
+            if frame_number != decoded_frame:
+                if frame_index is not None:
+                    success, image = frame_reader.read(frame_number)
+                else:
+                    gap = frame_number - position
+                    success = True
+                    if gap > MAX_GRAB_FORWARD_FRAMES:
+                        video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                    else:
+                        for _ in range(gap):
+                            if not video_capture.grab():
+                                success = False
+                                break
+                    if success:
+                        success, image = video_capture.read()
+                    position = frame_number + 1
+                decoded_frame = frame_number
+
+            if not success:
+                results[i] = {
+                    "success": False,
+                    "timestamp": timestamps[i],
+                    "error": "Failed to extract frame from video"
+                }
+                continue
+
+            encoded[i] = executor.submit(
+                encode_keyframe, image, timestamps[i], output_paths[i], width
+            )
+
+        for i, future in encoded.items():
+            results[i] = future.result()
+
+    video_capture.release()
+    return results
 
 
 def extract_keyframes(
     video_path: str,
     timestamps: List[float],
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    frame_index: Optional['FrameIndex'] = None
 ) -> List[Dict[str, Any]]:
     """
     Extract multiple keyframes at specified timestamps.
@@ -502,20 +2665,21 @@ def extract_keyframes(
         video_path: Path to video file
         timestamps: List of timestamps in seconds
         output_dir: Optional directory to save frames
+        frame_index: Optional FrameIndex of this video for exact random access
 
     Returns:
         List of keyframe dictionaries
     """
-    keyframes: List[Dict[str, Any]] = []
-
-    for i, ts in enumerate(timestamps):
-        output_path = None
-        if output_dir:
-            output_path = str(Path(output_dir) / f"keyframe_{i:03d}_{ts:.2f}.jpg")
+    output_paths: List[Optional[str]] = [
+        str(Path(output_dir) / f"keyframe_{i:03d}_{ts:.2f}.jpg") if output_dir else None
+        for i, ts in enumerate(timestamps)
+    ]
 
-        frame = extract_frame_at_timestamp(video_path, ts, output_path)
-        keyframes.append(frame)
+    keyframes = extract_frames_at_timestamps(
+        video_path, timestamps, output_paths, frame_index=frame_index
+    )
 
+    for ts, output_path, frame in zip(timestamps, output_paths, keyframes):
         if frame["success"]:
             print(f"Extracted keyframe at {ts:.2f}s -> {output_path or 'base64'}")
         else:
@@ -524,6 +2688,83 @@ def extract_keyframes(
     return keyframes
 
 
+def extract_suggested_keyframes(
+    video_path: str,
+    result: dict,
+    output_dir: Optional[str] = None,
+    frame_index: Optional['FrameIndex'] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract the keyframes suggested by turn segmentation, right after analysis.
+
+    Args:
+        video_path: Path to the analysed video file
+        result: analyze_video() result computed with segment=True
+        output_dir: Optional directory to save frames
+        frame_index: Optional FrameIndex of this video for exact random access
+
+    Returns:
+        List of keyframe dictionaries, each also carrying the 'turn' and
+        'phase' it was suggested for
+    """
+    if 'segments' not in result:
+        raise ValueError("Suggested keyframes need a result analysed with turn segmentation")
+    suggestions = result['segments']['keyframes']
+    keyframes = extract_keyframes(
+        video_path, [suggestion['timestamp'] for suggestion in suggestions], output_dir, frame_index
+    )
+    for keyframe, suggestion in zip(keyframes, suggestions):
+        keyframe['turn'] = suggestion['turn']
+        keyframe['phase'] = suggestion['phase']
+    return keyframes
+
+
+def extract_keyframes_only(
+    video_path: str,
+    timestamps: List[float],
+    output_path: Optional[str] = None,
+    keyframes_output_dir: Optional[str] = None,
+    frame_index: Optional['FrameIndex'] = None
+) -> Dict[str, Any]:
+    """
+    Extract keyframes without running pose analysis.
+
+    Only the frames at the requested timestamps are decoded and MediaPipe is
+    never imported. When output_path is given the result is saved there and
+    the keyframe list is also written to the `.keyframes.json` sidecar the
+    API route reads.
+
+    Args:
+        video_path: Path to video file
+        timestamps: List of timestamps in seconds
+        output_path: Optional path to save JSON output
+        keyframes_output_dir: Optional directory to save frame images
+        frame_index: Optional FrameIndex of this video for exact random access
+
+    Returns:
+        Dictionary with the keyframes and metadata
+    """
+    keyframes = extract_keyframes(video_path, timestamps, keyframes_output_dir, frame_index)
+
+    result = {
+        'keyframes': keyframes,
+        'metadata': {
+            'videoFileName': Path(video_path).name,
+            'mode': 'keyframes_only',
+            'processedAt': __import__('datetime').datetime.now().isoformat(),
+        }
+    }
+
+    if output_path:
+        save_result(result, output_path)
+        keyframe_meta_path = Path(output_path).with_suffix('.keyframes.json')
+        with open(keyframe_meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'keyframes': keyframes}, f, indent=2, ensure_ascii=False)
+        print(f"Keyframe metadata saved to: {keyframe_meta_path}")
+
+    return result
+
+
 def format_timestamp(seconds: float) -> str:
     """Format seconds to MM:SS format."""
     minutes = int(seconds // 60)
@@ -0,0 +1,275 @@
+"""
+Ski Analysis Pose Batch
+
+Analyzes many videos in one run, e.g. the nightly re-analysis of archived
+uploads. Videos are distributed over a pool of worker processes; each
+process builds one ReusablePoseLandmarker when it starts and reuses it for
+every video it is handed, so the model is loaded once per worker instead of
+once per video. Every video gets the usual analyze_video() JSON, and the
+batch produces one report with throughput, failures and per-video timing.
+"""
+
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import pose_analyzer
+import pose_cache
+
+# File extensions picked up when a directory is given
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.avi', '.mkv', '.webm')
+
+# Suffix of the per-video result files written to the output directory
+OUTPUT_SUFFIX = '.pose.json'
+
+
+class BatchJob(NamedTuple):
+    """One video of a batch and where its result goes."""
+    input: str
+    output: str
+
+
+def collect_batch_inputs(source: str) -> List[str]:
+    """
+    Expand a batch source into a list of video paths.
+
+    Args:
+        source: A directory (videos found recursively by extension), a glob
+            pattern, or a manifest file: a JSON list of paths, or plain text
+            with one path per line ('#' starts a comment). Relative manifest
+            entries are resolved against the manifest's directory.
+
+    Returns:
+        Video paths in a stable order
+
+    Raises:
+        ValueError: If the source does not exist or yields no videos
+    """
+    path = Path(source)
+    if path.is_dir():
+        inputs = sorted(
+            str(p) for p in path.rglob('*')
+            if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS
+        )
+    elif path.is_file():
+        inputs = _read_manifest(path)
+    elif glob.has_magic(source):
+        inputs = sorted(p for p in glob.glob(source, recursive=True) if Path(p).is_file())
+    else:
+        raise ValueError(f"Batch source not found: {source}")
+
+    if not inputs:
+        raise ValueError(f"No videos found in batch source: {source}")
+    return inputs
+
+
+def _read_manifest(path: Path) -> List[str]:
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() == '.json':
+        entries = json.loads(text)
+        if not isinstance(entries, list) or not all(isinstance(e, str) for e in entries):
+            raise ValueError(f"Manifest must be a JSON list of paths: {path}")
+    else:
+        entries = [line.split('#', 1)[0].strip() for line in text.splitlines()]
+        entries = [e for e in entries if e]
+    return [str(path.parent / e) if not Path(e).is_absolute() else e for e in entries]
+
+
+def plan_batch_jobs(inputs: List[str], output_dir: str) -> List[BatchJob]:
+    """
+    Assign each input an output file <output_dir>/<stem>.pose.json.
+
+    Inputs with the same file name get a numbered suffix so no result
+    overwrites another.
+    """
+    jobs = []
+    used = set()
+    for video_path in inputs:
+        stem = Path(video_path).stem
+        name = stem
+        counter = 1
+        while name in used:
+            counter += 1
+            name = f'{stem}-{counter}'
+        used.add(name)
+        jobs.append(BatchJob(video_path, str(Path(output_dir) / f'{name}{OUTPUT_SUFFIX}')))
+    return jobs
+
+
+# Per-process state of a batch worker, set up by _init_worker()
+_landmarker: Optional[pose_analyzer.ReusablePoseLandmarker] = None
+_cache: Optional[pose_cache.PoseResultCache] = None
+_model_init_ms = 0
+_quiet = True
+
+
+def _init_worker(cache_dir: Optional[str], cache_max_bytes: Optional[int], quiet: bool) -> None:
+    global _landmarker, _cache, _model_init_ms, _quiet
+
+    _quiet = quiet
+    init_start = time.perf_counter()
+    _landmarker = pose_analyzer.ReusablePoseLandmarker()
+    _model_init_ms = int((time.perf_counter() - init_start) * 1000)
+
+    if cache_max_bytes is not None:
+        _cache = pose_cache.PoseResultCache(cache_dir, cache_max_bytes)
+
+
+def _run_job(job: BatchJob, options: Dict[str, Any]) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
+        'input': job.input,
+        'output': job.output,
+        'worker': os.getpid(),
+        'modelInitMs': _model_init_ms,
+    }
+    start = time.perf_counter()
+    try:
+        if not Path(job.input).exists():
+            raise ValueError(f"Input file not found: {job.input}")
+        with contextlib.ExitStack() as stack:
+            if _quiet:
+                # Progress lines from several videos at once would interleave
+                devnull = stack.enter_context(open(os.devnull, 'w'))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            result = pose_analyzer.analyze_video(
+                job.input,
+                output_path=job.output,
+                pose_landmarker=_landmarker,
+                cache=_cache,
+                **options,
+            )
+        record.update({
+            'ok': True,
+            'videoDuration': result['summary']['videoDuration'],
+            'framesAnalyzed': result['summary']['framesAnalyzed'],
+            'inferenceFrames': result['metadata']['inferenceFrames'],
+            'cacheHit': bool(result['metadata'].get('cacheHit')),
+        })
+    except Exception as e:
+        record.update({'ok': False, 'error': str(e)})
+    record['seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    pool_size: int = 1,
+    analysis_options: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: Optional[int] = pose_cache.DEFAULT_MAX_BYTES,
+    quiet: bool = True,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze a list of videos with a pool of warm landmarkers.
+
+    A failing video is recorded in the report and does not stop the batch.
+
+    Args:
+        jobs: Videos and output paths (see plan_batch_jobs())
+        pool_size: Number of worker processes, each with one landmarker
+            (1 = run in this process)
+        analysis_options: Extra keyword arguments for analyze_video(), e.g.
+            sampling_interval or max_inference_size
+        cache_dir: Pose result cache directory (None = default location)
+        cache_max_bytes: Cache size limit; None disables the cache
+        quiet: Silence the analyzer's per-video progress output
+        on_result: Called with each video's record as soon as it finishes
+
+    Returns:
+        Batch report with totals, throughput, failures and per-video records
+        (in input order)
+    """
+    if pool_size < 1:
+        raise ValueError(f"Pool size must be at least 1, got {pool_size}")
+    options = dict(analysis_options or {})
+    pool_size = min(pool_size, len(jobs)) or 1
+    for job in jobs:
+        Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+
+    records: Dict[int, Dict[str, Any]] = {}
+    start = time.perf_counter()
+
+    if pool_size == 1:
+        try:
+            _init_worker(cache_dir, cache_max_bytes, quiet)
+            for index, job in enumerate(jobs):
+                records[index] = _run_job(job, options)
+                if on_result is not None:
+                    on_result(records[index])
+        finally:
+            _close_worker()
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=pool_size,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(cache_dir, cache_max_bytes, quiet),
+        ) as executor:
+            futures = {
+                executor.submit(_run_job, job, options): index
+                for index, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    records[index] = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory)
+                    job = jobs[index]
+                    records[index] = {'input': job.input, 'output': job.output, 'ok': False, 'error': str(e)}
+                if on_result is not None:
+                    on_result(records[index])
+
+    wall_seconds = time.perf_counter() - start
+    return build_batch_report([records[i] for i in range(len(jobs))], wall_seconds, pool_size)
+
+
+def _close_worker() -> None:
+    global _landmarker, _cache
+    if _landmarker is not None:
+        _landmarker.close()
+    _landmarker = None
+    _cache = None
+
+
+def build_batch_report(records: List[Dict[str, Any]], wall_seconds: float, pool_size: int) -> Dict[str, Any]:
+    """Totals and throughput over the per-video records of a batch."""
+    succeeded = [r for r in records if r.get('ok')]
+    failed = [r for r in records if not r.get('ok')]
+    video_seconds = sum(r['videoDuration'] for r in succeeded)
+    inferences = sum(r['inferenceFrames'] for r in succeeded)
+    job_seconds = [r['seconds'] for r in records if 'seconds' in r]
+
+    def per_second(value: float) -> Optional[float]:
+        return round(value / wall_seconds, 2) if wall_seconds > 0 else None
+
+    return {
+        'videos': len(records),
+        'succeeded': len(succeeded),
+        'failed': len(failed),
+        'poolSize': pool_size,
+        'wallSeconds': round(wall_seconds, 3),
+        'throughput': {
+            'videosPerSecond': per_second(len(succeeded)),
+            'videoSecondsPerSecond': per_second(video_seconds),
+            'inferencesPerSecond': per_second(inferences),
+        },
+        'timing': {
+            'meanSeconds': round(sum(job_seconds) / len(job_seconds), 3) if job_seconds else None,
+            'maxSeconds': max(job_seconds) if job_seconds else None,
+            'cacheHits': sum(1 for r in succeeded if r.get('cacheHit')),
+            # One model load per worker process, however many videos it ran
+            'modelLoads': len({r['worker'] for r in records if 'worker' in r}),
+        },
+        'failures': [{'input': r['input'], 'error': r.get('error')} for r in failed],
+        'results': records,
+        'processedAt': __import__('datetime').datetime.now().isoformat(),
+    }
@@ -0,0 +1,201 @@
+"""
+Ski Analysis Pose Result Cache
+
+Content-addressed on-disk cache of analyze_video() results. Entries are
+keyed by the SHA-256 of the video bytes plus every parameter that affects
+the result (sampling, model file, thresholds), so re-uploads of the same
+clip and the route's second keyframe spawn are served without re-running
+pose detection.
+
+Writes are atomic (temp file + rename) and the cache directory is kept under
+a size limit by evicting least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Bump when the result format or analysis logic changes
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('SKI_POSE_CACHE_DIR', Path(tempfile.gettempdir()) / 'ski-pose-cache')
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.json'
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file's contents.
+
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_key(
+    video_path: str,
+    params: Dict[str, Any],
+    dependencies: Iterable[str] = (),
+    digest: Callable[[str], str] = file_digest
+) -> str:
+    """
+    Key for a video's contents plus the parameters and files that shape a result.
+
+    Also used outside the cache, e.g. to match checkpoints to a re-uploaded
+    copy of the same video.
+
+    Args:
+        video_path: Video file; its contents (not its name) go into the key
+        params: JSON-serialisable parameters that affect the result
+        dependencies: Other files whose contents affect the result
+            (e.g. the model file); missing files are keyed by path
+        digest: Function hashing a file's contents
+
+    Returns:
+        Hex key
+    """
+    payload = {
+        'version': CACHE_VERSION,
+        'video': digest(video_path),
+        'params': params,
+        'dependencies': [
+            digest(path) if Path(path).exists() else path
+            for path in dependencies
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PoseResultCache:
+    """Size-bounded LRU cache of pose analysis results on disk."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def key_for(
+        self,
+        video_path: str,
+        params: Dict[str, Any],
+        dependencies: Iterable[str] = ()
+    ) -> str:
+        """Build the cache key for a video and analysis parameters (see content_key())."""
+        return content_key(video_path, params, dependencies, self._digest)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached result for key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            # Unreadable entry; drop it and recompute
+            self._remove(path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: dict) -> None:
+        """Store a result atomically, then evict old entries if over the limit."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            self._remove(Path(temp_path))
+            raise
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for path in self.cache_dir.glob(f'*{_ENTRY_SUFFIX}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove every cache entry.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for path in self.cache_dir.glob(f'*{_ENTRY_SUFFIX}'):
+            self._remove(path)
+            removed += 1
+        return removed
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}{_ENTRY_SUFFIX}'
+
+    def _digest(self, path: str) -> str:
+        # Memoised per (path, size, mtime) so a long-lived worker hashes the model once
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(memo_key)
+        if digest is None:
+            digest = file_digest(path)
+            with self._lock:
+                self._digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,177 @@
+"""
+Ski Analysis Pose Checkpoint
+
+Sidecar files that let an interrupted analyze_video() continue where it
+stopped. While a video is analysed, the sampled poses so far, the
+summary-only aggregator state and the next frame to process are written
+to a JSON sidecar every few seconds (atomically, so a kill mid-write leaves
+the previous checkpoint intact). A later run with resume=True loads it,
+seeks past the finished part and re-warms tracking on the frames just
+before the resume point, like a parallel chunk does.
+
+A checkpoint is tied to the video's contents and the analysis parameters
+through a fingerprint, so a retry with a re-uploaded copy of the same clip
+finds it and a run with different settings ignores it.
+"""
+
+import base64
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from pose_cache import content_key
+
+# Bump when the sidecar format changes; older checkpoints are then ignored
+CHECKPOINT_VERSION = 1
+
+# Default seconds of wall time between two checkpoint writes
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
+
+# Name of a checkpoint inside a checkpoint directory: <fingerprint><suffix>
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+
+
+class Checkpoint(NamedTuple):
+    """Progress of one analysis, enough to continue it."""
+    fingerprint: str
+    next_frame: int
+    inference_count: int
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    aggregator: Optional[Dict[str, Any]] = None
+    # Source of each pose (see PoseSeries.sources), and the inferences the motion gate skipped
+    sources: Optional[np.ndarray] = None
+    reused_frames: int = 0
+
+
+def checkpoint_fingerprint(
+    video_path: str,
+    params: Dict[str, Any],
+    dependencies: Iterable[str] = ()
+) -> str:
+    """Fingerprint of a video's contents and the parameters that shape its result."""
+    return content_key(video_path, params, dependencies)
+
+
+def resolve_checkpoint_path(checkpoint: str, fingerprint: str) -> Path:
+    """
+    Sidecar file for a checkpoint option.
+
+    Args:
+        checkpoint: A file path, or an existing directory in which the file
+            is named after the fingerprint (so retries with a different
+            upload path still find it)
+        fingerprint: See checkpoint_fingerprint()
+    """
+    path = Path(checkpoint)
+    if path.is_dir():
+        return path / f'{fingerprint}{CHECKPOINT_SUFFIX}'
+    return path
+
+
+def _encode_array(array: np.ndarray) -> Dict[str, Any]:
+    return {
+        'dtype': str(array.dtype),
+        'shape': list(array.shape),
+        'data': base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii'),
+    }
+
+
+def _decode_array(encoded: Dict[str, Any]) -> np.ndarray:
+    data = base64.b64decode(encoded['data'])
+    return np.frombuffer(data, dtype=encoded['dtype']).reshape(encoded['shape']).copy()
+
+
+def save_checkpoint(path: Path, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint atomically (temp file + rename)."""
+    payload = {
+        'version': CHECKPOINT_VERSION,
+        'fingerprint': checkpoint.fingerprint,
+        'nextFrame': checkpoint.next_frame,
+        'inferenceFrames': checkpoint.inference_count,
+        'poses': len(checkpoint.timestamps),
+        'timestamps': _encode_array(checkpoint.timestamps),
+        'landmarks': _encode_array(checkpoint.landmarks),
+        'aggregator': checkpoint.aggregator,
+        'sources': _encode_array(checkpoint.sources) if checkpoint.sources is not None else None,
+        'reusedFrames': checkpoint.reused_frames,
+        'savedAt': datetime.now().isoformat(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        remove_checkpoint(Path(temp_path))
+        raise
+
+
+def load_checkpoint(path: Path, fingerprint: str) -> Optional[Checkpoint]:
+    """
+    Read a checkpoint if it exists and belongs to this video and parameters.
+
+    Returns:
+        The checkpoint, or None if there is none, it is unreadable, from an
+        older format, or for a different video or different parameters
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('version') != CHECKPOINT_VERSION or payload.get('fingerprint') != fingerprint:
+            return None
+        return Checkpoint(
+            fingerprint=fingerprint,
+            next_frame=int(payload['nextFrame']),
+            inference_count=int(payload['inferenceFrames']),
+            timestamps=_decode_array(payload['timestamps']),
+            landmarks=_decode_array(payload['landmarks']),
+            aggregator=payload.get('aggregator'),
+            sources=_decode_array(payload['sources']) if payload.get('sources') else None,
+            reused_frames=int(payload.get('reusedFrames', 0)),
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        # Unreadable checkpoint; start over
+        return None
+
+
+def remove_checkpoint(path: Path) -> None:
+    """Delete a checkpoint (no error if it is already gone)."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class CheckpointWriter:
+    """Rate-limits checkpoint writes to one per interval of wall time."""
+
+    def __init__(self, path: Path, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        self._last_save = time.perf_counter()
+
+    def due(self) -> bool:
+        """Whether enough time has passed since the last write."""
+        return time.perf_counter() - self._last_save >= self.interval
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        save_checkpoint(self.path, checkpoint)
+        self.saves += 1
+        self._last_save = time.perf_counter()
+
+    def remove(self) -> None:
+        """Drop the checkpoint once the analysis has finished."""
+        remove_checkpoint(self.path)
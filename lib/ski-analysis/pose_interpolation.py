@@ -0,0 +1,152 @@
+"""
+Ski Analysis Pose Interpolation
+
+Rebuilds a dense pose time series from poses inferred on a subset of
+frames. Landmarks are linearly interpolated between the two nearest usable
+poses, all landmarks and timestamps at once, which also fills frames whose
+own pose failed the visibility gate. Gaps longer than a limit are left
+empty rather than invented.
+
+A One-Euro filter (Casiez et al., CHI 2012) optionally removes landmark
+jitter first. It is a low-pass filter whose cutoff rises with speed, so a
+skier standing still is steady while a fast turn is not smeared; unlike a
+fixed-window filter it copes with the irregular spacing left by dropped
+poses.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+# Longest stretch (seconds) between two usable poses that is interpolated
+DEFAULT_MAX_GAP = 1.0
+
+# One-Euro filter parameters for normalised landmark coordinates: cutoff
+# (Hz) when still, cutoff increase per unit/s of speed, and the cutoff (Hz)
+# of the speed estimate itself
+DEFAULT_MIN_CUTOFF = 1.0
+DEFAULT_BETA = 10.0
+DEFAULT_DERIVATIVE_CUTOFF = 1.0
+
+# Timestamps closer than this (seconds) are the same frame
+_SAME_FRAME = 1e-6
+
+
+def _smoothing_factor(cutoff: np.ndarray, dt: float) -> np.ndarray:
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+def one_euro_filter(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    min_cutoff: float = DEFAULT_MIN_CUTOFF,
+    beta: float = DEFAULT_BETA,
+    derivative_cutoff: float = DEFAULT_DERIVATIVE_CUTOFF,
+    max_gap: float = DEFAULT_MAX_GAP
+) -> np.ndarray:
+    """
+    Smooth a time series with a One-Euro filter.
+
+    The filter runs forward in time and every trailing dimension (e.g. all
+    landmarks and coordinates) is filtered at once. It restarts after a gap
+    longer than max_gap so a pose found again is not dragged towards the
+    one before the gap.
+
+    Args:
+        timestamps: (frames,) increasing timestamps in seconds
+        values: (frames, ...) values to smooth
+        min_cutoff, beta, derivative_cutoff: Filter parameters, see the
+            DEFAULT_* constants
+        max_gap: Restart the filter after this many seconds without a value
+
+    Returns:
+        Smoothed float64 array shaped like values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    smoothed = np.empty_like(values)
+    if len(values) == 0:
+        return smoothed
+
+    previous = smoothed[0] = values[0]
+    derivative = np.zeros_like(values[0])
+    for i in range(1, len(values)):
+        dt = timestamps[i] - timestamps[i - 1]
+        if dt <= 0 or dt > max_gap:
+            previous = smoothed[i] = values[i]
+            derivative = np.zeros_like(values[0])
+            continue
+        raw_derivative = (values[i] - previous) / dt
+        derivative = derivative + _smoothing_factor(np.float64(derivative_cutoff), dt) * (raw_derivative - derivative)
+        alpha = _smoothing_factor(min_cutoff + beta * np.abs(derivative), dt)
+        previous = smoothed[i] = previous + alpha * (values[i] - previous)
+    return smoothed
+
+
+def interpolate_poses(
+    timestamps: np.ndarray,
+    landmarks: np.ndarray,
+    targets: np.ndarray,
+    max_gap: float = DEFAULT_MAX_GAP,
+    max_hold: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Landmarks at target timestamps from poses known at other timestamps.
+
+    A target between two known poses at most max_gap apart is linearly
+    interpolated. A target within max_hold of a known pose that has no
+    partner on its other side (start and end of the video, the edges of a
+    long gap) takes that pose unchanged.
+
+    Args:
+        timestamps: (known,) increasing timestamps of the known poses
+        landmarks: (known, landmarks, fields) known poses
+        targets: (targets,) timestamps to reconstruct
+        max_gap: Longest interval (seconds) interpolated across
+        max_hold: Longest distance (seconds) a pose is held at an edge
+
+    Returns:
+        Tuple of ((targets, landmarks, fields) float32 landmarks, (targets,)
+        mask of the targets that could be filled, (targets,) index of the
+        known pose a target coincides with, or -1 if it was interpolated)
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    result = np.zeros((len(targets),) + landmarks.shape[1:], dtype=np.float32)
+    filled = np.zeros(len(targets), dtype=bool)
+    exact = np.full(len(targets), -1, dtype=np.int64)
+    if len(timestamps) == 0 or len(targets) == 0:
+        return result, filled, exact
+
+    last = len(timestamps) - 1
+    right = np.searchsorted(timestamps, targets)
+    left = np.clip(right - 1, 0, last)
+    right = np.clip(right, 0, last)
+    # Targets on a known pose's own frame take it unchanged
+    at_right = np.abs(timestamps[right] - targets) <= _SAME_FRAME
+    at_left = np.abs(timestamps[left] - targets) <= _SAME_FRAME
+    exact = np.where(at_right, right, np.where(at_left, left, -1))
+
+    before = timestamps[left] <= targets
+    after = timestamps[right] >= targets
+    span = timestamps[right] - timestamps[left]
+    between = before & after & (span > 0) & (span <= max_gap)
+
+    weight = np.zeros(len(targets))
+    weight[between] = (targets[between] - timestamps[left[between]]) / span[between]
+    weight = weight[:, None, None]
+    result[between] = ((1 - weight) * landmarks[left] + weight * landmarks[right])[between]
+    filled |= between
+
+    # Hold the nearest pose where interpolation had nothing to go on
+    distance_left = np.where(before, targets - timestamps[left], np.inf)
+    distance_right = np.where(after, timestamps[right] - targets, np.inf)
+    nearest = np.where(distance_left <= distance_right, left, right)
+    held = ~between & (np.minimum(distance_left, distance_right) <= max_hold)
+    result[held] = landmarks[nearest[held]]
+    filled |= held
+
+    has_exact = exact >= 0
+    result[has_exact] = landmarks[exact[has_exact]]
+    filled |= has_exact
+    return result, filled, exact
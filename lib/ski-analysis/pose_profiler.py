@@ -0,0 +1,204 @@
+"""
+Ski Analysis Pose Profiler
+
+Per-stage timing for analyze_video(): cumulative time, per-call latency
+histograms, throughput, model init time and peak memory. The analyzer only
+wraps its decode iterator, conversion function and landmarker when a
+StageProfiler is passed in, so an unprofiled run executes exactly the same
+code as before.
+
+Stages (in pipeline order):
+
+    modelInit  creating a PoseLandmarker (once per process)
+    decode     reading/grabbing the next frame from the decoder
+    convert    ROI crop, downscale and BGR->RGB conversion
+    inference  wrapping the image for MediaPipe and detect_for_video()
+    landmarks  storing a sampled pose in the PoseSeries
+    metrics    metric arrays, summary-only aggregation and per-frame dicts
+    summary    the result summary
+    serialize  JSON encoding of the result
+"""
+
+import bisect
+import contextlib
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Upper bounds (ms) of the per-call latency histogram buckets; one more bucket above the last
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class _StageStats:
+    """Cumulative time and latency histogram of one stage."""
+
+    __slots__ = ('calls', 'total', 'max', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+
+    def merge(self, other: '_StageStats') -> None:
+        self.calls += other.calls
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+
+class StageProfiler:
+    """
+    Collects per-stage timings of one analysis.
+
+    Stages timed on pipeline threads are recorded by that thread only, so
+    no lock is needed on the hot path. In pipelined or parallel runs stages
+    overlap and their totals can add up to more than the wall time.
+
+    Library callers can pass on_stage to observe every timed call as it
+    happens, e.g. to feed their own metrics system. The hook runs on the
+    thread that did the work and is not called for work done in the worker
+    processes of a parallel analysis (their stats are merged afterwards).
+    """
+
+    def __init__(self, on_stage: Optional[Callable[[str, float], None]] = None):
+        """
+        Args:
+            on_stage: Optional hook called with (stage name, seconds) after
+                every timed call
+        """
+        self.on_stage = on_stage
+        self._stages: Dict[str, _StageStats] = {}
+        self._stages_lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def start(self) -> None:
+        """Restart the wall clock (e.g. when reusing a profiler)."""
+        self._started = time.perf_counter()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one timed call of a stage."""
+        stats = self._stages.get(stage)
+        if stats is None:
+            with self._stages_lock:
+                stats = self._stages.setdefault(stage, _StageStats())
+        stats.add(seconds)
+        if self.on_stage is not None:
+            self.on_stage(stage, seconds)
+
+    @contextlib.contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time the body of a with block as one call of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        """Return func timed as one call of a stage per invocation."""
+        record = self.record
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, perf_counter() - start)
+
+        return timed
+
+    def iterate(self, stage: str, items: Iterable) -> Iterator:
+        """Yield from items, timing each step of the iterator as one call of a stage."""
+        record = self.record
+        perf_counter = time.perf_counter
+        iterator = iter(items)
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            record(stage, perf_counter() - start)
+            yield item
+
+    def merge(self, other: 'StageProfiler') -> None:
+        """Add the stage stats of another profiler, e.g. from a worker process."""
+        for name, stats in other._stages.items():
+            with self._stages_lock:
+                self._stages.setdefault(name, _StageStats()).merge(stats)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent back from worker processes; the hook and lock stay behind
+        return {'_stages': self._stages, '_started': self._started}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.on_stage = None
+        self._stages_lock = threading.Lock()
+
+    def report(self) -> Dict[str, Any]:
+        """Machine-readable profile for the result metadata."""
+        wall = time.perf_counter() - self._started
+
+        def per_second(stage: str) -> Optional[float]:
+            stats = self._stages.get(stage)
+            return round(stats.calls / wall, 1) if stats and wall > 0 else None
+
+        model_init = self._stages.get('modelInit')
+        return {
+            'wallSeconds': round(wall, 3),
+            'framesPerSecond': per_second('decode'),
+            'inferencesPerSecond': per_second('inference'),
+            'modelInitMs': round(model_init.total * 1000, 1) if model_init else None,
+            'peakRssMb': peak_rss_mb(),
+            'histogramBoundsMs': list(HISTOGRAM_BOUNDS_MS),
+            'stages': {
+                name: {
+                    'calls': stats.calls,
+                    'totalSeconds': round(stats.total, 4),
+                    'meanMs': round(stats.total * 1000 / stats.calls, 3) if stats.calls else None,
+                    'maxMs': round(stats.max * 1000, 3),
+                    'shareOfWall': round(stats.total / wall, 3) if wall > 0 else None,
+                    'histogram': stats.histogram,
+                }
+                for name, stats in self._stages.items()
+            },
+        }
+
+
+def profiled_stage(profiler: Optional[StageProfiler], stage: str):
+    """profiler.stage(stage), or a no-op context when profiling is off."""
+    return profiler.stage(stage) if profiler is not None else contextlib.nullcontext()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def format_profile(profile: Dict[str, Any]) -> str:
+    """One-line human summary of a report(), e.g. for progress output."""
+    parts = [
+        f"{name} {stats['totalSeconds']:.2f}s"
+        for name, stats in sorted(profile['stages'].items(), key=lambda item: -item[1]['totalSeconds'])
+    ]
+    return f"Profile ({profile['wallSeconds']:.2f}s wall): " + ', '.join(parts)
@@ -0,0 +1,270 @@
+"""
+Ski Analysis Compact Prompt Encoding
+
+Token-efficient pose text for the LLM prompt. format_pose_for_llm() in
+scripts/analyze_ski_pose.py writes five lines per sampled frame, so the
+prompt grows with the clip. This encoding merges consecutive frames whose
+centre of gravity, tilt, knee flexion and left/right asymmetry fall in the
+same descriptor bands into one time range, with the mean and range of each
+metric, and lists only the frames that stand out from the whole clip.
+
+An optional character and/or estimated token budget is met by coarsening
+one level at a time until the text fits: asymmetry stops splitting ranges,
+then neighbouring bands merge, then ranges shorter than a doubling minimum
+duration are folded into the range before them, with fewer outliers listed
+at every level.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Descriptor bands, the same as format_pose_for_llm(): upper edges and
+# short labels, explained once in the BAND_LEGEND line
+COG_EDGES = (0.3, 0.5)
+COG_LABELS = ('很低', '适中', '较高')
+TILT_LABELS = ('过度右倾', '右倾', '中立', '左倾', '过度左倾')
+KNEE_EDGES = (90, 110, 130)
+KNEE_LABELS = ('深屈', '适中', '浅屈', '伸直')
+ASYMMETRY_LABELS = ('对称', '略差', '差大')
+BAND_LEGEND = (
+    "档位：重心 很低<0.3≤适中<0.5≤较高；倾斜 中立≤3°<左/右倾≤10°<过度；"
+    "膝角 深屈<90°≤适中<110°≤浅屈<130°≤伸直；膝差 对称≤5°<略差≤15°<差大"
+)
+
+# Coarse band of every band, used from COARSE_LEVEL on
+COG_COARSE = (0, 1, 1)
+TILT_COARSE = (0, 0, 1, 2, 2)
+KNEE_COARSE = (0, 0, 1, 1)
+
+# Coarsening levels: asymmetry splits ranges below ASYMMETRY_KEY_LEVELS,
+# coarse bands apply from COARSE_LEVEL, and from FOLD_LEVEL on ranges
+# shorter than 2 ** (level - FOLD_LEVEL + 1) frame spacings are folded
+ASYMMETRY_KEY_LEVELS = 1
+COARSE_LEVEL = 2
+FOLD_LEVEL = 3
+
+# Outlier frames listed at level 0; halved at every further level
+MAX_OUTLIERS = 8
+
+# Robust z-score (median / MAD) from which a frame counts as an outlier
+OUTLIER_Z = 3.5
+
+# Characters per token of non-CJK text in estimate_tokens(); a CJK
+# character is counted as one token
+CHARS_PER_TOKEN = 4
+
+_CJK = re.compile(r'[\u3000-\u303f\u3400-\u9fff\uff00-\uffef]')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count: one per CJK character, CHARS_PER_TOKEN characters per token otherwise."""
+    cjk = len(_CJK.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / CHARS_PER_TOKEN)
+
+
+def prompt_size_report(verbose: str, compact: str) -> Dict[str, Any]:
+    """Characters, estimated tokens and the reduction of the compact text against the verbose one."""
+    verbose_tokens = estimate_tokens(verbose)
+    compact_tokens = estimate_tokens(compact)
+    return {
+        'verboseChars': len(verbose),
+        'compactChars': len(compact),
+        'verboseTokens': verbose_tokens,
+        'compactTokens': compact_tokens,
+        'charReduction': round(1 - len(compact) / len(verbose), 4) if verbose else 0.0,
+        'tokenReduction': round(1 - compact_tokens / verbose_tokens, 4) if verbose_tokens else 0.0,
+    }
+
+
+def _tilt_bands(tilt: np.ndarray) -> np.ndarray:
+    return np.select([tilt > 10, tilt > 3, tilt < -10, tilt < -3], [4, 3, 0, 1], 2)
+
+
+def _asymmetry_bands(asymmetry: np.ndarray) -> np.ndarray:
+    return np.select([asymmetry > 15, asymmetry > 5], [2, 1], 0)
+
+
+def _outliers(timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> List[dict]:
+    """Frames with a metric OUTLIER_Z robust deviations from its median, most extreme first."""
+    scores = np.zeros(len(timestamps))
+    metric = np.full(len(timestamps), '', dtype=object)
+    medians = {}
+    for name, values in columns.items():
+        median = np.median(values)
+        mad = 1.4826 * np.median(np.abs(values - median))
+        if mad == 0:
+            continue
+        z = np.abs(values - median) / mad
+        higher = z > scores
+        scores[higher] = z[higher]
+        metric[higher] = name
+        medians[name] = median
+    found = np.flatnonzero(scores > OUTLIER_Z)
+    found = found[np.argsort(-scores[found], kind='stable')]
+    return [
+        {'index': int(i), 'metric': metric[i], 'median': float(medians[metric[i]])}
+        for i in found
+    ]
+
+
+# Caption, number format and unit of every column
+_COLUMN_TEXT = {
+    'cog': ('重心', '{:.2f}', ''),
+    'tilt': ('倾斜', '{:.1f}', '°'),
+    'knee': ('膝角', '{:.0f}', '°'),
+    'asymmetry': ('膝差', '{:.0f}', '°'),
+}
+
+
+def _summary_lines(summary: dict) -> List[str]:
+    return [
+        "\n=== 统计摘要 ===",
+        f"  平均重心高度: {summary['avgCenterOfGravityHeight']:.3f}m",
+        f"  最低重心高度: {summary['minCenterOfGravityHeight']:.3f}m",
+        f"  最大身体倾斜: {summary['maxBodyTilt']:.1f}°",
+        f"  平均膝盖折叠: {summary['avgKneeFlexion']:.1f}°",
+        f"  左右不对称度: {summary['leftRightAsymmetry']:.1f}°",
+        f"  有效分析帧数: {summary['framesAnalyzed']}",
+    ]
+
+
+def _encode(
+    timestamps: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    bands: Dict[str, np.ndarray],
+    outliers: List[dict],
+    summary: dict,
+    level: int
+) -> Tuple[str, int]:
+    """Text at one coarsening level, and its number of time ranges."""
+    count = len(timestamps)
+
+    keys = [bands['cog'], bands['tilt'], bands['knee']]
+    if level >= COARSE_LEVEL:
+        keys = [np.asarray(coarse)[key] for coarse, key in zip((COG_COARSE, TILT_COARSE, KNEE_COARSE), keys)]
+    if level < ASYMMETRY_KEY_LEVELS:
+        keys.append(bands['asymmetry'])
+    key = np.stack(keys, axis=1)
+    starts = np.concatenate([[0], np.flatnonzero((np.diff(key, axis=0) != 0).any(axis=1)) + 1])
+
+    if level >= FOLD_LEVEL and len(starts) > 1:
+        spacing = float(np.median(np.diff(timestamps))) if count > 1 else 0.0
+        min_duration = spacing * 2 ** (level - FOLD_LEVEL + 1)
+        ends = np.append(starts[1:], count)
+        durations = timestamps[ends - 1] - timestamps[starts] + spacing
+        short = durations < min_duration
+        # A short range joins the one before it; a short first range the one after it
+        keep = ~short
+        keep[0] = True
+        if short[0]:
+            keep[1] = False
+        starts = starts[keep]
+
+    ends = np.append(starts[1:], count)
+    sizes = ends - starts
+    stats = {
+        name: (
+            np.add.reduceat(values, starts) / sizes,
+            np.minimum.reduceat(values, starts),
+            np.maximum.reduceat(values, starts),
+        )
+        for name, values in columns.items()
+    }
+    means = {name: values[0] for name, values in stats.items()}
+    mean_labels = {
+        'cog': np.asarray(COG_LABELS)[np.digitize(means['cog'], COG_EDGES)],
+        'tilt': np.asarray(TILT_LABELS)[_tilt_bands(means['tilt'])],
+        'knee': np.asarray(KNEE_LABELS)[np.digitize(means['knee'], KNEE_EDGES)],
+        'asymmetry': np.asarray(ASYMMETRY_LABELS)[_asymmetry_bands(means['asymmetry'])],
+    }
+
+    lines = ["=== 姿态分析数据 (POSE DATA，紧凑格式) ==="]
+    lines.append(
+        f"{count} 个采样帧合并为 {len(starts)} 个时间段，每行：时间 帧数 | 重心高度 | 身体倾斜 | 平均膝角 | 左右膝差，"
+        "均为段内均值，[] 为段内最小-最大值"
+    )
+    lines.append(BAND_LEGEND)
+    if level:
+        lines.append(f"（为满足长度预算已粗化至第 {level} 级）")
+    for i, (first, last) in enumerate(zip(starts.tolist(), (ends - 1).tolist())):
+        if first == last:
+            parts = [f"{timestamps[first]:.1f}秒"]
+        else:
+            parts = [f"{timestamps[first]:.1f}-{timestamps[last]:.1f}秒 {last - first + 1}帧"]
+        for name, (_, number, unit) in _COLUMN_TEXT.items():
+            mean, low, high = (values[i] for values in stats[name])
+            text = f"{number.format(mean)}{unit} {mean_labels[name][i]}"
+            if first != last and name != 'asymmetry':
+                text += f" [{number.format(low)}-{number.format(high)}]"
+            parts.append(text)
+        lines.append(" | ".join(parts))
+
+    shown = outliers[:MAX_OUTLIERS >> level]
+    if shown:
+        lines.append("\n异常帧（偏离全程中位数最多）：")
+        for outlier in sorted(shown, key=lambda o: o['index']):
+            i = outlier['index']
+            caption, number, unit = _COLUMN_TEXT[outlier['metric']]
+            lines.append(
+                f"  - {timestamps[i]:.1f}秒 {caption} {number.format(columns[outlier['metric']][i])}{unit}"
+                f"（中位 {number.format(outlier['median'])}{unit}）"
+            )
+
+    lines.extend(_summary_lines(summary))
+    return "\n".join(lines), len(starts)
+
+
+def format_pose_compact(
+    result: dict,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Format a pose analysis result as compact text for the LLM.
+
+    Args:
+        result: analyze_video() result
+        max_chars: Character budget of the text (None = no limit)
+        max_tokens: Budget in estimate_tokens() tokens (None = no limit)
+
+    Returns:
+        Text at the finest coarsening level that fits the budget. If even a
+        single time range without outliers does not fit, that text is
+        returned anyway.
+    """
+    frames = result['frames']
+    summary = result['summary']
+    if not frames:
+        lines = ["=== 姿态分析数据 (POSE DATA，紧凑格式) ===", "无有效采样帧"]
+        return "\n".join(lines + _summary_lines(summary))
+
+    timestamps = np.array([frame['timestamp'] for frame in frames], dtype=np.float64)
+    metric_columns = {
+        name: np.array([frame['metrics'][name] for frame in frames], dtype=np.float64)
+        for name in ('centerOfGravityHeight', 'bodyTiltAngle', 'leftKneeFlexion', 'rightKneeFlexion')
+    }
+    columns = {
+        'cog': metric_columns['centerOfGravityHeight'],
+        'tilt': metric_columns['bodyTiltAngle'],
+        'knee': (metric_columns['leftKneeFlexion'] + metric_columns['rightKneeFlexion']) / 2,
+        'asymmetry': np.abs(metric_columns['leftKneeFlexion'] - metric_columns['rightKneeFlexion']),
+    }
+    bands = {
+        'cog': np.digitize(columns['cog'], COG_EDGES),
+        'tilt': _tilt_bands(columns['tilt']),
+        'knee': np.digitize(columns['knee'], KNEE_EDGES),
+        'asymmetry': _asymmetry_bands(columns['asymmetry']),
+    }
+    outliers = _outliers(timestamps, columns)
+
+    level = 0
+    while True:
+        text, ranges = _encode(timestamps, columns, bands, outliers, summary, level)
+        fits = ((max_chars is None or len(text) <= max_chars)
+                and (max_tokens is None or estimate_tokens(text) <= max_tokens))
+        if fits or (ranges == 1 and MAX_OUTLIERS >> level == 0):
+            return text
+        level += 1
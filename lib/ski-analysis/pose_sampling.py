@@ -0,0 +1,129 @@
+"""
+Ski Analysis Adaptive Sampling
+
+Decides which extra frames to run inference on when a fixed sampling
+interval is too coarse for turns and too fine for traverses. Sampling
+starts from the poses of the regular grid (tier 0) and repeatedly splits
+the window between two neighbouring samples in which body tilt, knee
+flexion and centre-of-gravity height change the most, asking for the frame
+in its middle one tier deeper, until every window changes by less than a
+threshold or a frame budget is spent.
+
+The refiner only plans: the caller decodes and infers the frames of each
+round and hands the poses back, so the windows of the next round are
+measured on real poses. How much a window "changes" is the difference of
+each metric between its two end samples, divided by a per-metric scale,
+taking the largest of the four metrics.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Metric change that counts as one unit of change
+METRIC_CHANGE_SCALES = {
+    'centerOfGravityHeight': 0.02,
+    'bodyTiltAngle': 5.0,
+    'leftKneeFlexion': 10.0,
+    'rightKneeFlexion': 10.0,
+}
+
+# Windows changing by less than this many units are not refined
+DEFAULT_MIN_CHANGE = 1.0
+
+# Default frame budget as a multiple of the regular (tier 0) samples
+DEFAULT_BUDGET_FACTOR = 3
+
+
+def scaled_metrics(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Metrics in units of METRIC_CHANGE_SCALES.
+
+    Returns:
+        (frames, metrics) array; NaN metrics count as 0
+    """
+    return np.stack([
+        np.nan_to_num(np.asarray(metrics[name], dtype=np.float64)) / scale
+        for name, scale in METRIC_CHANGE_SCALES.items()
+    ], axis=1)
+
+
+class AdaptiveRefiner:
+    """
+    Plans the refinement rounds of adaptive sampling.
+
+    Every round splits the windows waiting in a priority queue, most
+    changing first, spending at most half of the remaining budget so the
+    halves of a fast-changing window can still outrank slower windows in
+    later rounds. next_round() returns the middle frames and add() takes
+    the poses inferred for them, queueing both halves of each window whose
+    middle frame has a usable pose.
+
+    Args:
+        frame_numbers: Sorted frame numbers of the regular samples with a
+            usable pose
+        metrics: Their per-frame metric arrays (see compute_pose_metrics())
+        max_frames: Frame budget including the regular samples (None =
+            DEFAULT_BUDGET_FACTOR times their number). Every frame asked
+            for counts, whether or not it yields a usable pose.
+        min_change: Only windows whose largest metric change reaches this
+            many units are split
+    """
+
+    def __init__(
+        self,
+        frame_numbers: List[int],
+        metrics: Dict[str, np.ndarray],
+        max_frames: Optional[int] = None,
+        min_change: float = DEFAULT_MIN_CHANGE
+    ):
+        self.max_frames = DEFAULT_BUDGET_FACTOR * len(frame_numbers) if max_frames is None else max_frames
+        self.min_change = min_change
+        # Sampling tier of every frame with a usable pose
+        self.tiers: Dict[int, int] = {}
+        self._values: Dict[int, np.ndarray] = {}
+        # Max-heap of windows by change; ties go to the earlier window
+        self._windows: List[Tuple[float, int, int, int]] = []
+        # Middle frame -> (start, end, tier) of the windows split this round
+        self._pending: Dict[int, Tuple[int, int, int]] = {}
+        self._selected = len(frame_numbers)
+
+        for frame_number, values in zip(frame_numbers, scaled_metrics(metrics)):
+            self._values[frame_number] = values
+            self.tiers[frame_number] = 0
+        for start, end in zip(frame_numbers[:-1], frame_numbers[1:]):
+            self._push(start, end, 1)
+
+    def next_round(self) -> List[int]:
+        """Sorted middle frames of the windows split in the next round (empty when done)."""
+        remaining = self.max_frames - self._selected
+        for _ in range(min(len(self._windows), (remaining + 1) // 2)):
+            _, start, end, tier = heapq.heappop(self._windows)
+            self._pending[(start + end) // 2] = (start, end, tier)
+            self._selected += 1
+        return sorted(self._pending)
+
+    def add(self, frame_numbers: List[int], metrics: Dict[str, np.ndarray]) -> None:
+        """
+        Take the usable poses inferred for the frames of the last round.
+
+        Args:
+            frame_numbers: Frames of the round that have a usable pose
+            metrics: Their per-frame metric arrays
+        """
+        pending, self._pending = self._pending, {}
+        for frame_number, values in zip(frame_numbers, scaled_metrics(metrics)):
+            if frame_number in pending:
+                self._values[frame_number] = values
+                self.tiers[frame_number] = pending[frame_number][2]
+        for middle, (start, end, tier) in pending.items():
+            if middle in self._values:
+                self._push(start, middle, tier + 1)
+                self._push(middle, end, tier + 1)
+
+    def _push(self, start: int, end: int, tier: int) -> None:
+        if end - start > 1:
+            change = float(np.abs(self._values[end] - self._values[start]).max())
+            if change >= self.min_change:
+                heapq.heappush(self._windows, (-change, start, end, tier))
@@ -0,0 +1,236 @@
+"""
+Ski Analysis Turn Segmentation
+
+Splits the analysed frames into turns and the transitions between them,
+from the signed body lean and knee flexion time series, so callers can
+look up "the frames of every turn apex" or pick keyframes without another
+pass over the video or a round trip through the LLM.
+
+A turn is a run of frames leaning to the same side by more than
+NEUTRAL_TILT whose strongest lean reaches MIN_TURN_TILT. Frames in
+between (near-upright, or a lean too weak to be a turn) form a transition.
+Each turn has three phases:
+
+- initiation: from the start of the turn until the lean first reaches
+  APEX_FRACTION of its peak
+- apex: until the lean last reaches it
+- completion: the rest of the turn
+
+The keyframe suggested for a turn is its apex frame: of the frames within
+APEX_TIE_TILT of the peak lean, the one with the deepest knee flexion,
+the earliest on ties.
+
+Segments are stored as a columnar index (one list per column, sorted by
+time) that SegmentIndex answers lookups on with binary searches.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Leans (degrees) within this of upright are neutral
+NEUTRAL_TILT = 3.0
+
+# Smallest peak lean (degrees) of a turn
+MIN_TURN_TILT = 8.0
+
+# Share of the peak lean from which a frame belongs to the apex phase
+APEX_FRACTION = 0.8
+
+# Frames within this many degrees of the peak lean compete for the keyframe
+APEX_TIE_TILT = 1.0
+
+# A longer stretch (seconds) without frames ends a segment
+MAX_SEGMENT_GAP = 1.0
+
+# Phase names, in the order they occur
+PHASES = ('transition', 'initiation', 'apex', 'completion')
+
+
+def segment_turns(
+    timestamps: np.ndarray,
+    lean: np.ndarray,
+    knee_flexion: np.ndarray,
+    max_gap: float = MAX_SEGMENT_GAP
+) -> Dict[str, Any]:
+    """
+    Detect turns and their phases.
+
+    Args:
+        timestamps: (frames,) increasing timestamps in seconds
+        lean: (frames,) signed body lean in degrees; positive when the
+            shoulders are right of the hips in the image
+        knee_flexion: (frames,) knee angle in degrees (180 = straight),
+            e.g. the mean of both knees
+        max_gap: Seconds without frames after which a segment ends
+
+    Returns:
+        Segment index dictionary: 'index' (columnar segments: phase, turn,
+        start, end, firstFrame, lastFrame; frames are positions in the
+        input arrays), 'turns' (direction, time span, peakTilt,
+        minKneeFlexion and keyframe of each turn) and 'keyframes' (one
+        suggestion per turn)
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    lean = np.asarray(lean, dtype=np.float64)
+    knee_flexion = np.asarray(knee_flexion, dtype=np.float64)
+    count = len(timestamps)
+    if count == 0:
+        return _segment_dict([], [], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), timestamps, [], [])
+
+    tilt = np.abs(lean)
+    side = np.where(lean >= NEUTRAL_TILT, 1, np.where(lean <= -NEUTRAL_TILT, -1, 0))
+
+    # Runs of frames leaning to the same side (or neutral), split at gaps
+    gap = np.diff(timestamps) > max_gap
+    run_starts = np.concatenate([[0], np.flatnonzero((np.diff(side) != 0) | gap) + 1])
+    run_sides = side[run_starts]
+    run_peaks = np.maximum.reduceat(tilt, run_starts)
+    run_ids = np.repeat(np.arange(len(run_starts)), np.diff(np.append(run_starts, count)))
+
+    is_turn = (run_sides != 0) & (run_peaks >= MIN_TURN_TILT)
+    turn_starts = run_starts[is_turn]
+    turn_ends = np.append(run_starts, count)[1:][is_turn] - 1
+    turn_of_run = np.cumsum(is_turn) - 1
+    frame_in_turn = is_turn[run_ids]
+    frame_turn = np.where(frame_in_turn, turn_of_run[run_ids], -1)
+
+    # Apex span: first to last frame reaching APEX_FRACTION of the turn's peak
+    positions = np.arange(count)
+    peaks = run_peaks[run_ids]
+    apex = frame_in_turn & (tilt >= APEX_FRACTION * peaks)
+    apex_first = np.minimum.reduceat(np.where(apex, positions, count), run_starts)[is_turn]
+    apex_last = np.maximum.reduceat(np.where(apex, positions, -1), run_starts)[is_turn]
+
+    # Keyframe: deepest knee among the frames near the peak, earliest on ties
+    near_peak = frame_in_turn & (tilt >= peaks - APEX_TIE_TILT)
+    order = np.lexsort((positions, np.where(near_peak, knee_flexion, np.inf), frame_turn))
+    order = order[frame_turn[order] >= 0]
+    keyframes = order[np.flatnonzero(np.diff(frame_turn[order], prepend=-1) != 0)]
+
+    # Segments: each turn's non-empty phases, and the non-turn frames between them
+    phases: List[str] = []
+    turns: List[Optional[int]] = []
+    firsts: List[int] = []
+    lasts: List[int] = []
+    boundaries = np.flatnonzero((np.diff(frame_turn) != 0) | gap) + 1
+    for first, last in zip(np.concatenate([[0], boundaries]), np.append(boundaries, count) - 1):
+        first, last = int(first), int(last)
+        turn = int(frame_turn[first])
+        if turn < 0:
+            spans = [('transition', first, last)]
+        else:
+            spans = [
+                ('initiation', first, int(apex_first[turn]) - 1),
+                ('apex', int(apex_first[turn]), int(apex_last[turn])),
+                ('completion', int(apex_last[turn]) + 1, last),
+            ]
+        for phase, span_first, span_last in spans:
+            if span_first <= span_last:
+                phases.append(phase)
+                turns.append(turn if turn >= 0 else None)
+                firsts.append(span_first)
+                lasts.append(span_last)
+
+    turn_list = []
+    suggestions = []
+    for turn, (first, last, keyframe) in enumerate(zip(turn_starts.tolist(), turn_ends.tolist(), keyframes.tolist())):
+        knees = knee_flexion[first:last + 1]
+        turn_list.append({
+            'turn': turn,
+            'direction': 'right' if lean[first] > 0 else 'left',
+            'start': float(timestamps[first]),
+            'end': float(timestamps[last]),
+            'peakTilt': round(float(tilt[first:last + 1].max()), 2),
+            'minKneeFlexion': round(float(knees.min()), 2),
+            'keyframe': float(timestamps[keyframe]),
+        })
+        suggestions.append({
+            'timestamp': float(timestamps[keyframe]),
+            'turn': turn,
+            'phase': 'apex',
+            'frame': keyframe,
+            'bodyTiltAngle': round(float(tilt[keyframe]), 2),
+            'kneeFlexion': round(float(knee_flexion[keyframe]), 2),
+        })
+
+    return _segment_dict(
+        phases, turns, np.asarray(firsts, dtype=np.int64), np.asarray(lasts, dtype=np.int64),
+        timestamps, turn_list, suggestions,
+    )
+
+
+def _segment_dict(
+    phases: List[str],
+    turns: List[Optional[int]],
+    firsts: np.ndarray,
+    lasts: np.ndarray,
+    timestamps: np.ndarray,
+    turn_list: List[dict],
+    suggestions: List[dict]
+) -> Dict[str, Any]:
+    return {
+        'index': {
+            'phase': phases,
+            'turn': turns,
+            'start': timestamps[firsts].tolist(),
+            'end': timestamps[lasts].tolist(),
+            'firstFrame': firsts.tolist(),
+            'lastFrame': lasts.tolist(),
+        },
+        'turns': turn_list,
+        'keyframes': suggestions,
+    }
+
+
+class SegmentIndex:
+    """
+    Lookups on the 'index' of a segment_turns() result.
+
+    Args:
+        segments: Output of segment_turns() (or the 'segments' entry of an
+            analysis result)
+    """
+
+    def __init__(self, segments: Dict[str, Any]):
+        index = segments['index']
+        self.phases = np.asarray(index['phase'], dtype=object)
+        self.turns = np.asarray([-1 if turn is None else turn for turn in index['turn']], dtype=np.int64)
+        self.starts = np.asarray(index['start'], dtype=np.float64)
+        self.ends = np.asarray(index['end'], dtype=np.float64)
+        self.first_frames = np.asarray(index['firstFrame'], dtype=np.int64)
+        self.last_frames = np.asarray(index['lastFrame'], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def segment_at(self, timestamp: float) -> Optional[int]:
+        """Position of the segment whose span contains timestamp, or None."""
+        i = int(np.searchsorted(self.starts, timestamp, side='right')) - 1
+        if i >= 0 and timestamp <= self.ends[i]:
+            return i
+        return None
+
+    def phase_at(self, timestamp: float) -> Optional[str]:
+        """Phase at a timestamp, or None between segments."""
+        i = self.segment_at(timestamp)
+        return None if i is None else str(self.phases[i])
+
+    def segments_in_phase(self, phase: str, turn: Optional[int] = None) -> np.ndarray:
+        """Positions of the segments of a phase, optionally of one turn only."""
+        if phase not in PHASES:
+            raise ValueError(f"Unknown phase: {phase} (expected one of {', '.join(PHASES)})")
+        mask = self.phases == phase
+        if turn is not None:
+            mask &= self.turns == turn
+        return np.flatnonzero(mask)
+
+    def frames_in_phase(self, phase: str, turn: Optional[int] = None) -> np.ndarray:
+        """Sorted frame positions (in the analysed frames) of a phase."""
+        selected = self.segments_in_phase(phase, turn)
+        if len(selected) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([
+            np.arange(first, last + 1)
+            for first, last in zip(self.first_frames[selected], self.last_frames[selected])
+        ])
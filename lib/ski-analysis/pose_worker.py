@@ -0,0 +1,278 @@
+"""
+Ski Analysis Pose Worker
+
+Long-lived process that loads the pose model once and serves analysis jobs
+over a stdin/stdout JSON-lines protocol, so callers do not pay for importing
+OpenCV/MediaPipe and building a PoseLandmarker on every request.
+
+Protocol (one JSON object per line):
+
+    -> {"id": "1", "op": "analyze", "input": "/tmp/v.mp4", "interval": 0.5, "output": "/tmp/pose.json"}
+    -> {"id": "2", "op": "keyframes", "input": "/tmp/v.mp4", "timestamps": [3.5, 8.2], "outputDir": "/tmp"}
+    -> {"id": "3", "op": "health"}
+    -> {"id": "4", "op": "analyze", "input": "/tmp/v.mp4", "stream": true}
+    -> {"id": "5", "op": "analyze", "input": "/tmp/v.mp4", "segment": true, "suggestedKeyframes": true, "outputDir": "/tmp"}
+    -> {"op": "shutdown"}
+
+    <- {"event": "ready", "poolSize": 2, "modelInitMs": 812}
+    <- {"id": "1", "ok": true, "result": {...}, "elapsedMs": 5321}
+    <- {"id": "2", "ok": false, "error": "Could not open video file: ..."}
+    <- {"id": "4", "event": "frame", "frame": {...}}
+    <- {"id": "4", "event": "summary", "summary": {...}, "metadata": {...}}
+
+Streaming analyze jobs send the analyzer's start/frame/progress/summary
+events tagged with the job id before the final response.
+
+Jobs are queued and handled by a pool of threads, each owning one warm
+landmarker. Health checks are answered immediately, even while all workers
+are busy. Anything the analyzer prints goes to stderr so stdout only carries
+protocol messages.
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO
+
+import frame_index
+import pose_analyzer
+import pose_cache
+
+
+class PoseWorkerServer:
+    """Job queue plus a pool of warm PoseLandmarker instances."""
+
+    def __init__(self, pool_size: int = 1, output: Optional[TextIO] = None):
+        if pool_size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {pool_size}")
+
+        self.pool_size = pool_size
+        self._output = output or sys.stdout
+        self._output_lock = threading.Lock()
+        self._jobs: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._threads: list = []
+        self._stats_lock = threading.Lock()
+        self._busy = 0
+        self._completed = 0
+        self._failed = 0
+        self._started_at = time.monotonic()
+        self.model_init_ms = 0
+        self._cache = pose_cache.PoseResultCache()
+
+    def start(self) -> None:
+        """Create the landmarkers and start one thread per pool slot."""
+        init_start = time.perf_counter()
+        landmarkers = [pose_analyzer.ReusablePoseLandmarker() for _ in range(self.pool_size)]
+        self.model_init_ms = int((time.perf_counter() - init_start) * 1000)
+
+        for index, landmarker in enumerate(landmarkers):
+            thread = threading.Thread(
+                target=self._run_worker,
+                args=(landmarker,),
+                name=f"pose-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        self._send({
+            'event': 'ready',
+            'poolSize': self.pool_size,
+            'modelInitMs': self.model_init_ms,
+        })
+
+    def submit(self, job: Dict[str, Any]) -> None:
+        """Queue a job, answering health checks inline."""
+        if job.get('op') == 'health':
+            self._send({'id': job.get('id'), 'ok': True, 'result': self.health()})
+            return
+        self._jobs.put(job)
+
+    def health(self) -> Dict[str, Any]:
+        """Snapshot of pool state for liveness/readiness checks."""
+        with self._stats_lock:
+            return {
+                'status': 'ok',
+                'poolSize': self.pool_size,
+                'busy': self._busy,
+                'queued': self._jobs.qsize(),
+                'jobsCompleted': self._completed,
+                'jobsFailed': self._failed,
+                'modelInitMs': self.model_init_ms,
+                'uptimeSeconds': round(time.monotonic() - self._started_at, 1),
+            }
+
+    def shutdown(self) -> None:
+        """Let queued jobs finish, then stop the pool."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run_worker(self, landmarker: pose_analyzer.ReusablePoseLandmarker) -> None:
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+
+                with self._stats_lock:
+                    self._busy += 1
+                start = time.perf_counter()
+                try:
+                    result = self._handle(job, landmarker)
+                    response = {'id': job.get('id'), 'ok': True, 'result': result}
+                    succeeded = True
+                except Exception as e:
+                    response = {'id': job.get('id'), 'ok': False, 'error': str(e)}
+                    succeeded = False
+                response['elapsedMs'] = int((time.perf_counter() - start) * 1000)
+
+                with self._stats_lock:
+                    self._busy -= 1
+                    if succeeded:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+                self._send(response)
+        finally:
+            landmarker.close()
+
+    def _handle(
+        self,
+        job: Dict[str, Any],
+        landmarker: pose_analyzer.ReusablePoseLandmarker
+    ) -> Dict[str, Any]:
+        op = job.get('op')
+        video_path = job.get('input')
+        if not video_path:
+            raise ValueError("Job is missing 'input'")
+        if not Path(video_path).exists():
+            raise ValueError(f"Input file not found: {video_path}")
+
+        if op == 'analyze':
+            output_path = job.get('output')
+            on_event = None
+            if job.get('stream'):
+                def on_event(event: Dict[str, Any]) -> None:
+                    self._send({'id': job.get('id'), **event})
+
+            result = pose_analyzer.analyze_video(
+                video_path,
+                float(job.get('interval', 0.5)),
+                output_path,
+                pose_landmarker=landmarker,
+                sparse=bool(job.get('sparse', False)),
+                warmup_frames=int(job.get('warmupFrames', pose_analyzer.DEFAULT_WARMUP_FRAMES)),
+                pipelined=bool(job.get('pipelined', False)),
+                cache=None if job.get('noCache') else self._cache,
+                on_event=on_event,
+                summary_only=bool(job.get('summaryOnly', False)),
+                percentiles=bool(job.get('percentiles', False)),
+                max_inference_size=int(job['maxInferenceSize']) if job.get('maxInferenceSize') else None,
+                roi_tracking=bool(job.get('roi', False)),
+                decoder=job.get('decoder', 'opencv'),
+                decode_fps=float(job['decodeFps']) if job.get('decodeFps') else None,
+                profile=bool(job.get('profile', False)),
+                checkpoint=job.get('checkpoint'),
+                resume=bool(job.get('resume', False)),
+                checkpoint_interval=float(job.get('checkpointInterval', pose_analyzer.DEFAULT_CHECKPOINT_INTERVAL)),
+                motion_threshold=float(job['motionThreshold']) if job.get('motionThreshold') is not None else None,
+                infer_every=int(job.get('inferEvery', 1)),
+                max_gap=float(job['maxGap']) if job.get('maxGap') is not None else None,
+                smoothing=bool(job.get('smooth', False)),
+                adaptive=bool(job.get('adaptive', False)),
+                max_frames=int(job['maxFrames']) if job.get('maxFrames') else None,
+                min_change=float(job.get('minChange', pose_analyzer.DEFAULT_MIN_CHANGE)),
+                segment=bool(job.get('segment') or job.get('suggestedKeyframes')),
+            )
+            if job.get('suggestedKeyframes'):
+                # Same job, so the caller needs no second round trip for the frames
+                index = None
+                if not job.get('noCache'):
+                    index = frame_index.load_or_build_frame_index(video_path, self._cache.cache_dir)
+                result['keyframes'] = pose_analyzer.extract_suggested_keyframes(
+                    video_path, result, job.get('outputDir'), index
+                )
+                if output_path:
+                    pose_analyzer.save_result(result, output_path)
+            if output_path:
+                # The full result is on disk; keep the protocol line small
+                response = {'outputPath': output_path, 'summary': result['summary']}
+                if 'keyframes' in result:
+                    response['keyframes'] = result['keyframes']
+                return response
+            return result
+
+        if op == 'keyframes':
+            timestamps = [float(t) for t in job.get('timestamps', [])]
+            index = None
+            if not job.get('noCache'):
+                index = frame_index.load_or_build_frame_index(video_path, self._cache.cache_dir)
+            keyframes = pose_analyzer.extract_keyframes(
+                video_path, timestamps, job.get('outputDir'), index
+            )
+            return {'keyframes': keyframes}
+
+        raise ValueError(f"Unknown op: {op}")
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        line = json.dumps(message, ensure_ascii=False)
+        with self._output_lock:
+            self._output.write(line + '\n')
+            self._output.flush()
+
+
+def serve(pool_size: int = 1, input_stream: Optional[TextIO] = None) -> None:
+    """
+    Run the worker until stdin closes or a shutdown request arrives.
+
+    Args:
+        pool_size: Number of PoseLandmarker instances (and concurrent jobs)
+        input_stream: Stream of JSON-lines requests (default: stdin)
+    """
+    input_stream = input_stream or sys.stdin
+    protocol_output = sys.stdout
+    # The analyzer reports progress with print(); keep it off the protocol channel
+    sys.stdout = sys.stderr
+
+    server = PoseWorkerServer(pool_size, output=protocol_output)
+    try:
+        server.start()
+        for line in input_stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                server._send({'ok': False, 'error': f"Invalid JSON request: {e}"})
+                continue
+            if not isinstance(job, dict):
+                server._send({'ok': False, 'error': "Request must be a JSON object"})
+                continue
+            if job.get('op') == 'shutdown':
+                break
+            server.submit(job)
+    finally:
+        server.shutdown()
+        sys.stdout = protocol_output
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Ski Analysis Pose Worker (JSON lines over stdin/stdout)')
+    parser.add_argument('--pool-size', '-p', type=int, default=1,
+                        help='Number of warm PoseLandmarker instances (default: 1)')
+
+    args = parser.parse_args()
+    serve(args.pool_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -51,6 +51,15 @@ export interface FrameMetrics {
     /** Right knee flexion angle in degrees */
     rightKneeFlexion: number;
   };
+
+  /** Pose reused from an earlier, near-identical frame instead of inferred (motion gate) */
+  reusedPose?: boolean;
+
+  /** Landmarks interpolated between poses of other frames (interpolated sampling) */
+  interpolated?: boolean;
+
+  /** Adaptive sampling tier that picked this frame: 0 = regular interval, n = n-th refinement */
+  samplingTier?: number;
 }
 
 /**
@@ -97,12 +106,95 @@ export interface PoseAnalysisResult {
     /** Frame sampling interval in seconds */
     samplingInterval: number;
 
+    /** Frame rate of the analysed stream */
+    fps?: number;
+
+    /** Frame count of the analysed stream (from the container header) */
+    totalFrames?: number;
+
     /** Model used for pose detection */
     modelType: string;
 
     /** Processing timestamp */
     processedAt: string;
   };
+
+  /** Turn/phase segment index (only with turn segmentation enabled) */
+  segments?: TurnSegments;
+}
+
+/**
+ * Phase of a turn, or the transition between two turns
+ */
+export type TurnPhase = 'transition' | 'initiation' | 'apex' | 'completion';
+
+/**
+ * One detected turn
+ */
+export interface Turn {
+  /** Turn number, counting from 0 */
+  turn: number;
+
+  /** Side the body leans to, as seen in the image */
+  direction: 'left' | 'right';
+
+  /** First and last frame timestamps in seconds */
+  start: number;
+  end: number;
+
+  /** Strongest body tilt in degrees */
+  peakTilt: number;
+
+  /** Deepest knee flexion (smallest knee angle, both knees averaged) in degrees */
+  minKneeFlexion: number;
+
+  /** Timestamp of the suggested keyframe */
+  keyframe: number;
+}
+
+/**
+ * Keyframe suggested by turn segmentation (the apex of a turn)
+ */
+export interface SuggestedKeyframe {
+  /** Timestamp in seconds */
+  timestamp: number;
+
+  /** Turn the keyframe belongs to */
+  turn: number;
+
+  /** Phase of the keyframe */
+  phase: TurnPhase;
+
+  /** Position of the frame in PoseAnalysisResult.frames */
+  frame: number;
+
+  /** Body tilt and average knee flexion at the keyframe in degrees */
+  bodyTiltAngle: number;
+  kneeFlexion: number;
+}
+
+/**
+ * Turn segmentation of the analysed frames
+ */
+export interface TurnSegments {
+  /** Columnar segment index, sorted by time; row i is one segment */
+  index: {
+    phase: TurnPhase[];
+    /** Turn of the segment (null for transitions) */
+    turn: (number | null)[];
+    /** First and last frame timestamps in seconds */
+    start: number[];
+    end: number[];
+    /** First and last positions in PoseAnalysisResult.frames */
+    firstFrame: number[];
+    lastFrame: number[];
+  };
+
+  /** Detected turns */
+  turns: Turn[];
+
+  /** One suggested keyframe per turn */
+  keyframes: SuggestedKeyframe[];
 }
 
 /**
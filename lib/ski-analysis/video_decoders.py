@@ -0,0 +1,304 @@
+"""
+Ski Analysis Video Decoders
+
+Frame sources for pose analysis. A decoder yields DecodedFrame tuples: the
+frame number, its presentation time in seconds, the timestamp handed to
+MediaPipe in milliseconds, and the image.
+
+pose_analyzer reads frames with cv2.VideoCapture by default (BGR, timestamps
+derived from frame_number / CAP_PROP_FPS). FFmpegDecoder is the alternative
+backend: a local ffmpeg process does the frame-rate decimation, scaling and
+RGB conversion while decoding and writes raw frames to a pipe, and each
+frame carries its real pts, so variable frame rate phone videos get correct
+timestamps.
+"""
+
+import math
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+from collections import deque
+from fractions import Fraction
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Names accepted by --decoder
+DECODER_NAMES = ('opencv', 'ffmpeg')
+
+_DURATION_RE = re.compile(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)')
+_STREAM_FPS_RE = re.compile(r'Stream #\d+:\d+.*?Video:.*?(\d+(?:\.\d+)?)\s+(fps|tbr)')
+_TIME_BASE_RE = re.compile(r'Parsed_showinfo.*config in time_base:\s*(\d+)/(\d+)')
+_FRAME_INFO_RE = re.compile(r'Parsed_showinfo.*\bn:\s*\d+\s+pts:\s*(-?\d+)\s.*?\bs:(\d+)x(\d+)')
+
+
+class DecodedFrame(NamedTuple):
+    """One decoded video frame."""
+    frame_number: int
+    timestamp: float
+    timestamp_ms: int
+    image: np.ndarray
+
+
+class FrameBufferRing:
+    """
+    Round-robin set of reusable frame buffers.
+
+    Decoding and colour conversion write into these instead of allocating a
+    new array per frame. A buffer handed out by next() is overwritten `size`
+    calls later, so size must exceed the number of frames alive at once:
+    1 when frames are processed one at a time, more when pipeline queues
+    hold frames.
+    """
+
+    def __init__(self, size: int = 1):
+        self._buffers: List[Optional[np.ndarray]] = [None] * max(1, size)
+        self._index = 0
+        self.allocations = 0
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def next(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Return a C-contiguous uint8 array of the given shape.
+
+        The slot's memory is reused whenever it is large enough, so smaller
+        frames (e.g. ROI crops) do not cause reallocation either.
+        """
+        index = self._index
+        self._index = (index + 1) % len(self._buffers)
+
+        count = math.prod(shape)
+        buffer = self._buffers[index]
+        if buffer is None or buffer.size < count:
+            buffer = np.empty(count, dtype=np.uint8)
+            self._buffers[index] = buffer
+            self.allocations += 1
+        return buffer[:count].reshape(shape)
+
+
+def find_ffmpeg() -> str:
+    """
+    Locate the ffmpeg executable ($SKI_FFMPEG_PATH, then PATH).
+
+    Raises:
+        RuntimeError: If ffmpeg cannot be found
+    """
+    path = os.environ.get('SKI_FFMPEG_PATH') or shutil.which('ffmpeg')
+    if not path:
+        raise RuntimeError("ffmpeg not found; install it or set SKI_FFMPEG_PATH")
+    return path
+
+
+class FFmpegDecoder:
+    """
+    Decodes a video with an ffmpeg subprocess that writes raw RGB24 frames to
+    a pipe.
+
+    Frame-rate decimation (fps filter) and downscaling (scale filter) happen
+    inside ffmpeg, so dropped frames are never converted or copied into
+    Python. A showinfo filter at the end of the chain reports every output
+    frame's pts and size on stderr; a reader thread parses it so each raw
+    frame can be sliced from the pipe and stamped with its real time.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        fps: Optional[float] = None,
+        max_size: Optional[int] = None,
+        ffmpeg_path: Optional[str] = None
+    ):
+        """
+        Args:
+            video_path: Path to video file
+            fps: Decimate to this frame rate while decoding (None = every frame)
+            max_size: Downscale so the longer side is at most this many pixels
+            ffmpeg_path: ffmpeg executable (default: find_ffmpeg())
+        """
+        self.video_path = video_path
+        self.decimate_fps = fps
+        self.max_size = max_size
+        self.ffmpeg_path = ffmpeg_path or find_ffmpeg()
+        self.source_fps, self._header_duration = self._probe()
+        self._decoded_duration: Optional[float] = None
+
+    @property
+    def fps(self) -> float:
+        """Nominal rate of the frames this decoder yields."""
+        return float(self.decimate_fps) if self.decimate_fps else self.source_fps
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds: from decoded pts once frames() ran, else from the container header."""
+        if self._decoded_duration is not None:
+            return self._decoded_duration
+        return self._header_duration
+
+    @property
+    def frame_count(self) -> int:
+        """Estimated number of frames frames() yields."""
+        return int(round(self.duration * self.fps))
+
+    def frames(
+        self,
+        on_progress: Optional[Callable[[int], None]] = None,
+        buffers: Optional[FrameBufferRing] = None
+    ) -> Iterator[DecodedFrame]:
+        """
+        Decode the video from the start.
+
+        Args:
+            on_progress: Called with the number of frames decoded every 100 frames
+            buffers: Read frames into these reusable buffers (None = a new
+                array per frame)
+
+        Yields:
+            DecodedFrame with an RGB image
+        """
+        process = subprocess.Popen(
+            self._command(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        infos: 'queue.Queue[Optional[Tuple[Fraction, int, int]]]' = queue.Queue()
+        log_tail: deque = deque(maxlen=20)
+        reader = threading.Thread(
+            target=self._read_frame_infos,
+            args=(process.stderr, infos, log_tail),
+            name='ffmpeg-stderr',
+            daemon=True,
+        )
+        reader.start()
+
+        frame_number = 0
+        last_timestamp_ms = -1
+        first_pts: Optional[Fraction] = None
+        last_seconds = 0.0
+        stopped_early = True
+        try:
+            while True:
+                info = infos.get()
+                if info is None:
+                    stopped_early = False
+                    break
+                pts, width, height = info
+
+                if buffers is not None:
+                    image = buffers.next((height, width, 3))
+                else:
+                    image = np.empty((height, width, 3), dtype=np.uint8)
+                if not self._read_exactly(process.stdout, image):
+                    stopped_early = False
+                    break
+
+                # Timestamps start at zero, like the OpenCV backend's
+                if first_pts is None:
+                    first_pts = pts
+                seconds = float(pts - first_pts)
+                # MediaPipe needs strictly increasing integer milliseconds
+                timestamp_ms = max(int(seconds * 1000), last_timestamp_ms + 1)
+                last_timestamp_ms = timestamp_ms
+                last_seconds = seconds
+
+                yield DecodedFrame(frame_number, seconds, timestamp_ms, image)
+                frame_number += 1
+
+                if on_progress is not None and frame_number % 100 == 0:
+                    on_progress(frame_number)
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            reader.join()
+
+        if not stopped_early and process.returncode != 0 and frame_number == 0:
+            raise RuntimeError(
+                f"ffmpeg could not decode {self.video_path}: " + ' | '.join(log_tail)
+            )
+
+        if frame_number > 0:
+            # One nominal frame past the last pts, as for the container duration
+            self._decoded_duration = last_seconds + 1 / self.fps if self.fps > 0 else last_seconds
+
+    def _command(self) -> list:
+        filters = []
+        if self.decimate_fps:
+            filters.append(f'fps={self.decimate_fps}')
+        if self.max_size:
+            # Only ever shrink; the longer side ends up at most max_size
+            filters.append(
+                f"scale=w='min({self.max_size},iw)':h='min({self.max_size},ih)'"
+                ":force_original_aspect_ratio=decrease"
+            )
+        filters += ['format=rgb24', 'showinfo=checksum=0']
+
+        return [
+            self.ffmpeg_path, '-hide_banner', '-nostdin', '-nostats', '-loglevel', 'info',
+            '-i', self.video_path,
+            '-map', '0:v:0', '-an', '-sn', '-dn',
+            '-vf', ','.join(filters),
+            # -vsync rather than -fps_mode (ffmpeg 5.1+) so ffmpeg 4.x works too
+            '-vsync', 'passthrough',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1',
+        ]
+
+    def _probe(self) -> Tuple[float, float]:
+        # `ffmpeg -i` without an output prints the container header and exits non-zero
+        completed = subprocess.run(
+            [self.ffmpeg_path, '-hide_banner', '-nostdin', '-i', self.video_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+        )
+        header = completed.stderr
+
+        fps_match = _STREAM_FPS_RE.search(header)
+        if fps_match is None:
+            last_line = header.strip().splitlines()[-1] if header.strip() else 'no output'
+            raise ValueError(f"Could not open video file: {self.video_path} ({last_line})")
+
+        duration = 0.0
+        duration_match = _DURATION_RE.search(header)
+        if duration_match:
+            hours, minutes, seconds = duration_match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        return float(fps_match.group(1)), duration
+
+    @staticmethod
+    def _read_frame_infos(stderr, infos: queue.Queue, log_tail: deque) -> None:
+        time_base = Fraction(1, 1)
+        try:
+            for raw_line in stderr:
+                line = raw_line.decode('utf-8', errors='replace').rstrip()
+                frame_match = _FRAME_INFO_RE.search(line)
+                if frame_match:
+                    pts, width, height = frame_match.groups()
+                    infos.put((int(pts) * time_base, int(width), int(height)))
+                    continue
+                time_base_match = _TIME_BASE_RE.search(line)
+                if time_base_match:
+                    time_base = Fraction(int(time_base_match.group(1)), int(time_base_match.group(2)))
+                elif 'Parsed_showinfo' not in line:
+                    log_tail.append(line)
+        finally:
+            infos.put(None)
+
+    @staticmethod
+    def _read_exactly(stream, image: np.ndarray) -> bool:
+        view = memoryview(image).cast('B')
+        received = 0
+        while received < len(view):
+            count = stream.readinto(view[received:])
+            if not count:
+                return False
+            received += count
+        return True
@@ -7,8 +7,28 @@ Analyze ski videos and extract pose data for AI coaching.
 Usage:
     python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json
     python scripts/analyze_ski_pose.py -i video.mp4 --interval 0.3
+    python scripts/analyze_ski_pose.py -i video.mp4 --sparse --warmup-frames 3
+    python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --workers 4
+    python scripts/analyze_ski_pose.py -i video_4k.mp4 -o pose_data.json --max-inference-size 960
+    python scripts/analyze_ski_pose.py -i wide_shot.mp4 -o pose_data.json --roi
+    python scripts/analyze_ski_pose.py -i phone.mov -o pose_data.json --decoder ffmpeg --decode-fps 10
+    python scripts/analyze_ski_pose.py -i lift_line.mp4 -o pose_data.json --motion-threshold 0.5
+    python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --interval 0.033 --infer-every 3 --smooth
+    python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --adaptive --max-frames 120
+    python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --segment --suggested-keyframes -ko /tmp/keyframes
+    python scripts/analyze_ski_pose.py -i video.mp4 --format text --llm-format compact --llm-max-tokens 1500
     python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --verbose
+    python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --profile
+    python scripts/analyze_ski_pose.py -i video.mp4 -o pose_data.json --stream
+    python scripts/analyze_ski_pose.py -i long_upload.mp4 -o pose_data.json --resume
+    python scripts/analyze_ski_pose.py -i session.mp4 -o summary.json --summary-only --percentiles
     python scripts/analyze_ski_pose.py -i video.mp4 -k 3.5,8.2 -ko /tmp/keyframes
+    python scripts/analyze_ski_pose.py -i video.mp4 -o out.json -k 3.5,8.2 --keyframes-only
+    python scripts/analyze_ski_pose.py --batch /data/uploads --batch-output-dir /data/pose --pool-size 4
+    python scripts/analyze_ski_pose.py --batch "archive/2024-*/*.mp4" --summary-only
+    python scripts/analyze_ski_pose.py --batch reanalyze.txt --batch-report nightly.json
+    python scripts/analyze_ski_pose.py --serve --pool-size 2
+    python scripts/analyze_ski_pose.py --clear-cache
 """
 
 import argparse
@@ -17,24 +37,42 @@ import importlib.util
 from pathlib import Path
 
 
-# Dynamically import the pose_analyzer module
-def load_pose_analyzer():
-    script_dir = Path(__file__).parent.parent
-    pose_analyzer_path = script_dir / "lib" / "ski-analysis" / "pose_analyzer.py"
+POSE_LIB_DIR = Path(__file__).parent.parent / "lib" / "ski-analysis"
+
+
+# Dynamically import a module from lib/ski-analysis
+def load_pose_module(name: str):
+    # Sibling modules import each other by name
+    if str(POSE_LIB_DIR) not in sys.path:
+        sys.path.insert(0, str(POSE_LIB_DIR))
+
+    # Already imported, e.g. by a sibling module
+    if name in sys.modules:
+        return sys.modules[name]
 
-    spec = importlib.util.spec_from_file_location("pose_analyzer", pose_analyzer_path)
+    spec = importlib.util.spec_from_file_location(name, POSE_LIB_DIR / f"{name}.py")
     if spec is None or spec.loader is None:
-        raise ImportError("Cannot load pose_analyzer module")
+        raise ImportError(f"Cannot load {name} module")
 
     module = importlib.util.module_from_spec(spec)
-    sys.modules["pose_analyzer"] = module
+    sys.modules[name] = module
     spec.loader.exec_module(module)
     return module
 
 
-pose_analyzer = load_pose_analyzer()
-analyze_video = pose_analyzer.analyze_video
-extract_keyframes = pose_analyzer.extract_keyframes
+# The analyzer (cv2, numpy) is only loaded once a command needs it, so --help,
+# cache commands and argument errors start fast; MediaPipe itself is only
+# imported when a landmarker is created
+def load_pose_analyzer():
+    return load_pose_module("pose_analyzer")
+
+
+def load_frame_index(video_path: str, cache, disabled: bool):
+    """Load (or build and persist) the video's frame index for exact keyframe seeks."""
+    if disabled:
+        return None
+    frame_index = load_pose_module("frame_index")
+    return frame_index.load_or_build_frame_index(video_path, cache.cache_dir)
 
 
 def format_pose_for_llm(result: dict) -> str:
@@ -109,6 +147,87 @@ def format_pose_for_llm(result: dict) -> str:
     return "\n".join(lines)
 
 
+def run_batch(args, parser, cache):
+    """Analyze every video of --batch and write the consolidated report."""
+    if args.input:
+        parser.error("--batch cannot be combined with -i/--input")
+    if args.workers != 1:
+        parser.error("--batch parallelises across videos; use --pool-size instead of --workers")
+    if args.stream or args.keyframes or args.keyframes_only or args.suggested_keyframes or args.format != "json":
+        parser.error(
+            "--batch only writes JSON results (no --stream, -k, --keyframes-only, --suggested-keyframes or --format)"
+        )
+
+    if args.checkpoint and not Path(args.checkpoint).is_dir():
+        parser.error("--batch needs a checkpoint directory, not a single file")
+
+    pose_batch = load_pose_module("pose_batch")
+    try:
+        inputs = pose_batch.collect_batch_inputs(args.batch)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    jobs = pose_batch.plan_batch_jobs(inputs, args.batch_output_dir)
+    print(f"Batch: {len(jobs)} videos, {min(args.pool_size, len(jobs))} worker(s)")
+
+    finished = 0
+
+    def report_result(record: dict) -> None:
+        nonlocal finished
+        finished += 1
+        status = "ok" if record["ok"] else f"FAILED: {record['error']}"
+        print(f"[{finished}/{len(jobs)}] {record['input']} ({record.get('seconds', 0):.1f}s) {status}")
+
+    report = pose_batch.run_batch(
+        jobs,
+        pool_size=args.pool_size,
+        analysis_options={
+            "sampling_interval": args.interval,
+            "sparse": args.sparse,
+            "warmup_frames": args.warmup_frames,
+            "pipelined": args.pipelined,
+            "summary_only": args.summary_only,
+            "percentiles": args.percentiles,
+            "max_inference_size": args.max_inference_size,
+            "roi_tracking": args.roi,
+            "decoder": args.decoder,
+            "decode_fps": args.decode_fps,
+            "profile": args.profile,
+            "checkpoint": args.checkpoint,
+            "resume": args.resume,
+            "checkpoint_interval": args.checkpoint_interval,
+            "motion_threshold": args.motion_threshold,
+            "infer_every": args.infer_every,
+            "max_gap": args.max_gap,
+            "smoothing": args.smooth,
+            "adaptive": args.adaptive,
+            "max_frames": args.max_frames,
+            "min_change": args.min_change,
+            "segment": args.segment,
+        },
+        cache_dir=str(cache.cache_dir),
+        cache_max_bytes=None if args.no_cache else cache.max_bytes,
+        quiet=not args.verbose,
+        on_result=report_result,
+    )
+
+    import json
+    report_path = Path(args.batch_report or Path(args.batch_output_dir) / "batch-report.json")
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    throughput = report["throughput"]
+    print(
+        f"Batch complete: {report['succeeded']}/{report['videos']} succeeded in {report['wallSeconds']}s "
+        f"({throughput['videoSecondsPerSecond']} video-seconds/s)"
+    )
+    print(f"Report saved to: {report_path}")
+    if report["failed"]:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Ski Pose Analysis - Extract biomechanical data from ski videos",
@@ -116,7 +235,7 @@ def main():
         epilog=__doc__,
     )
 
-    parser.add_argument("-i", "--input", required=True, help="Input video file path")
+    parser.add_argument("-i", "--input", help="Input video file path")
     parser.add_argument("-o", "--output", help="Output JSON file path (optional)")
     parser.add_argument(
         "-t",
@@ -132,6 +251,23 @@ def main():
         default="json",
         help="Output format (default: json)",
     )
+    parser.add_argument(
+        "--llm-format",
+        choices=["verbose", "compact"],
+        default="verbose",
+        help="Text format: five lines per frame, or time ranges of frames in the same bands with per-range "
+        "statistics and outliers only, reporting the size saved (default: verbose)",
+    )
+    parser.add_argument(
+        "--llm-max-chars",
+        type=int,
+        help="With --llm-format compact, coarsen the text until it has at most this many characters",
+    )
+    parser.add_argument(
+        "--llm-max-tokens",
+        type=int,
+        help="With --llm-format compact, coarsen the text until it has at most this many estimated tokens",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose output"
     )
@@ -146,14 +282,272 @@ def main():
         "--keyframes-output",
         help="Output directory for keyframe screenshots (optional, defaults to temp)",
     )
+    parser.add_argument(
+        "--keyframes-only",
+        action="store_true",
+        help="Only extract the --keyframes frames; skip pose analysis and never load MediaPipe",
+    )
+    parser.add_argument(
+        "--suggested-keyframes",
+        action="store_true",
+        help="Extract the keyframe --segment suggests for every turn in the same run (implies --segment)",
+    )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Only decode and run inference on sampled frames and their warm-up window",
+    )
+    parser.add_argument(
+        "--warmup-frames",
+        type=int,
+        help="Tracker warm-up frames before each sample in --sparse mode and each refined frame of --adaptive "
+        "(default: 3)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Split the video across this many processes (0 = all CPU cores, default: 1)",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Overlap decoding, colour conversion and inference on separate threads",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write NDJSON start/frame/progress/summary events to stdout as the video is analysed "
+        "(other output goes to stderr)",
+    )
+    parser.add_argument(
+        "--max-inference-size",
+        type=int,
+        help="Downscale frames so their longer side is at most this many pixels before inference "
+        "(default: full resolution)",
+    )
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="Crop inference to a padded box around the skier found on the previous frame "
+        "(full frame when tracking is lost)",
+    )
+    parser.add_argument(
+        "--decoder",
+        choices=["opencv", "ffmpeg"],
+        default="opencv",
+        help="Video decoder: OpenCV, or an ffmpeg subprocess (ffmpeg 4.4 or later) that decimates/scales "
+        "while decoding and uses real frame timestamps (sequential, dense only; default: opencv)",
+    )
+    parser.add_argument(
+        "--decode-fps",
+        type=float,
+        help="With --decoder ffmpeg, decimate to this frame rate while decoding",
+    )
+    parser.add_argument(
+        "--motion-threshold",
+        type=float,
+        help="Reuse the previous pose instead of running inference on frames whose 64px grayscale thumbnail "
+        "differs from the last inferred frame by less than this mean grey level (0-255, e.g. 0.5; "
+        "default: infer every frame)",
+    )
+    parser.add_argument(
+        "--infer-every",
+        type=int,
+        default=1,
+        metavar="K",
+        help="Run inference on every K-th frame only and interpolate the landmarks and metrics of the "
+        "sampled frames in between; pair with a short --interval for a dense series (default: 1)",
+    )
+    parser.add_argument(
+        "--max-gap",
+        type=float,
+        metavar="SECONDS",
+        help="Interpolate across up to this many seconds without a usable pose, filling frames that fail "
+        "the visibility gate (default: 1.0 with --infer-every, otherwise off)",
+    )
+    parser.add_argument(
+        "--smooth",
+        action="store_true",
+        help="Remove landmark jitter with a One-Euro filter before metrics are computed",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Sample adaptively: infer the --interval grid sparsely, then seek to and infer extra frames where "
+        "tilt, knee flexion and centre of gravity change fastest, up to --max-frames (each frame records its "
+        "samplingTier; implies --sparse, not with --infer-every)",
+    )
+    parser.add_argument(
+        "--max-frames",
+        type=int,
+        help="Sampled frame budget of --adaptive, including the regular samples (default: 3x the regular samples)",
+    )
+    parser.add_argument(
+        "--min-change",
+        type=float,
+        default=1.0,
+        help="With --adaptive, only refine windows that change by at least this much, in units of 0.02 "
+        "centre-of-gravity height, 5 degrees of tilt or 10 degrees of knee flexion (default: 1.0)",
+    )
+    parser.add_argument(
+        "--segment",
+        action="store_true",
+        help="Split the frames into turns (initiation, apex, completion) and transitions from body lean and "
+        "knee flexion, adding a segment index and one suggested keyframe per turn to the result",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="Only compute the summary with running statistics; per-frame results are not kept (flat memory use)",
+    )
+    parser.add_argument(
+        "--percentiles",
+        action="store_true",
+        help="Add 10th/50th/90th percentiles of every metric to the summary",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Add per-stage timings, latency histograms, throughput, model init time and peak memory "
+        "to metadata.profile",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Save progress to a sidecar file every --checkpoint-interval seconds so an interrupted run "
+        "can be resumed (default: <cache-dir>/checkpoints, one file per video content and parameters)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the checkpoint of an earlier interrupted run with the same video and "
+        "parameters, if there is one (implies --checkpoint)",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between checkpoint writes (default: 5)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the pose result cache (always re-run detection)",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Remove all cached pose results before running",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Pose result cache directory (default: $SKI_POSE_CACHE_DIR or <tmp>/ski-pose-cache)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Size limit of the pose result cache in MB (default: 512)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a long-lived worker serving JSON-lines jobs on stdin/stdout",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=1,
+        help="Number of warm pose landmarkers in --serve and --batch mode (default: 1)",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="SOURCE",
+        help="Analyze many videos: a directory, a glob pattern or a manifest file "
+        "(one path per line, or a JSON list), with --pool-size worker processes",
+    )
+    parser.add_argument(
+        "--batch-output-dir",
+        default="pose-results",
+        help="Directory for the per-video <name>.pose.json results in --batch mode (default: pose-results)",
+    )
+    parser.add_argument(
+        "--batch-report",
+        help="Path of the consolidated batch report (default: <batch-output-dir>/batch-report.json)",
+    )
 
     args = parser.parse_args()
 
-    # Verify input file exists
-    input_path = Path(args.input)
-    if not input_path.exists():
-        print(f"Error: Input file not found: {input_path}", file=sys.stderr)
-        sys.exit(1)
+    if args.serve:
+        pose_worker = load_pose_module("pose_worker")
+        pose_worker.serve(args.pool_size)
+        return
+
+    pose_cache = load_pose_module("pose_cache")
+    cache = pose_cache.PoseResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    if args.clear_cache:
+        removed = cache.clear()
+        print(f"Cleared {removed} cached pose results from {cache.cache_dir}")
+        if not args.input:
+            return
+
+    if not args.batch:
+        if not args.input:
+            parser.error("the following arguments are required: -i/--input")
+
+        # Verify input file exists
+        input_path = Path(args.input)
+        if not input_path.exists():
+            print(f"Error: Input file not found: {input_path}", file=sys.stderr)
+            sys.exit(1)
+
+    pose_analyzer = load_pose_analyzer()
+    if args.warmup_frames is None:
+        args.warmup_frames = pose_analyzer.DEFAULT_WARMUP_FRAMES
+
+    if args.checkpoint == "" or (args.resume and args.checkpoint is None):
+        # Keyed by content, so a retry with a re-uploaded copy finds the checkpoint
+        checkpoint_dir = cache.cache_dir / "checkpoints"
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        args.checkpoint = str(checkpoint_dir)
+
+    if (args.llm_max_chars or args.llm_max_tokens) and args.llm_format != "compact":
+        parser.error("--llm-max-chars and --llm-max-tokens need --llm-format compact")
+
+    if args.suggested_keyframes:
+        if args.keyframes or args.keyframes_only:
+            parser.error("--suggested-keyframes cannot be combined with -k/--keyframes or --keyframes-only")
+        args.segment = True
+
+    if args.batch:
+        run_batch(args, parser, cache)
+        return
+
+    if args.keyframes_only:
+        if not args.keyframes:
+            parser.error("--keyframes-only requires -k/--keyframes")
+        try:
+            timestamps = [float(t.strip()) for t in args.keyframes.split(',')]
+            print(f"Extracting {len(timestamps)} keyframes at timestamps: {args.keyframes}")
+            index = load_frame_index(str(input_path), cache, args.no_cache)
+            result = pose_analyzer.extract_keyframes_only(
+                str(input_path), timestamps, args.output, args.keyframes_output, index
+            )
+            successful = sum(1 for k in result['keyframes'] if k.get('success'))
+            print(f"Successfully extracted {successful}/{len(timestamps)} keyframes")
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    on_event = None
+    if args.stream:
+        on_event = pose_analyzer.ndjson_event_writer(sys.stdout)
+        # Keep stdout for events only; progress and messages go to stderr
+        sys.stdout = sys.stderr
 
     if args.verbose:
         print(f"Analyzing: {input_path}")
@@ -161,21 +555,56 @@ def main():
 
     try:
         # Run analysis (don't save output yet if we need to add keyframes)
-        result = analyze_video(
+        result = pose_analyzer.analyze_video(
             str(input_path),
             sampling_interval=args.interval,
             output_path=None,  # Don't save inside analyze_video
+            sparse=args.sparse,
+            warmup_frames=args.warmup_frames,
+            workers=args.workers,
+            pipelined=args.pipelined,
+            cache=None if args.no_cache else cache,
+            on_event=on_event,
+            summary_only=args.summary_only,
+            percentiles=args.percentiles,
+            max_inference_size=args.max_inference_size,
+            roi_tracking=args.roi,
+            decoder=args.decoder,
+            decode_fps=args.decode_fps,
+            profile=args.profile,
+            checkpoint=args.checkpoint,
+            resume=args.resume,
+            checkpoint_interval=args.checkpoint_interval,
+            motion_threshold=args.motion_threshold,
+            infer_every=args.infer_every,
+            max_gap=args.max_gap,
+            smoothing=args.smooth,
+            adaptive=args.adaptive,
+            max_frames=args.max_frames,
+            min_change=args.min_change,
+            segment=args.segment,
         )
 
         # Extract keyframes if requested
         keyframes_result = []
-        if args.keyframes:
-            timestamps = [float(t.strip()) for t in args.keyframes.split(',')]
-            print(f"\nExtracting {len(timestamps)} keyframes at timestamps: {args.keyframes}")
-            keyframes_result = extract_keyframes(str(input_path), timestamps, args.keyframes_output)
+        if args.keyframes or args.suggested_keyframes:
+            index = load_frame_index(str(input_path), cache, args.no_cache)
+            if args.suggested_keyframes:
+                print(f"\nExtracting {len(result['segments']['keyframes'])} suggested keyframes")
+                keyframes_result = pose_analyzer.extract_suggested_keyframes(
+                    str(input_path), result, args.keyframes_output, index
+                )
+            else:
+                timestamps = [float(t.strip()) for t in args.keyframes.split(',')]
+                print(f"\nExtracting {len(timestamps)} keyframes at timestamps: {args.keyframes}")
+                keyframes_result = pose_analyzer.extract_keyframes(
+                    str(input_path), timestamps, args.keyframes_output, index
+                )
             result['keyframes'] = keyframes_result
             successful = sum(1 for k in keyframes_result if k.get('success'))
-            print(f"Successfully extracted {successful}/{len(timestamps)} keyframes")
+            print(f"Successfully extracted {successful}/{len(keyframes_result)} keyframes")
+            if on_event is not None:
+                on_event({"event": "keyframes", "keyframes": keyframes_result})
 
         # Save output files (after keyframes are added)
         if args.output and args.format in ["json", "both"]:
@@ -186,6 +615,17 @@ def main():
 
         if args.format in ["text", "both"]:
             text_output = format_pose_for_llm(result)
+            if args.llm_format == "compact":
+                pose_prompt = load_pose_module("pose_prompt")
+                verbose_output = text_output
+                text_output = pose_prompt.format_pose_compact(result, args.llm_max_chars, args.llm_max_tokens)
+                sizes = pose_prompt.prompt_size_report(verbose_output, text_output)
+                print(
+                    f"Compact text: {sizes['compactChars']} chars (~{sizes['compactTokens']} tokens), "
+                    f"{sizes['tokenReduction']:.0%} fewer tokens than the verbose format "
+                    f"({sizes['verboseChars']} chars, ~{sizes['verboseTokens']} tokens)",
+                    file=sys.stderr,
+                )
 
             if args.format == "both":
                 text_path = str(Path(args.output).with_suffix(".txt"))
@@ -207,6 +647,8 @@ def main():
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
+        if on_event is not None:
+            on_event({"event": "error", "error": str(e)})
         sys.exit(1)
 
 
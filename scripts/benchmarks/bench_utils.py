@@ -0,0 +1,204 @@
+"""
+Shared helpers for the ski pose analysis benchmarks.
+"""
+
+import contextlib
+import importlib
+import importlib.util
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+POSE_LIB_DIR = Path(__file__).resolve().parent.parent.parent / "lib" / "ski-analysis"
+
+CLI_SCRIPT = Path(__file__).resolve().parent.parent / "analyze_ski_pose.py"
+
+METRIC_NAMES = [
+    "centerOfGravityHeight",
+    "bodyTiltAngle",
+    "leftKneeFlexion",
+    "rightKneeFlexion",
+]
+
+
+def load_pose_module(name: str):
+    """Import a module from lib/ski-analysis."""
+    if str(POSE_LIB_DIR) not in sys.path:
+        sys.path.insert(0, str(POSE_LIB_DIR))
+    return importlib.import_module(name)
+
+
+def load_pose_analyzer():
+    """Import pose_analyzer from lib/ski-analysis."""
+    return load_pose_module("pose_analyzer")
+
+
+def load_cli_module():
+    """Import scripts/analyze_ski_pose.py (e.g. for format_pose_for_llm)."""
+    spec = importlib.util.spec_from_file_location("analyze_ski_pose", CLI_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def real_model_available() -> bool:
+    """Whether MediaPipe is installed and the pose model file exists."""
+    if importlib.util.find_spec("mediapipe") is None:
+        return False
+    return Path(load_pose_analyzer().get_model_path()).exists()
+
+
+# Normalised (x, y) of a standing skier facing the camera, by MediaPipe landmark index
+_STUB_POSE = np.array(
+    [(0.50, 0.30)]
+    + [(0.50 + dx, 0.29) for dx in (-0.01, -0.015, -0.02, 0.01, 0.015, 0.02)]
+    + [(0.48, 0.30), (0.52, 0.30), (0.49, 0.32), (0.51, 0.32)]
+    + [(0.46, 0.38), (0.54, 0.38), (0.42, 0.47), (0.58, 0.47), (0.40, 0.55), (0.60, 0.55)]
+    + [(0.39, 0.56), (0.61, 0.56), (0.39, 0.57), (0.61, 0.57), (0.40, 0.56), (0.60, 0.56)]
+    + [(0.47, 0.55), (0.53, 0.55), (0.46, 0.67), (0.54, 0.67), (0.47, 0.79), (0.53, 0.79)]
+    + [(0.47, 0.80), (0.53, 0.80), (0.44, 0.80), (0.56, 0.80)],
+    dtype=np.float64,
+)
+
+# Knees, everything above the hips (leans into turns), and above the knees (drops as they bend)
+_STUB_KNEES = [25, 26]
+_STUB_TORSO = list(range(23))
+_STUB_UPPER_BODY = list(range(25))
+
+
+class StubPoseLandmarker:
+    """
+    Deterministic stand-in for the MediaPipe PoseLandmarker.
+
+    Returns one plausible skier pose per call, computed from the timestamp
+    only: the body sways across the frame and the knees flex in a turn
+    rhythm, so metrics and summaries are non-trivial and identical on every
+    run. Benchmarks use it to measure decode and pipeline overhead without
+    the model; latency_ms adds a fixed delay per call to mimic a model of
+    known speed, and jitter adds Gaussian noise of that standard deviation
+    (normalised units, seeded by the timestamp) to mimic landmark jitter.
+    Like the real landmarker in VIDEO mode it rejects timestamps that do not
+    increase.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.calls = 0
+        self._last_timestamp_ms = -1
+
+    def detect_for_video(self, image, timestamp_ms: int):
+        if timestamp_ms <= self._last_timestamp_ms:
+            raise ValueError(
+                f"Timestamps must increase: {timestamp_ms} after {self._last_timestamp_ms}"
+            )
+        self._last_timestamp_ms = timestamp_ms
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        t = timestamp_ms / 1000
+        # Inside knee bends a little later than the outside one
+        flex = 0.5 + 0.5 * np.sin(t * 2.4 + np.array([0.0, 0.6]))
+        points = _STUB_POSE.copy()
+        points[:, 0] += 0.15 * math.sin(t * 1.2)
+        points[_STUB_TORSO, 0] += 0.04 * math.cos(t * 1.2)
+        points[_STUB_UPPER_BODY, 1] += 0.04 * flex.mean()
+        points[_STUB_KNEES, 0] += 0.03 * flex * np.array([-1, 1])
+        points[_STUB_KNEES, 1] += 0.02 * flex
+        if self.jitter:
+            points += np.random.default_rng(timestamp_ms).normal(0.0, self.jitter, points.shape)
+
+        landmarks = [
+            SimpleNamespace(x=float(x), y=float(y), z=0.0, visibility=0.95)
+            for x, y in points
+        ]
+        return SimpleNamespace(pose_landmarks=[landmarks])
+
+    def close(self):
+        pass
+
+
+def timed(func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, float]:
+    """Call func with the analyzer's progress output silenced; return (result, seconds)."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def compare_frames(reference: dict, candidate: dict) -> Dict[str, Any]:
+    """
+    Compare the per-frame metrics of two analysis results.
+
+    Frames are matched by timestamp. Frames that only one of the two results
+    kept (e.g. because of the visibility gate) are counted separately.
+
+    Returns:
+        Dictionary with matched/missing counts and mean/max absolute error per metric
+    """
+    ref_frames = {round(f["timestamp"], 3): f for f in reference["frames"]}
+    cand_frames = {round(f["timestamp"], 3): f for f in candidate["frames"]}
+    common = sorted(ref_frames.keys() & cand_frames.keys())
+
+    metrics: Dict[str, Any] = {}
+    for name in METRIC_NAMES:
+        errors = [
+            abs(ref_frames[t]["metrics"][name] - cand_frames[t]["metrics"][name])
+            for t in common
+        ]
+        metrics[name] = {
+            "meanAbsError": round(sum(errors) / len(errors), 4) if errors else None,
+            "maxAbsError": round(max(errors), 4) if errors else None,
+        }
+
+    return {
+        "matchedFrames": len(common),
+        "onlyInReference": len(ref_frames.keys() - cand_frames.keys()),
+        "onlyInCandidate": len(cand_frames.keys() - ref_frames.keys()),
+        "metrics": metrics,
+    }
+
+
+def compare_landmarks(reference: dict, candidate: dict) -> Dict[str, Any]:
+    """
+    Compare landmark positions of two analysis results.
+
+    Frames are matched by timestamp; the drift of a landmark is its distance
+    in normalised (x, y) image coordinates.
+
+    Returns:
+        Dictionary with mean/max drift over all matched landmarks
+    """
+    ref_frames = {round(f["timestamp"], 3): f for f in reference["frames"]}
+    cand_frames = {round(f["timestamp"], 3): f for f in candidate["frames"]}
+
+    drifts = []
+    for t in ref_frames.keys() & cand_frames.keys():
+        ref_landmarks = ref_frames[t]["landmarks"]
+        cand_landmarks = cand_frames[t]["landmarks"]
+        for name, ref_point in ref_landmarks.items():
+            cand_point = cand_landmarks[name]
+            drifts.append(math.hypot(ref_point["x"] - cand_point["x"], ref_point["y"] - cand_point["y"]))
+
+    return {
+        "meanDrift": round(sum(drifts) / len(drifts), 5) if drifts else None,
+        "maxDrift": round(max(drifts), 5) if drifts else None,
+    }
+
+
+def write_report(report: Dict[str, Any], output_path: str = None) -> None:
+    """Print the report as JSON and optionally save it."""
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if output_path:
+        Path(output_path).write_text(text + "\n", encoding="utf-8")
+        print(f"Report saved to: {output_path}", file=sys.stderr)
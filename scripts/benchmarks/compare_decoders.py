@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compare the OpenCV and ffmpeg decoder backends.
+
+Measures decode throughput up to the point where an RGB frame is ready for
+inference: cv2.VideoCapture read + resize + cvtColor against an ffmpeg pipe
+that decimates and scales while decoding. Runs at the native frame rate and,
+with -f, decimated to a lower rate (the OpenCV side then still decodes every
+frame and keeps the ones that would be sampled). Does not need the pose
+model. With --analyze it also runs analyze_video() with both decoders and
+reports per-metric differences (needs the real pose model).
+
+Usage:
+    python scripts/benchmarks/compare_decoders.py -i video.mp4
+    python scripts/benchmarks/compare_decoders.py -i phone.mov -f 10 -s 960 -o report.json
+    python scripts/benchmarks/compare_decoders.py -i video.mp4 --analyze
+"""
+
+import argparse
+import time
+
+import cv2
+
+from bench_utils import compare_frames, load_pose_analyzer, timed, write_report
+
+
+def decode_opencv(pose_analyzer, video_path: str, decode_fps: float = None, max_size: int = None) -> dict:
+    """Read, downscale and colour-convert frames the way analyze_frame_range() does."""
+    video_capture = cv2.VideoCapture(video_path)
+    fps = video_capture.get(cv2.CAP_PROP_FPS)
+    stride = pose_analyzer.get_frame_interval(fps, 1 / decode_fps) if decode_fps else 1
+    resized = pose_analyzer.FrameBufferRing()
+    converted_buffers = pose_analyzer.FrameBufferRing()
+
+    decoded = 0
+    converted = 0
+    frame = None
+    start = time.perf_counter()
+    while True:
+        ret, frame = video_capture.read(image=frame)
+        if not ret:
+            break
+        if decoded % stride == 0:
+            image = pose_analyzer.resize_for_inference(frame, max_size, resized)
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=converted_buffers.next(image.shape))
+            converted += 1
+        decoded += 1
+    seconds = time.perf_counter() - start
+    video_capture.release()
+
+    return {"seconds": seconds, "decodedFrames": decoded, "outputFrames": converted}
+
+
+def decode_ffmpeg(video_path: str, decode_fps: float = None, max_size: int = None) -> dict:
+    """Pull every frame out of an FFmpegDecoder pipe."""
+    from video_decoders import FFmpegDecoder, FrameBufferRing
+
+    decoder = FFmpegDecoder(video_path, fps=decode_fps, max_size=max_size)
+    frames = 0
+    start = time.perf_counter()
+    for _ in decoder.frames(buffers=FrameBufferRing()):
+        frames += 1
+    seconds = time.perf_counter() - start
+
+    return {"seconds": seconds, "outputFrames": frames}
+
+
+def _throughput(run: dict) -> dict:
+    seconds = run["seconds"]
+    return {
+        **run,
+        "seconds": round(seconds, 3),
+        "framesPerSecond": round(run["outputFrames"] / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenCV vs ffmpeg decoder throughput report")
+    parser.add_argument("-i", "--input", required=True, help="Input video file path")
+    parser.add_argument("-f", "--decode-fps", type=float,
+                        help="Also compare with decimation to this frame rate")
+    parser.add_argument("-s", "--max-size", type=int,
+                        help="Downscale so the longer side is at most this many pixels")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds for --analyze (default: 0.5)")
+    parser.add_argument("--analyze", action="store_true",
+                        help="Also run the full analysis with both decoders (needs the real pose model)")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    pose_analyzer = load_pose_analyzer()
+
+    report = {
+        "video": args.input,
+        "maxSize": args.max_size,
+        "decode": [],
+    }
+
+    rates = [None] + ([args.decode_fps] if args.decode_fps else [])
+    for decode_fps in rates:
+        opencv_run = _throughput(decode_opencv(pose_analyzer, args.input, decode_fps, args.max_size))
+        ffmpeg_run = _throughput(decode_ffmpeg(args.input, decode_fps, args.max_size))
+        report["decode"].append({
+            "decodeFps": decode_fps,
+            "opencv": opencv_run,
+            "ffmpeg": ffmpeg_run,
+            "speedup": round(opencv_run["seconds"] / ffmpeg_run["seconds"], 2) if ffmpeg_run["seconds"] > 0 else None,
+        })
+
+    if args.analyze:
+        opencv_result, opencv_seconds = timed(
+            pose_analyzer.analyze_video, args.input, args.interval,
+            max_inference_size=args.max_size,
+        )
+        ffmpeg_result, ffmpeg_seconds = timed(
+            pose_analyzer.analyze_video, args.input, args.interval,
+            max_inference_size=args.max_size,
+            decoder="ffmpeg",
+            decode_fps=args.decode_fps,
+        )
+        report["analysis"] = {
+            "opencvSeconds": round(opencv_seconds, 3),
+            "ffmpegSeconds": round(ffmpeg_seconds, 3),
+            "speedup": round(opencv_seconds / ffmpeg_seconds, 2) if ffmpeg_seconds > 0 else None,
+            "accuracy": compare_frames(opencv_result, ffmpeg_result),
+        }
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
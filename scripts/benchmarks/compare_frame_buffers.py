@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Compare per-frame allocations with and without reusable frame buffers.
+
+Runs the decode → resize → colour-convert → mp.Image path of
+analyze_frame_range() once with reuse_buffers=False (a new BGR and RGB array
+per frame) and once with the default reusable buffers, each in a fresh
+process. Reports throughput, peak RSS and, from tracemalloc, the transient
+bytes per frame in steady state: how far traced memory peaks between two
+inferences above what was live after the previous one, i.e. the fresh
+arrays each frame needs. By default the landmarker is a no-op, so only the
+frame path is measured and the pose model is not needed; --model runs the
+real model.
+
+Usage:
+    python scripts/benchmarks/compare_frame_buffers.py -i video_1080p.mp4
+    python scripts/benchmarks/compare_frame_buffers.py -i video.mp4 --pipelined -s 960 -o buffers.json
+"""
+
+import argparse
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import cv2
+
+from bench_utils import load_pose_analyzer, write_report
+
+# Frames at the start of a run excluded from the steady-state numbers
+WARMUP_FRAMES = 10
+
+
+class _NullLandmarker:
+    """Stands in for the model: finds no pose, so only the frame path is timed."""
+
+    def detect_for_video(self, image, timestamp_ms):
+        return SimpleNamespace(pose_landmarks=[])
+
+    def close(self):
+        pass
+
+
+class _TracingLandmarker:
+    """Records how far traced memory peaks between two consecutive inferences."""
+
+    def __init__(self, landmarker):
+        self._landmarker = landmarker
+        self._last_current = None
+        self.frame_bytes = []
+
+    def detect_for_video(self, image, timestamp_ms):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._last_current is not None:
+            self.frame_bytes.append(peak - self._last_current)
+        tracemalloc.reset_peak()
+        result = self._landmarker.detect_for_video(image, timestamp_ms)
+        self._last_current = tracemalloc.get_traced_memory()[0]
+        return result
+
+    def close(self):
+        self._landmarker.close()
+
+
+def _analyze(pose_analyzer, landmarker, args, reuse_buffers: bool) -> int:
+    video_capture = cv2.VideoCapture(args.input)
+    fps = video_capture.get(cv2.CAP_PROP_FPS)
+    try:
+        _, inference_count = pose_analyzer.analyze_frame_range(
+            video_capture, landmarker, fps,
+            pose_analyzer.get_frame_interval(fps, args.interval),
+            pipelined=args.pipelined,
+            max_inference_size=args.max_size,
+            reuse_buffers=reuse_buffers,
+        )
+    finally:
+        video_capture.release()
+    return inference_count
+
+
+def run_mode(args, reuse_buffers: bool) -> dict:
+    """Measure one mode; runs in its own process so peak RSS is per mode."""
+    pose_analyzer = load_pose_analyzer()
+
+    def new_landmarker():
+        return pose_analyzer.create_pose_landmarker() if args.model else _NullLandmarker()
+
+    # Untraced run first: tracemalloc's own bookkeeping would inflate RSS and time
+    landmarker = new_landmarker()
+    start = time.perf_counter()
+    frames = _analyze(pose_analyzer, landmarker, args, reuse_buffers)
+    seconds = time.perf_counter() - start
+    landmarker.close()
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracing = _TracingLandmarker(new_landmarker())
+    tracemalloc.start()
+    try:
+        _analyze(pose_analyzer, tracing, args, reuse_buffers)
+    finally:
+        tracemalloc.stop()
+        tracing.close()
+
+    steady = tracing.frame_bytes[WARMUP_FRAMES:] or tracing.frame_bytes
+    return {
+        "reuseBuffers": reuse_buffers,
+        "frames": frames,
+        "seconds": round(seconds, 3),
+        "framesPerSecond": round(frames / seconds, 1) if seconds > 0 else None,
+        # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+        "peakRssMb": round(peak_rss_kb / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        "transientBytesPerFrame": {
+            "median": int(statistics.median(steady)) if steady else None,
+            "max": max(steady) if steady else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame allocation report for reusable frame buffers")
+    parser.add_argument("-i", "--input", required=True, help="Input video file path")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("-s", "--max-size", type=int,
+                        help="Downscale so the longer side is at most this many pixels")
+    parser.add_argument("--pipelined", action="store_true", help="Measure the pipelined path")
+    parser.add_argument("--model", action="store_true",
+                        help="Run the real pose model instead of a no-op landmarker")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    video_capture = cv2.VideoCapture(args.input)
+    width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    video_capture.release()
+
+    context = multiprocessing.get_context("spawn")
+    modes = []
+    for reuse_buffers in (False, True):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            modes.append(executor.submit(run_mode, args, reuse_buffers).result())
+
+    before, after = modes
+    report = {
+        "video": args.input,
+        "resolution": [width, height],
+        "frameBytes": width * height * 3,
+        "pipelined": args.pipelined,
+        "maxSize": args.max_size,
+        "model": "mediapipe" if args.model else "none",
+        "modes": modes,
+        "transientBytesPerFrameSaved": (
+            before["transientBytesPerFrame"]["median"] - after["transientBytesPerFrame"]["median"]
+            if before["frames"] and after["frames"] else None
+        ),
+    }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compare throughput and landmark drift across inference sizes.
+
+Runs analyze_video() once at full resolution and once per maximum
+inference size, then reports runtime, inference throughput, landmark drift
+(normalised image distance) and per-metric error against the full
+resolution run. Use it to pick --max-inference-size for a deployment.
+Needs the real pose model.
+
+Usage:
+    python scripts/benchmarks/compare_inference_sizes.py -i video_4k.mp4
+    python scripts/benchmarks/compare_inference_sizes.py -i video.mp4 -s 1280,960,640 -o report.json
+"""
+
+import argparse
+
+import cv2
+
+from bench_utils import compare_frames, compare_landmarks, load_pose_analyzer, timed, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference size throughput and drift report")
+    parser.add_argument("-i", "--input", required=True, help="Input video file path")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("-s", "--sizes", default="1280,960,640,480,320",
+                        help="Comma-separated maximum inference sizes to test (default: 1280,960,640,480,320)")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    pose_analyzer = load_pose_analyzer()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    video_capture = cv2.VideoCapture(args.input)
+    width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    video_capture.release()
+
+    full, full_seconds = timed(pose_analyzer.analyze_video, args.input, args.interval)
+    inferences = full["metadata"]["inferenceFrames"]
+    report = {
+        "video": args.input,
+        "resolution": [width, height],
+        "samplingInterval": args.interval,
+        "fullResolution": {
+            "seconds": round(full_seconds, 3),
+            "inferencesPerSecond": round(inferences / full_seconds, 1) if full_seconds > 0 else None,
+            "framesAnalyzed": full["summary"]["framesAnalyzed"],
+        },
+        "sizes": [],
+    }
+
+    for size in sizes:
+        if size >= max(width, height):
+            # Would run at full resolution again
+            continue
+        result, seconds = timed(
+            pose_analyzer.analyze_video, args.input, args.interval,
+            max_inference_size=size,
+        )
+        report["sizes"].append({
+            "maxInferenceSize": size,
+            "seconds": round(seconds, 3),
+            "speedup": round(full_seconds / seconds, 2) if seconds > 0 else None,
+            "inferencesPerSecond": round(result["metadata"]["inferenceFrames"] / seconds, 1) if seconds > 0 else None,
+            "framesAnalyzed": result["summary"]["framesAnalyzed"],
+            "landmarkDrift": compare_landmarks(full, result),
+            "accuracy": compare_frames(full, result),
+        })
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
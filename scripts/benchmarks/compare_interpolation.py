@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Accuracy/throughput trade-off of interpolated sampling against the dense path.
+
+Runs analyze_video() with a one-frame sampling interval once densely (every
+frame through the model) and then once per --infer-every value, with and
+without One-Euro smoothing. For each run it reports runtime, speedup,
+inference count, frames in the result, interpolated frames, per-metric
+error and landmark drift against a reference.
+
+With --model real the reference is the dense run. With --model stub (the
+default when the pose model is missing) every run uses a stub landmarker
+with --stub-jitter noise, and the reference is the noise-free stub, so the
+report shows how far each variant is from the true motion, including the
+jitter smoothing removes. --markdown also prints the report as a table.
+
+Usage:
+    python scripts/benchmarks/compare_interpolation.py -i video.mp4 --model real
+    python scripts/benchmarks/compare_interpolation.py -k 2,3,5,10 --stub-latency-ms 20 --markdown -o report.json
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import cv2
+
+from bench_utils import (
+    StubPoseLandmarker,
+    compare_frames,
+    compare_landmarks,
+    load_pose_analyzer,
+    real_model_available,
+    timed,
+    write_report,
+)
+from synthetic_video import generate_video
+
+
+def summarize_run(result: dict, seconds: float, dense_seconds: float, reference: dict) -> dict:
+    interpolation = result["metadata"]["interpolation"] or {}
+    return {
+        "seconds": round(seconds, 3),
+        "speedup": round(dense_seconds / seconds, 2) if seconds > 0 else None,
+        "inferenceFrames": result["metadata"]["inferenceFrames"],
+        "framesAnalyzed": result["summary"]["framesAnalyzed"],
+        "interpolatedFrames": interpolation.get("interpolatedFrames", 0),
+        "accuracy": compare_frames(reference, result),
+        "landmarks": compare_landmarks(reference, result),
+    }
+
+
+def markdown_table(report: dict) -> str:
+    lines = [
+        "| inferEvery | smoothing | speedup | inferences | frames | tilt MAE (deg) | knee MAE (deg) | mean drift |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for run in report["runs"]:
+        metrics = run["accuracy"]["metrics"]
+        knee = [metrics[name]["meanAbsError"] for name in ("leftKneeFlexion", "rightKneeFlexion")]
+        lines.append(
+            f"| {run['inferEvery']} | {'yes' if run['smoothing'] else 'no'} | {run['speedup']} "
+            f"| {run['inferenceFrames']} | {run['framesAnalyzed']} "
+            f"| {metrics['bodyTiltAngle']['meanAbsError']} | {round(sum(knee) / 2, 4)} "
+            f"| {run['landmarks']['meanDrift']} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interpolated sampling accuracy/throughput report")
+    parser.add_argument("-i", "--input", help="Input video file path (default: a 10 s synthetic 720p video)")
+    parser.add_argument("-k", "--infer-every", default="2,3,5,10",
+                        help="Comma-separated inference strides to test (default: 2,3,5,10)")
+    parser.add_argument("--model", choices=["auto", "stub", "real"], default="auto",
+                        help="Landmarker: deterministic stub, real MediaPipe model, or real if available (default: auto)")
+    parser.add_argument("--stub-latency-ms", type=float, default=20.0,
+                        help="Delay per stub detection to mimic a model (default: 20)")
+    parser.add_argument("--stub-jitter", type=float, default=0.004,
+                        help="Standard deviation of the stub's landmark noise in normalised units (default: 0.004)")
+    parser.add_argument("--markdown", action="store_true", help="Also print the runs as a Markdown table")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    model = args.model
+    if model == "auto":
+        model = "real" if real_model_available() else "stub"
+    elif model == "real" and not real_model_available():
+        parser.error("--model real needs mediapipe and the pose model file")
+
+    pose_analyzer = load_pose_analyzer()
+    strides = [int(k) for k in args.infer_every.split(",")]
+
+    with tempfile.TemporaryDirectory(prefix="ski-interpolation-") as work_dir:
+        video_path = args.input or generate_video(str(Path(work_dir) / "interpolation.mp4"))
+        video_capture = cv2.VideoCapture(video_path)
+        fps = video_capture.get(cv2.CAP_PROP_FPS)
+        video_capture.release()
+        interval = 1 / fps
+
+        def analyze(jitter: float = args.stub_jitter, **options):
+            if model == "real":
+                return timed(pose_analyzer.analyze_video, video_path, interval, **options)
+            landmarker = StubPoseLandmarker(latency_ms=args.stub_latency_ms, jitter=jitter)
+            return timed(
+                pose_analyzer.analyze_video, video_path, interval,
+                pose_landmarker=pose_analyzer.ReusablePoseLandmarker(landmarker), **options,
+            )
+
+        dense, dense_seconds = analyze()
+        reference = dense if model == "real" else analyze(jitter=0.0)[0]
+
+        report = {
+            "video": args.input or "synthetic 1280x720",
+            "fps": fps,
+            "model": model,
+            "stubLatencyMs": args.stub_latency_ms if model == "stub" else None,
+            "stubJitter": args.stub_jitter if model == "stub" else None,
+            "reference": "dense" if model == "real" else "noise-free stub",
+            "runs": [],
+        }
+        for infer_every in [1] + strides:
+            for smoothing in (False, True):
+                print(f"Running inferEvery={infer_every} smoothing={smoothing}", file=sys.stderr)
+                if infer_every == 1 and not smoothing:
+                    result, seconds = dense, dense_seconds
+                else:
+                    result, seconds = analyze(infer_every=infer_every, smoothing=smoothing)
+                report["runs"].append({
+                    "inferEvery": infer_every,
+                    "smoothing": smoothing,
+                    **summarize_run(result, seconds, dense_seconds, reference),
+                })
+
+    write_report(report, args.output)
+    if args.markdown:
+        print(markdown_table(report), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Compare parallel chunked analysis against the sequential path.
+
+Runs analyze_video() sequentially and with each requested worker count, and
+reports runtime plus per-metric error both over all frames and over the
+first sample of every chunk, where the parallel path starts a fresh tracker.
+Needs the real pose model.
+
+Usage:
+    python scripts/benchmarks/compare_parallel.py -i long_run.mp4 -w 2,4,8 -o parallel.json
+"""
+
+import argparse
+
+import cv2
+
+from bench_utils import compare_frames, load_pose_analyzer, timed, write_report
+
+
+def boundary_timestamps(pose_analyzer, video_path: str, interval: float, workers: int):
+    """Timestamps of the first sample of every chunk after the first."""
+    capture = cv2.VideoCapture(video_path)
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture.release()
+
+    frame_interval = pose_analyzer.get_frame_interval(fps, interval)
+    chunk_count = min(workers, max(1, total_frames // pose_analyzer.MIN_FRAMES_PER_CHUNK))
+    ranges = pose_analyzer.split_frame_ranges(total_frames, frame_interval, chunk_count)
+    return {round(start / fps, 3) for start, _ in ranges[1:]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel vs sequential analysis report")
+    parser.add_argument("-i", "--input", required=True, help="Input video file path")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("-w", "--workers", default="2,4",
+                        help="Comma-separated worker counts to test (default: 2,4)")
+    parser.add_argument("--sparse", action="store_true", help="Compare in sparse mode")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    pose_analyzer = load_pose_analyzer()
+
+    sequential, sequential_seconds = timed(
+        pose_analyzer.analyze_video, args.input, args.interval, sparse=args.sparse
+    )
+    report = {
+        "video": args.input,
+        "samplingInterval": args.interval,
+        "sparse": args.sparse,
+        "sequential": {"seconds": round(sequential_seconds, 3)},
+        "parallel": [],
+    }
+
+    for workers in [int(w) for w in args.workers.split(",")]:
+        parallel, seconds = timed(
+            pose_analyzer.analyze_video, args.input, args.interval,
+            sparse=args.sparse, workers=workers,
+        )
+        boundaries = boundary_timestamps(pose_analyzer, args.input, args.interval, workers)
+        at_boundaries = {
+            "frames": [f for f in parallel["frames"] if round(f["timestamp"], 3) in boundaries],
+        }
+        reference_at_boundaries = {
+            "frames": [f for f in sequential["frames"] if round(f["timestamp"], 3) in boundaries],
+        }
+        report["parallel"].append({
+            "workers": parallel["metadata"]["workers"],
+            "seconds": round(seconds, 3),
+            "speedup": round(sequential_seconds / seconds, 2) if seconds > 0 else None,
+            "summaryEqual": parallel["summary"] == sequential["summary"],
+            "allFrames": compare_frames(sequential, parallel),
+            "chunkBoundaries": compare_frames(reference_at_boundaries, at_boundaries),
+        })
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
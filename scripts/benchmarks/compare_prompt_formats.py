@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Prompt size of the compact pose encoding against format_pose_for_llm().
+
+Formats one analysis result with the CLI's verbose format_pose_for_llm()
+and with pose_prompt.format_pose_compact(), unbudgeted and at every
+--budgets token budget, and reports characters, estimated tokens, the
+reduction against the verbose text and the formatting time of each.
+
+The result is read from --result (an analyze_video() JSON file) or computed
+from --input or, by default, a synthetic two-minute video sampled every
+--interval seconds, with a stub landmarker unless --model real.
+
+Usage:
+    python scripts/benchmarks/compare_prompt_formats.py --budgets 2000,1000,500 -o report.json
+    python scripts/benchmarks/compare_prompt_formats.py --result pose_data.json --markdown
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import (
+    StubPoseLandmarker,
+    load_cli_module,
+    load_pose_analyzer,
+    load_pose_module,
+    real_model_available,
+    timed,
+    write_report,
+)
+from synthetic_video import generate_video
+
+
+def measure(format_text, pose_prompt, verbose: str) -> dict:
+    start = time.perf_counter()
+    text = format_text()
+    elapsed = time.perf_counter() - start
+    sizes = pose_prompt.prompt_size_report(verbose, text)
+    return {
+        "chars": sizes["compactChars"],
+        "tokens": sizes["compactTokens"],
+        "charReduction": sizes["charReduction"],
+        "tokenReduction": sizes["tokenReduction"],
+        "formatMs": round(elapsed * 1000, 2),
+    }
+
+
+def markdown_table(report: dict) -> str:
+    lines = [
+        "| format | budget (tokens) | chars | tokens | token reduction | format ms |",
+        "|---|---|---|---|---|---|",
+    ]
+    for run in report["runs"]:
+        lines.append(
+            f"| {run['format']} | {run['budget'] or '-'} | {run['chars']} | {run['tokens']} "
+            f"| {run['tokenReduction']:.0%} | {run['formatMs']} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact vs verbose LLM pose text size report")
+    parser.add_argument("--result", help="analyze_video() JSON result to format")
+    parser.add_argument("-i", "--input", help="Video to analyse (default: a 120 s synthetic video)")
+    parser.add_argument("--duration", type=float, default=120.0,
+                        help="Length of the synthetic video in seconds (default: 120)")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("--budgets", default="2000,1000,500",
+                        help="Comma-separated token budgets to test (default: 2000,1000,500)")
+    parser.add_argument("--model", choices=["auto", "stub", "real"], default="auto",
+                        help="Landmarker: deterministic stub, real MediaPipe model, or real if available (default: auto)")
+    parser.add_argument("--markdown", action="store_true", help="Also print the runs as a Markdown table")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    model = args.model
+    if model == "auto":
+        model = "real" if real_model_available() else "stub"
+    elif model == "real" and not real_model_available():
+        parser.error("--model real needs mediapipe and the pose model file")
+
+    pose_prompt = load_pose_module("pose_prompt")
+    cli = load_cli_module()
+
+    if args.result:
+        with open(args.result, encoding="utf-8") as f:
+            result = json.load(f)
+        source = args.result
+    else:
+        pose_analyzer = load_pose_analyzer()
+        with tempfile.TemporaryDirectory(prefix="ski-prompt-") as work_dir:
+            video_path = args.input or generate_video(
+                str(Path(work_dir) / "prompt.mp4"), 320, 180, 10.0, args.duration
+            )
+            options = {}
+            if model == "stub":
+                options["pose_landmarker"] = pose_analyzer.ReusablePoseLandmarker(StubPoseLandmarker(jitter=0.004))
+            result, _ = timed(pose_analyzer.analyze_video, video_path, args.interval, **options)
+        source = args.input or f"synthetic {args.duration:g} s"
+
+    start = time.perf_counter()
+    verbose = cli.format_pose_for_llm(result)
+    verbose_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    report = {
+        "source": source,
+        "model": model if not args.result else None,
+        "frames": len(result["frames"]),
+        "runs": [{
+            "format": "verbose",
+            "budget": None,
+            "chars": len(verbose),
+            "tokens": pose_prompt.estimate_tokens(verbose),
+            "charReduction": 0.0,
+            "tokenReduction": 0.0,
+            "formatMs": verbose_ms,
+        }],
+    }
+    budgets = [None] + [int(b) for b in args.budgets.split(",") if b]
+    for budget in budgets:
+        print(f"Formatting compact text, budget={budget}", file=sys.stderr)
+        run = measure(lambda: pose_prompt.format_pose_compact(result, max_tokens=budget), pose_prompt, verbose)
+        report["runs"].append({"format": "compact", "budget": budget, **run})
+
+    write_report(report, args.output)
+    if args.markdown:
+        print(markdown_table(report), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare sparse decoding against the dense analysis loop.
+
+Runs analyze_video() once densely (every frame through the model) and once
+in sparse mode per warm-up window, then reports runtime, number of
+inferences and per-metric error of the sparse results against the dense
+ones. Needs the real pose model.
+
+Usage:
+    python scripts/benchmarks/compare_sampling_modes.py -i video.mp4
+    python scripts/benchmarks/compare_sampling_modes.py -i video.mp4 -w 0,1,3,5 -o report.json
+"""
+
+import argparse
+
+from bench_utils import compare_frames, load_pose_analyzer, timed, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sparse vs dense sampling accuracy report")
+    parser.add_argument("-i", "--input", required=True, help="Input video file path")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("-w", "--warmup", default="0,1,3,5",
+                        help="Comma-separated warm-up windows to test (default: 0,1,3,5)")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    pose_analyzer = load_pose_analyzer()
+    warmups = [int(w) for w in args.warmup.split(",")]
+
+    dense, dense_seconds = timed(pose_analyzer.analyze_video, args.input, args.interval)
+    report = {
+        "video": args.input,
+        "samplingInterval": args.interval,
+        "dense": {
+            "seconds": round(dense_seconds, 3),
+            "inferenceFrames": dense["metadata"]["inferenceFrames"],
+            "framesAnalyzed": dense["summary"]["framesAnalyzed"],
+        },
+        "sparse": [],
+    }
+
+    for warmup in warmups:
+        sparse, seconds = timed(
+            pose_analyzer.analyze_video, args.input, args.interval,
+            sparse=True, warmup_frames=warmup,
+        )
+        report["sparse"].append({
+            "warmupFrames": warmup,
+            "seconds": round(seconds, 3),
+            "speedup": round(dense_seconds / seconds, 2) if seconds > 0 else None,
+            "inferenceFrames": sparse["metadata"]["inferenceFrames"],
+            "framesAnalyzed": sparse["summary"]["framesAnalyzed"],
+            "accuracy": compare_frames(dense, sparse),
+        })
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
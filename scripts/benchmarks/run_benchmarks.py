@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for pose_analyzer.
+
+Times the main entry points on a synthetic video (see synthetic_video.py),
+so runs on different machines or commits measure the same work:
+
+    analyzeVideo           analyze_video(), sequential
+    analyzeVideoSparse     analyze_video(sparse=True)
+    analyzeVideoPipelined  analyze_video(pipelined=True)
+    extractFrame           extract_frame_at_timestamp() at evenly spread timestamps
+    extractKeyframes       extract_keyframes() for the same timestamps
+    computePoseMetrics     vectorised metrics over a landmark array
+    analyzeFrame           legacy per-frame metrics
+    formatPoseForLlm       format_pose_for_llm() of the CLI on an analysis result
+
+With --model stub (the default when the pose model is missing) detection is
+done by a deterministic stub landmarker, so the analyze cases measure
+decode, conversion and pipeline overhead without model cost; --model real
+uses MediaPipe. Each case runs --warmup untimed and --repeat timed
+iterations; the JSON report holds min/median/mean per case, the suite
+configuration and the environment. --compare adds the median ratio against
+an earlier report (below 1 is faster).
+
+Usage:
+    python scripts/benchmarks/run_benchmarks.py -o bench.json
+    python scripts/benchmarks/run_benchmarks.py -r 1920x1080 --fps 60 -c libx264 --repeat 5 -o bench_1080p.json
+    python scripts/benchmarks/run_benchmarks.py --cases analyzeVideo,analyzeVideoPipelined --compare bench.json
+"""
+
+import argparse
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from bench_utils import (
+    StubPoseLandmarker,
+    load_cli_module,
+    load_pose_analyzer,
+    real_model_available,
+    timed,
+    write_report,
+)
+from synthetic_video import OPENCV_CODECS, generate_video, parse_resolution
+
+CASE_NAMES = (
+    "analyzeVideo",
+    "analyzeVideoSparse",
+    "analyzeVideoPipelined",
+    "extractFrame",
+    "extractKeyframes",
+    "computePoseMetrics",
+    "analyzeFrame",
+    "formatPoseForLlm",
+)
+
+# format_pose_for_llm() calls per timed run; one call is too short to time on its own
+FORMAT_CALLS = 100
+
+# Default directory for generated videos, reused across runs
+DEFAULT_VIDEO_DIR = Path(tempfile.gettempdir()) / "ski-pose-bench"
+
+
+def synthetic_video_path(args) -> str:
+    """Generate the suite video unless an identical one exists already."""
+    if args.video:
+        return args.video
+    width, height = parse_resolution(args.resolution)
+    extension = ".avi" if args.codec in ("MJPG", "XVID") else ".mp4"
+    name = f"ski_{width}x{height}_{args.fps:g}fps_{args.duration:g}s_{args.codec}_seed{args.seed}{extension}"
+    path = Path(args.video_dir) / name
+    if not path.exists():
+        print(f"Generating {path}", file=sys.stderr)
+        generate_video(str(path), width, height, args.fps, args.duration, args.codec, args.seed)
+    return str(path)
+
+
+def video_info(video_path: str) -> dict:
+    capture = cv2.VideoCapture(video_path)
+    info = {
+        "path": video_path,
+        "resolution": [int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))],
+        "fps": round(capture.get(cv2.CAP_PROP_FPS), 3),
+        "frames": int(capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+    }
+    capture.release()
+    return info
+
+
+def environment() -> dict:
+    def version(package: str):
+        try:
+            return importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            return None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpuCount": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "mediapipe": version("mediapipe"),
+        "gitCommit": commit,
+    }
+
+
+def stub_landmarks(count: int) -> list:
+    """Landmark lists of count consecutive stub detections (one per 1/30 s)."""
+    stub = StubPoseLandmarker()
+    return [stub.detect_for_video(None, n * 33).pose_landmarks[0] for n in range(count)]
+
+
+def build_cases(pose_analyzer, args, video_path: str, landmarker) -> dict:
+    """
+    Map each case name to (setup, units, unit).
+
+    setup() prepares the inputs outside the timed region and returns the
+    callable that is timed; units is how much work one call does.
+    """
+    info = video_info(video_path)
+    duration = info["frames"] / info["fps"] if info["fps"] else 0
+    timestamps = [duration * (i + 0.5) / args.extract_count for i in range(args.extract_count)]
+
+    def analyze(**options):
+        def setup():
+            return lambda: pose_analyzer.analyze_video(
+                video_path, args.interval, pose_landmarker=landmarker,
+                max_inference_size=args.max_size, **options,
+            )
+        return setup
+
+    def extract_frame():
+        def run():
+            for timestamp in timestamps:
+                pose_analyzer.extract_frame_at_timestamp(video_path, timestamp)
+        return run
+
+    def extract_keyframes():
+        return lambda: pose_analyzer.extract_keyframes(video_path, timestamps)
+
+    def metrics():
+        series = pose_analyzer.PoseSeries(args.poses)
+        for n, landmarks in enumerate(stub_landmarks(args.poses)):
+            series.append(n / 30, landmarks)
+        array = series.landmarks
+        return lambda: pose_analyzer.compute_pose_metrics(array)
+
+    def legacy_metrics():
+        frames = [pose_analyzer.extract_key_landmarks(landmarks) for landmarks in stub_landmarks(args.poses)]
+
+        def run():
+            for n, frame in enumerate(frames):
+                pose_analyzer.analyze_frame(frame, n / 30)
+        return run
+
+    def format_for_llm():
+        cli = load_cli_module()
+        result, _ = timed(
+            pose_analyzer.analyze_video, video_path, args.interval,
+            pose_landmarker=pose_analyzer.ReusablePoseLandmarker(StubPoseLandmarker()),
+        )
+
+        def run():
+            for _ in range(FORMAT_CALLS):
+                cli.format_pose_for_llm(result)
+        return run
+
+    return {
+        "analyzeVideo": (analyze(), info["frames"], "frames"),
+        "analyzeVideoSparse": (analyze(sparse=True), info["frames"], "frames"),
+        "analyzeVideoPipelined": (analyze(pipelined=True), info["frames"], "frames"),
+        "extractFrame": (extract_frame, len(timestamps), "frames"),
+        "extractKeyframes": (extract_keyframes, len(timestamps), "frames"),
+        "computePoseMetrics": (metrics, args.poses, "poses"),
+        "analyzeFrame": (legacy_metrics, args.poses, "poses"),
+        "formatPoseForLlm": (format_for_llm, FORMAT_CALLS, "calls"),
+    }
+
+
+def run_case(setup, units: int, unit: str, warmup: int, repeat: int) -> dict:
+    func = setup()
+    for _ in range(warmup):
+        timed(func)
+    seconds = [timed(func)[1] for _ in range(repeat)]
+
+    median = statistics.median(seconds)
+    return {
+        "repeat": repeat,
+        "units": units,
+        "unit": unit,
+        "seconds": {
+            "min": round(min(seconds), 5),
+            "median": round(median, 5),
+            "mean": round(statistics.fmean(seconds), 5),
+            "stdev": round(statistics.stdev(seconds), 5) if len(seconds) > 1 else 0.0,
+        },
+        "msPerUnit": round(median * 1000 / units, 4) if units else None,
+        "unitsPerSecond": round(units / median, 1) if median > 0 else None,
+    }
+
+
+def compare_reports(previous: dict, current: dict) -> dict:
+    """Median ratio current/previous per case both reports contain."""
+    cases = {}
+    for name, case in current["cases"].items():
+        before = previous.get("cases", {}).get(name)
+        if not before:
+            continue
+        old, new = before["seconds"]["median"], case["seconds"]["median"]
+        cases[name] = {
+            "previousMedian": old,
+            "median": new,
+            "ratio": round(new / old, 3) if old > 0 else None,
+        }
+    return {
+        # Different videos, models or settings make the ratios meaningless
+        "sameConfig": previous.get("config") == current["config"],
+        "previousCommit": previous.get("environment", {}).get("gitCommit"),
+        "cases": cases,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducible pose_analyzer benchmark suite")
+    parser.add_argument("-i", "--video", help="Benchmark this video instead of a synthetic one")
+    parser.add_argument("-r", "--resolution", default="1280x720",
+                        help="Synthetic video WIDTHxHEIGHT (default: 1280x720)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Synthetic video frame rate (default: 30)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0,
+                        help="Synthetic video length in seconds (default: 10)")
+    parser.add_argument("-c", "--codec", default="mp4v",
+                        help=f"Synthetic video codec: {', '.join(OPENCV_CODECS)} or an ffmpeg encoder (default: mp4v)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic video seed (default: 0)")
+    parser.add_argument("--video-dir", default=str(DEFAULT_VIDEO_DIR),
+                        help=f"Where synthetic videos are kept (default: {DEFAULT_VIDEO_DIR})")
+    parser.add_argument("--model", choices=["auto", "stub", "real"], default="auto",
+                        help="Landmarker: deterministic stub, real MediaPipe model, or real if available (default: auto)")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0,
+                        help="Delay per stub detection to mimic a model (default: 0)")
+    parser.add_argument("--cases", help=f"Comma-separated subset of: {', '.join(CASE_NAMES)}")
+    parser.add_argument("-t", "--interval", type=float, default=0.5,
+                        help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("-s", "--max-size", type=int,
+                        help="Downscale so the longer side is at most this many pixels")
+    parser.add_argument("--extract-count", type=int, default=10,
+                        help="Timestamps per frame extraction case (default: 10)")
+    parser.add_argument("--poses", type=int, default=10000,
+                        help="Poses per metrics case (default: 10000)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per case (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    cases = args.cases.split(",") if args.cases else list(CASE_NAMES)
+    unknown = [name for name in cases if name not in CASE_NAMES]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    model = args.model
+    if model == "auto":
+        model = "real" if real_model_available() else "stub"
+    elif model == "real" and not real_model_available():
+        parser.error("--model real needs mediapipe and the pose model file")
+
+    pose_analyzer = load_pose_analyzer()
+    video_path = synthetic_video_path(args)
+
+    # One warm landmarker for every analyze case; model loading is reported separately
+    init_start = time.perf_counter()
+    if model == "real":
+        landmarker = pose_analyzer.ReusablePoseLandmarker()
+    else:
+        landmarker = pose_analyzer.ReusablePoseLandmarker(StubPoseLandmarker(args.stub_latency_ms))
+    model_init_seconds = time.perf_counter() - init_start
+
+    report = {
+        "suite": "pose_analyzer",
+        "createdAt": datetime.now().isoformat(),
+        "environment": environment(),
+        "config": {
+            "video": video_info(video_path),
+            "synthetic": None if args.video else {
+                "resolution": args.resolution,
+                "fps": args.fps,
+                "duration": args.duration,
+                "codec": args.codec,
+                "seed": args.seed,
+            },
+            "model": model,
+            "stubLatencyMs": args.stub_latency_ms if model == "stub" else None,
+            "interval": args.interval,
+            "maxSize": args.max_size,
+            "extractCount": args.extract_count,
+            "poses": args.poses,
+        },
+        "modelInitSeconds": round(model_init_seconds, 4),
+        "cases": {},
+    }
+
+    try:
+        definitions = build_cases(pose_analyzer, args, video_path, landmarker)
+        for name in cases:
+            print(f"Running {name}", file=sys.stderr)
+            report["cases"][name] = run_case(*definitions[name], args.warmup, args.repeat)
+    finally:
+        landmarker.close()
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report["comparison"] = compare_reports(previous, report)
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
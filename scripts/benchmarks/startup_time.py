@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Measure CLI cold start and import cost.
+
+The API route spawns analyze_ski_pose.py once per request, so interpreter
+start-up and imports are paid on every call. Each scenario is run --repeat
+times in a fresh interpreter and timed from spawn to exit; one more run
+with -X importtime records which heavy modules it loaded and what they
+cost. Scenarios:
+
+    interpreter        python -c pass (the floor)
+    importPoseCache    import pose_cache
+    importPoseAnalyzer import pose_analyzer
+    help               --help
+    missingInput       -i on a missing file (argument errors)
+    clearCache         --clear-cache
+    keyframesOnly      --keyframes-only, as the route's keyframe request
+    analyzeCached      an analysis answered from the result cache
+
+Every scenario lists heavy modules it must not load (e.g. --help must not
+import cv2, keyframesOnly must not import mediapipe). A violation, an
+unexpected exit code or, with --compare, a median more than
+--max-regression slower than in an earlier report makes the script exit
+with status 1, so it can guard start-up regressions in CI.
+
+Usage:
+    python scripts/benchmarks/startup_time.py -o startup.json
+    python scripts/benchmarks/startup_time.py --repeat 20 --compare startup.json --max-regression 0.25
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_utils import CLI_SCRIPT, POSE_LIB_DIR, StubPoseLandmarker, load_pose_module, timed, write_report
+from synthetic_video import generate_video
+
+# Modules whose import dominates start-up
+HEAVY_MODULES = ("cv2", "numpy", "mediapipe")
+
+
+def scenarios(video_path: str, cache_dir: str, output_dir: str) -> dict:
+    """Map each scenario name to (interpreter arguments, forbidden modules, expected exit code)."""
+    cli = [str(CLI_SCRIPT)]
+    lib_import = f"import sys; sys.path.insert(0, {str(POSE_LIB_DIR)!r}); import "
+    return {
+        "interpreter": (["-c", "pass"], HEAVY_MODULES, 0),
+        "importPoseCache": (["-c", lib_import + "pose_cache"], HEAVY_MODULES, 0),
+        "importPoseAnalyzer": (["-c", lib_import + "pose_analyzer"], ("mediapipe",), 0),
+        "help": (cli + ["--help"], HEAVY_MODULES, 0),
+        "missingInput": (cli + ["-i", str(Path(output_dir) / "missing.mp4")], HEAVY_MODULES, 1),
+        "clearCache": (cli + ["--clear-cache", "--cache-dir", str(Path(output_dir) / "empty-cache")], HEAVY_MODULES, 0),
+        "keyframesOnly": (
+            cli + ["-i", video_path, "-o", str(Path(output_dir) / "keyframes.json"), "--keyframes-only",
+                   "-k", "0.5,1.0,1.5", "-ko", output_dir, "--cache-dir", cache_dir],
+            ("mediapipe",), 0,
+        ),
+        "analyzeCached": (
+            cli + ["-i", video_path, "-o", str(Path(output_dir) / "pose.json"), "-t", "0.5", "--cache-dir", cache_dir],
+            ("mediapipe",), 0,
+        ),
+    }
+
+
+def prime_cache(video_path: str, cache_dir: str) -> None:
+    """Store the analyzeCached result, made with the stub landmarker so no model is needed."""
+    pose_analyzer = load_pose_module("pose_analyzer")
+    pose_cache = load_pose_module("pose_cache")
+    timed(
+        pose_analyzer.analyze_video, video_path, 0.5,
+        pose_landmarker=pose_analyzer.ReusablePoseLandmarker(StubPoseLandmarker()),
+        cache=pose_cache.PoseResultCache(cache_dir),
+    )
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Total import time and the cumulative time of each heavy module from -X importtime output."""
+    total_us = 0
+    heavy_us = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # column header
+        module = name.strip()
+        # Top-level imports have a single space before the name
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+        if module in HEAVY_MODULES and module not in heavy_us:
+            heavy_us[module] = int(cumulative)
+    return {
+        "importMs": round(total_us / 1000, 1),
+        "heavyModulesMs": {name: round(us / 1000, 1) for name, us in heavy_us.items()},
+    }
+
+
+def run_scenario(argv: list, forbidden: tuple, expected_exit: int, warmup: int, repeat: int) -> dict:
+    command = [sys.executable] + argv
+    for _ in range(warmup):
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    wall_ms = []
+    exit_code = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        exit_code = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+        wall_ms.append((time.perf_counter() - start) * 1000)
+
+    traced = subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    imports = parse_importtime(traced.stderr)
+
+    violations = [f"imports {name}" for name in forbidden if name in imports["heavyModulesMs"]]
+    if exit_code != expected_exit:
+        violations.append(f"exit code {exit_code}, expected {expected_exit}")
+
+    return {
+        "argv": argv,
+        "exitCode": exit_code,
+        "wallMs": {
+            "min": round(min(wall_ms), 1),
+            "median": round(statistics.median(wall_ms), 1),
+            "mean": round(statistics.fmean(wall_ms), 1),
+        },
+        **imports,
+        "forbiddenModules": list(forbidden),
+        "violations": violations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI cold start and import time report")
+    parser.add_argument("-i", "--video", help="Video for the keyframe and cached-analysis scenarios "
+                        "(default: a small synthetic video)")
+    parser.add_argument("--scenarios", help="Comma-separated subset of scenarios to run")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per scenario (default: 1)")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per scenario (default: 10)")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="With --compare, fail when a median is this fraction slower (default: 0.2)")
+    parser.add_argument("-o", "--output", help="Save the JSON report to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ski-startup-") as work_dir:
+        video_path = args.video or generate_video(
+            str(Path(work_dir) / "startup.mp4"), width=320, height=240, fps=30, duration=2
+        )
+        cache_dir = str(Path(work_dir) / "cache")
+        prime_cache(video_path, cache_dir)
+
+        definitions = scenarios(video_path, cache_dir, work_dir)
+        names = args.scenarios.split(",") if args.scenarios else list(definitions)
+        unknown = [name for name in names if name not in definitions]
+        if unknown:
+            parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+        report = {"python": sys.version.split()[0], "repeat": args.repeat, "scenarios": {}}
+        for name in names:
+            print(f"Running {name}", file=sys.stderr)
+            report["scenarios"][name] = run_scenario(*definitions[name], args.warmup, args.repeat)
+
+    violations = [
+        f"{name}: {violation}"
+        for name, scenario in report["scenarios"].items()
+        for violation in scenario["violations"]
+    ]
+
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text(encoding="utf-8"))["scenarios"]
+        comparison = {}
+        for name, scenario in report["scenarios"].items():
+            if name not in previous:
+                continue
+            old, new = previous[name]["wallMs"]["median"], scenario["wallMs"]["median"]
+            ratio = round(new / old, 3) if old > 0 else None
+            comparison[name] = {"previousMedianMs": old, "medianMs": new, "ratio": ratio}
+            if ratio is not None and ratio > 1 + args.max_regression:
+                violations.append(f"{name}: median {new}ms is {ratio}x the previous {old}ms")
+        report["comparison"] = comparison
+
+    report["violations"] = violations
+    write_report(report, args.output)
+    if violations:
+        print("Start-up regressions:\n  " + "\n  ".join(violations), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
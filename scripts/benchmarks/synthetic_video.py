@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic ski videos for benchmarks.
+
+Draws a deterministic scene (snow slope, trees, a stick-figure skier doing
+S-turns, light sensor noise) at any resolution, frame rate and duration, so
+benchmarks never need downloaded footage. OpenCV FourCC codecs (mp4v,
+MJPG, XVID, avc1) are written with cv2.VideoWriter; any other codec name is
+treated as an ffmpeg encoder (e.g. libx264, libx265) and needs ffmpeg.
+The same arguments always produce the same frames.
+
+Usage:
+    python scripts/benchmarks/synthetic_video.py -o /tmp/ski_720p.mp4
+    python scripts/benchmarks/synthetic_video.py -o /tmp/ski_4k.mp4 -r 3840x2160 --fps 60 -d 5 -c libx264
+"""
+
+import argparse
+import math
+import subprocess
+from pathlib import Path
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from bench_utils import load_pose_module
+
+# Codecs written by cv2.VideoWriter; anything else goes to ffmpeg
+OPENCV_CODECS = ("mp4v", "MJPG", "XVID", "avc1")
+
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    """Parse 'WIDTHxHEIGHT'."""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def _background(width: int, height: int, rng: np.random.Generator) -> np.ndarray:
+    # Sky-to-snow gradient plus a row of trees, fixed for the whole video
+    shade = np.linspace(0.85, 1.0, height, dtype=np.float32)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = (np.array([235, 225, 215], dtype=np.float32) * shade)[:, None, :]
+    horizon = int(height * 0.25)
+    frame[:horizon] = (210, 170, 120)
+    for _ in range(max(3, width // 160)):
+        x = int(rng.integers(0, width))
+        size = int(rng.integers(height // 20, height // 8))
+        points = np.array([[x, horizon - size], [x - size // 3, horizon + size // 4], [x + size // 3, horizon + size // 4]])
+        cv2.fillPoly(frame, [points], (40, 80, 40))
+    return frame
+
+
+def _draw_skier(frame: np.ndarray, t: float) -> None:
+    height, width = frame.shape[:2]
+    scale = height / 720
+    # S-turns across the slope while moving down the frame
+    cx = width * (0.5 + 0.3 * math.sin(t * 1.2))
+    cy = height * (0.45 + 0.1 * math.sin(t * 0.4))
+    lean = 0.35 * math.cos(t * 1.2)
+    crouch = 0.5 + 0.3 * math.sin(t * 2.4)
+
+    def point(dx: float, dy: float) -> Tuple[int, int]:
+        # Rotate the body frame by the lean angle
+        rx = dx * math.cos(lean) - dy * math.sin(lean)
+        ry = dx * math.sin(lean) + dy * math.cos(lean)
+        return int(cx + rx * scale), int(cy + ry * scale)
+
+    thickness = max(2, int(6 * scale))
+    head, neck, hip = point(0, -120), point(0, -95), point(0, -20)
+    knee_y = 30 + 15 * crouch
+    left_knee, right_knee = point(-25 - 20 * crouch, knee_y), point(25 + 20 * crouch, knee_y)
+    left_ankle, right_ankle = point(-20, 80), point(20, 80)
+    colour = (40, 30, 200)
+
+    cv2.circle(frame, head, int(18 * scale), colour, -1)
+    for a, b in ((neck, hip), (hip, left_knee), (hip, right_knee), (left_knee, left_ankle),
+                 (right_knee, right_ankle), (neck, point(-45, -40)), (neck, point(45, -40))):
+        cv2.line(frame, a, b, colour, thickness)
+    # Skis
+    cv2.line(frame, point(-70, 85), point(50, 85), (20, 20, 20), thickness)
+    cv2.line(frame, point(-50, 88), point(70, 88), (20, 20, 20), thickness)
+
+
+def generate_frames(width: int, height: int, fps: float, duration: float, seed: int = 0):
+    """Yield the BGR frames of a synthetic video."""
+    rng = np.random.default_rng(seed)
+    background = _background(width, height, rng)
+    # A handful of precomputed noise tiles keeps generation fast but frames distinct
+    noise = [rng.integers(-6, 7, size=(height, width, 1), dtype=np.int16) for _ in range(4)]
+
+    for n in range(int(round(duration * fps))):
+        frame = background.copy()
+        _draw_skier(frame, n / fps)
+        frame = np.clip(frame.astype(np.int16) + noise[n % len(noise)], 0, 255).astype(np.uint8)
+        yield frame
+
+
+def generate_video(
+    output_path: str,
+    width: int = 1280,
+    height: int = 720,
+    fps: float = 30.0,
+    duration: float = 10.0,
+    codec: str = "mp4v",
+    seed: int = 0
+) -> str:
+    """
+    Write a synthetic ski video.
+
+    Args:
+        output_path: Video file to write
+        width, height: Resolution in pixels
+        fps: Frame rate
+        duration: Length in seconds
+        codec: OpenCV FourCC (see OPENCV_CODECS) or ffmpeg encoder name
+        seed: Seed for the scene layout and noise
+
+    Returns:
+        output_path
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    frames = generate_frames(width, height, fps, duration, seed)
+
+    if codec in OPENCV_CODECS:
+        writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+        if not writer.isOpened():
+            raise RuntimeError(f"OpenCV cannot write codec {codec} to {output_path}")
+        try:
+            for frame in frames:
+                writer.write(frame)
+        finally:
+            writer.release()
+        return output_path
+
+    find_ffmpeg = load_pose_module("video_decoders").find_ffmpeg
+
+    process = subprocess.Popen(
+        [
+            find_ffmpeg(), "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "pipe:0",
+            "-c:v", codec, "-pix_fmt", "yuv420p", output_path,
+        ],
+        stdin=subprocess.PIPE,
+    )
+    try:
+        for frame in frames:
+            process.stdin.write(frame.tobytes())
+    finally:
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to encode {output_path} with {codec}")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic ski video generator")
+    parser.add_argument("-o", "--output", required=True, help="Output video path")
+    parser.add_argument("-r", "--resolution", default="1280x720", help="WIDTHxHEIGHT (default: 1280x720)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frame rate (default: 30)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Length in seconds (default: 10)")
+    parser.add_argument("-c", "--codec", default="mp4v",
+                        help=f"OpenCV FourCC ({', '.join(OPENCV_CODECS)}) or ffmpeg encoder (default: mp4v)")
+    parser.add_argument("--seed", type=int, default=0, help="Scene seed (default: 0)")
+    args = parser.parse_args()
+
+    width, height = parse_resolution(args.resolution)
+    generate_video(args.output, width, height, args.fps, args.duration, args.codec, args.seed)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()